@@ -0,0 +1,150 @@
+# aggregate.py
+# ---------------------------------------------------------
+# Season totals from many players.csv-format files
+# (for example one file per team per game):
+#   python aggregate.py games/ --workers 4 --output season.csv
+#
+# - files are split into batches and spread over a
+#   ProcessPoolExecutor (one process per core by default)
+# - each worker parses its files with db.iter_lineup() (same
+#   old/new format rules as the app) and reduces them to
+#   per-player totals
+# - the parent merges the partial totals, in file order, and
+#   writes them as a NEW-format CSV
+# Players are matched by first + last name; the position is the
+# one from the last file they appear in.
+# ---------------------------------------------------------
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import db
+
+# Batches per worker (more batches = better balance, more overhead)
+BATCHES_PER_WORKER = 4
+
+
+def total_files(paths):
+    """
+    Per-player totals for a list of files (runs in a worker process).
+    Returns {(first_name, last_name): [position, at_bats, hits]}.
+    """
+    totals = {}
+
+    for path in paths:
+        for p in db.iter_lineup(path):
+            key = (p["first_name"], p["last_name"])
+            t = totals.get(key)
+            if t is None:
+                totals[key] = [p["position"], p["at_bats"], p["hits"]]
+            else:
+                t[0] = p["position"]
+                t[1] += p["at_bats"]
+                t[2] += p["hits"]
+
+    return totals
+
+
+def merge(totals, partial):
+    """Add one batch's totals (a later batch) into totals."""
+    for key, (position, at_bats, hits) in partial.items():
+        t = totals.get(key)
+        if t is None:
+            totals[key] = [position, at_bats, hits]
+        else:
+            t[0] = position
+            t[1] += at_bats
+            t[2] += hits
+    return totals
+
+
+def batches(paths, count):
+    """Split paths into `count` contiguous batches (keeps file order)."""
+    size, extra = divmod(len(paths), count)
+    start = 0
+    for i in range(count):
+        stop = start + size + (i < extra)
+        if start < stop:
+            yield paths[start:stop]
+        start = stop
+
+
+def aggregate(paths, workers=None):
+    """
+    Totals across every file in paths (workers = processes; default
+    os.cpu_count(), 1 = no pool). Returns the same dict as total_files().
+    """
+    paths = [str(p) for p in paths]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(paths) < 2:
+        return total_files(paths)
+
+    totals = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map() returns results in submission order, so merging is deterministic
+        for partial in executor.map(total_files,
+                                    batches(paths, workers * BATCHES_PER_WORKER)):
+            merge(totals, partial)
+
+    return totals
+
+
+def expand(names):
+    """Files and folders (-> their *.csv files, sorted) -> list of paths."""
+    paths = []
+    for name in names:
+        path = Path(name)
+        if path.is_dir():
+            paths.extend(sorted(path.glob("*.csv")))
+        else:
+            paths.append(path)
+    return paths
+
+
+def rows(totals):
+    """Totals -> (first, last, position, ab, hits) rows, in first-seen order."""
+    for (first_name, last_name), (position, at_bats, hits) in totals.items():
+        yield first_name, last_name, position, at_bats, hits
+
+
+def parse_workers(text):
+    workers = int(text)
+    if workers < 1:
+        raise argparse.ArgumentTypeError("workers must be 1 or more")
+    return workers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sum players.csv-format files")
+    parser.add_argument("paths", nargs="+", help="CSV files or folders of *.csv")
+    parser.add_argument("--workers", type=parse_workers, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument("--output", help="write the totals here (NEW CSV format)")
+    args = parser.parse_args(argv)
+
+    missing = [name for name in args.paths if not Path(name).exists()]
+    if missing:
+        parser.error(f"no such file or folder: {', '.join(missing)}")
+
+    paths = expand(args.paths)
+
+    start = time.perf_counter()
+    totals = aggregate(paths, args.workers)
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", buffering=db.WRITE_BUFFER) as f:
+            db.write_rows(f, rows(totals))
+
+    print(f"{len(paths):,} files -> {len(totals):,} players "
+          f"in {elapsed:.2f} s ({len(paths) / elapsed if elapsed else 0:,.0f} files/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# batch.py
+# ---------------------------------------------------------
+# Non-interactive (scripted) command mode for the console app:
+#   python main.py --batch commands.txt
+#   python main.py --batch - < commands.txt      (stdin)
+#
+# One command per line, words split like a shell (quote names
+# with spaces), "#" starts a comment:
+#   add FIRST LAST POS AB HITS      add "Tommy" "La Stella" 3B 1316 360
+#   remove NUMBER                   remove 4
+#   move FROM TO                    move 11 1
+#   edit-pos NUMBER POS             edit-pos 2 SS
+#   edit-stats NUMBER AB HITS       edit-stats 3 20 5
+#
+# Same validation as the menu. A bad command is reported (with its
+# line number) and skipped; the run goes on. Everything is applied
+# to the lineup in memory and saved ONCE at the end.
+# ---------------------------------------------------------
+
+import shlex
+import sys
+import time
+
+import perf
+import ui
+from objects import Player
+
+
+def _int(text):
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"Invalid integer: {text}") from None
+
+
+def _number(lineup, text):
+    """Lineup number argument (1..len)."""
+    number = _int(text)
+    if number < 1 or number > len(lineup):
+        raise ValueError("Invalid lineup number.")
+    return number
+
+
+def _position(text):
+    position = text.strip().upper()
+    if position not in ui.POSITIONS:
+        raise ValueError("Invalid position.")
+    return position
+
+
+def _stats(at_bats, hits):
+    at_bats, hits = _int(at_bats), _int(hits)
+    if at_bats < 0 or hits < 0:
+        raise ValueError("At bats and hits cannot be negative.")
+    if hits > at_bats:
+        raise ValueError("Hits cannot be greater than at bats.")
+    return at_bats, hits
+
+
+def add(lineup, first_name, last_name, position, at_bats, hits):
+    position = _position(position)
+    at_bats, hits = _stats(at_bats, hits)
+    lineup.add_player(Player(first_name, last_name, position, at_bats, hits))
+
+
+def remove(lineup, number):
+    lineup.remove_player(_number(lineup, number))
+
+
+def move(lineup, current_number, new_number):
+    current_number = _number(lineup, current_number)
+    new_number = _number(lineup, new_number)
+    lineup.move_player(current_number, new_number)
+
+
+def edit_position(lineup, number, position):
+    number = _number(lineup, number)
+    lineup.edit_player(number, position=_position(position))
+
+
+def edit_stats(lineup, number, at_bats, hits):
+    number = _number(lineup, number)
+    at_bats, hits = _stats(at_bats, hits)
+    lineup.edit_player(number, at_bats=at_bats, hits=hits)
+
+
+# Command name -> (function, usage)
+COMMANDS = {
+    "add": (add, "add FIRST LAST POS AB HITS"),
+    "remove": (remove, "remove NUMBER"),
+    "move": (move, "move FROM TO"),
+    "edit-pos": (edit_position, "edit-pos NUMBER POS"),
+    "edit-stats": (edit_stats, "edit-stats NUMBER AB HITS"),
+}
+
+
+def apply(lineup, line):
+    """
+    Run one command line against the lineup.
+    Returns False for blank/comment lines, True if a command ran;
+    raises ValueError (with a user-facing message) if it is invalid.
+    """
+    words = shlex.split(line, comments=True)
+    if not words:
+        return False
+
+    name, args = words[0].lower(), words[1:]
+    if name not in COMMANDS:
+        raise ValueError(f"Unknown command: {words[0]}")
+
+    func, usage = COMMANDS[name]
+    if len(args) != len(usage.split()) - 1:
+        raise ValueError(f"Usage: {usage}")
+
+    func(lineup, *args)
+    return True
+
+
+@perf.timed(rows=lambda result: result[0])
+def run(lineup, lines):
+    """
+    Apply every command in lines (any iterable of strings).
+    Returns (commands applied, [(line number, line, message), ...]).
+    """
+    applied = 0
+    errors = []
+
+    for line_number, line in enumerate(lines, 1):
+        try:
+            if apply(lineup, line):
+                applied += 1
+        except ValueError as e:
+            errors.append((line_number, line.strip(), str(e)))
+
+    return applied, errors
+
+
+def run_file(lineup, source, save):
+    """
+    Run a command file (path, or "-" for stdin), then call save() once
+    if anything changed. Prints a report; returns the error list.
+    """
+    start = time.perf_counter()
+
+    if source == "-":
+        applied, errors = run(lineup, sys.stdin)
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            applied, errors = run(lineup, f)
+
+    elapsed = time.perf_counter() - start
+
+    for line_number, line, message in errors:
+        print(f"line {line_number}: {line}: {message}")
+
+    saved = None
+    if applied:
+        save_start = time.perf_counter()
+        saved = save()
+        save_time = time.perf_counter() - save_start
+
+    rate = applied / elapsed if elapsed else 0.0
+    print(f"{applied:,} commands applied, {len(errors):,} errors "
+          f"in {elapsed:.3f} s ({rate:,.0f} commands/s)")
+    if saved is not None:
+        print(f"Saved {saved:,} players in {save_time:.3f} s")
+
+    return errors
@@ -0,0 +1,7 @@
+# benchmarks/__init__.py
+# ---------------------------------------------------------
+# Benchmark scripts for the Baseball Team Manager.
+# Run from the project folder, for example:
+#   python -m benchmarks.bench_connections
+# They only touch temporary files, never players.csv or baseball.sqlite.
+# ---------------------------------------------------------
@@ -0,0 +1,64 @@
+# benchmarks/bench_aggregate.py
+# ---------------------------------------------------------
+# aggregate.aggregate() over a season of per-team per-game
+# files (FILES files x ROSTER players) with 1, 2, 4, 8 worker
+# processes. Every run must give the same totals as the serial
+# one. Scaling is bounded by the number of cores on the machine.
+#   python -m benchmarks.bench_aggregate [files]
+# ---------------------------------------------------------
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aggregate
+import db
+from benchmarks.common import make_players
+
+TEAMS = 30
+ROSTER = 26
+WORKERS = (1, 2, 4, 8)
+
+
+def make_files(folder, count):
+    """count game files; team t always has the same ROSTER names."""
+    rosters = [list(make_players(ROSTER, seed=team)) for team in range(TEAMS)]
+    paths = []
+
+    for game in range(count):
+        team = game % TEAMS
+        path = Path(folder) / f"game{game:05d}_team{team:02d}.csv"
+        with path.open("w", encoding="utf-8") as f:
+            db.write_rows(f, ((p["first_name"], p["last_name"], p["position"],
+                               p["at_bats"] // 100 + game % 5, game % 3)
+                              for p in rosters[team]))
+        paths.append(path)
+
+    return paths
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2430 * 2
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = make_files(folder, count)
+        expected = None
+
+        print(f"Files: {count:,} x {ROSTER} players, cores: {os.cpu_count()}")
+        for workers in WORKERS:
+            start = time.perf_counter()
+            totals = aggregate.aggregate(paths, workers)
+            elapsed = time.perf_counter() - start
+
+            if expected is None:
+                expected, serial = totals, elapsed
+            assert totals == expected
+
+            print(f"workers={workers:<2}: {elapsed:6.2f} s  "
+                  f"({count / elapsed:,.0f} files/s, x{serial / elapsed:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_binary.py
+# ---------------------------------------------------------
+# Startup time for a big roster:
+# - db.load_lineup() + Lineup (CSV, one Player per row)
+# - db.load_columns() + ColumnarLineup (CSV, whole columns)
+# - db_binary.load_lineup() (mmap'd binary snapshot)
+#   python -m benchmarks.bench_binary [players]
+# ---------------------------------------------------------
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import db
+import db_binary
+from benchmarks.common import make_players
+from objects import ColumnarLineup, Lineup
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def load_rows(path):
+    lineup = Lineup()
+    lineup.load_from_dicts(db.iter_lineup(path))
+    return lineup
+
+
+def load_columns(path):
+    lineup = ColumnarLineup()
+    lineup.load_from_columns(db.load_columns(path))
+    return lineup
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = Path(folder) / "players.csv"
+        bin_path = Path(folder) / "players.bin"
+        with csv_path.open("w", encoding="utf-8", buffering=db.WRITE_BUFFER) as f:
+            db.write_rows(f, db.player_rows(make_players(count)))
+
+        _, convert = timed(db_binary.csv_to_binary, csv_path, bin_path)
+
+        rows, row_load = timed(load_rows, csv_path)
+        columns, column_load = timed(load_columns, csv_path)
+        binary, binary_load = timed(db_binary.load_lineup, bin_path)
+
+        csv_size = csv_path.stat().st_size
+        bin_size = bin_path.stat().st_size
+
+    assert len(rows) == len(columns) == len(binary) == count
+    assert binary.hits == columns.hits and binary.at_bats == columns.at_bats
+    last = count
+    assert binary.get_player(last).full_name == rows.get_player(last).full_name
+    del rows, columns, binary
+
+    print(f"Players: {count:,}   CSV {csv_size / 1e6:.1f} MB   binary {bin_size / 1e6:.1f} MB")
+    print(f"convert csv_to_binary      : {convert:8.3f} s")
+    print(f"load  CSV -> Lineup        : {row_load:8.3f} s")
+    print(f"load  CSV -> ColumnarLineup: {column_load:8.3f} s")
+    print(f"load  binary snapshot      : {binary_load:8.3f} s  ({row_load / binary_load:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# benchmarks/bench_cache.py
+# ---------------------------------------------------------
+# get_player() / get_positions() with and without the
+# read-through cache (hot set of 100 player IDs).
+#   python -m benchmarks.bench_cache
+# ---------------------------------------------------------
+
+import itertools
+
+import db_sqlite
+from benchmarks.common import ops_per_second, temp_database
+
+
+def main():
+    with temp_database(player_count=10_000):
+        ids = itertools.cycle(range(1, 101))
+
+        db_sqlite.configure_cache(ttl=0)          # every read misses
+        cold_player = ops_per_second(lambda: db_sqlite.get_player(next(ids)))
+        cold_positions = ops_per_second(db_sqlite.get_positions)
+
+        db_sqlite.configure_cache(ttl=30.0)
+        db_sqlite.clear_cache()
+        warm_player = ops_per_second(lambda: db_sqlite.get_player(next(ids)))
+        warm_positions = ops_per_second(db_sqlite.get_positions)
+        info = db_sqlite.cache_info()
+
+    print(f"{'Operation':<16}{'no cache':>12}{'cached':>12}{'speedup':>10}")
+    print(f"{'get_player':<16}{cold_player:>12,.0f}{warm_player:>12,.0f}"
+          f"{warm_player / cold_player:>9.1f}x")
+    print(f"{'get_positions':<16}{cold_positions:>12,.0f}{warm_positions:>12,.0f}"
+          f"{warm_positions / cold_positions:>9.1f}x")
+    print(f"cache: {info}")
+
+
+if __name__ == "__main__":
+    main()
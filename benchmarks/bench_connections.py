@@ -0,0 +1,62 @@
+# benchmarks/bench_connections.py
+# ---------------------------------------------------------
+# Compare the OLD connect-per-call pattern with the pooled
+# thread-local connection now used by db_sqlite.
+#   python -m benchmarks.bench_connections
+# ---------------------------------------------------------
+
+import sqlite3
+
+import db_sqlite
+from benchmarks.common import ops_per_second, temp_database
+
+
+def old_get_player(player_id):
+    """The original pattern: connect, query, close."""
+    conn = sqlite3.connect(db_sqlite.DB_FILE)
+    row = conn.execute("""
+        SELECT playerID, batOrder, firstName, lastName, position, atBats, hits
+        FROM Player
+        WHERE playerID = ?
+    """, (player_id,)).fetchone()
+    conn.close()
+    return row
+
+
+def old_update_player(player_id, first_name, last_name, position, at_bats, hits):
+    """The original pattern: connect, update, commit, close."""
+    conn = sqlite3.connect(db_sqlite.DB_FILE)
+    conn.execute("""
+        UPDATE Player
+        SET firstName = ?, lastName = ?, position = ?, atBats = ?, hits = ?
+        WHERE playerID = ?
+    """, (first_name, last_name, position, at_bats, hits, player_id))
+    conn.commit()
+    conn.close()
+
+
+def main():
+    with temp_database(player_count=1000):
+        # Old database default (rollback journal, synchronous=FULL)
+        db_sqlite.configure(journal_mode="DELETE", synchronous="FULL")
+        old_read = ops_per_second(lambda: old_get_player(500))
+        old_write = ops_per_second(
+            lambda: old_update_player(500, "Buster", "Posey", "C", 10, 3)
+        )
+
+        # Pooled connection with the default PRAGMAs
+        db_sqlite.configure(journal_mode="WAL", synchronous="NORMAL")
+        new_read = ops_per_second(lambda: db_sqlite.get_player(500))
+        new_write = ops_per_second(
+            lambda: db_sqlite.update_player(500, "Buster", "Posey", "C", 10, 3)
+        )
+
+    print(f"{'Operation':<16}{'connect/call':>14}{'pooled':>14}{'speedup':>10}")
+    print(f"{'get_player':<16}{old_read:>14,.0f}{new_read:>14,.0f}"
+          f"{new_read / old_read:>9.1f}x")
+    print(f"{'update_player':<16}{old_write:>14,.0f}{new_write:>14,.0f}"
+          f"{new_write / old_write:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# benchmarks/bench_csv_parse.py
+# ---------------------------------------------------------
+# Loading/saving a big players.csv:
+# - the original hand-written split(",") parser / f-string writer
+# - the crash-safe per-row writer db.save_lineup() used before the
+#   csv module (temp file + fsync + rename, like db.save_lineup() now)
+# - db.load_lineup() (csv.reader) / db.save_lineup() (chunked writes,
+#   csv.writer only for chunks that need quoting; includes fsync)
+# - db.load_columns() (column decoding per 1 MB block, no per-row dicts)
+# Each is timed REPEAT times and the best run is reported (this
+# machine is noisy; a single run can be off by 20%).
+# Before timing, db.load_columns() is checked against db.iter_lineup()
+# on edge-case files (quotes, old format, CRLF, blank-only blocks) at
+# several block sizes.
+#   python -m benchmarks.bench_csv_parse [lines]
+# ---------------------------------------------------------
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import db
+from benchmarks.common import make_players
+
+REPEAT = 3
+
+# Block sizes (bytes) the load_columns check runs with
+CHECK_CHUNKS = (1, 64, 1 << 20)
+
+# name -> file text for the load_columns check
+CHECK_FILES = {
+    "clean": "Ann,Lee,C,10,3\nBo,Kim,SS,20,5\n",
+    "blank block": "Ann,Lee,C,10,3\nBo,Kim,SS,20,5\n" + "\n" * 200,
+    "blank lines": "\n\nAnn,Lee,C,10,3\n\n   \nBo,Kim,SS,20,5\n\n",
+    "quoted": 'Ann,Lee,C,10,3\n"Bo, Jr",Kim,SS,20,5\n' + "\n" * 100,
+    "old format": "Ann Lee,C,10,3\nBo,Kim,SS,20,5\n",
+    "CRLF": "Ann,Lee,C,10,3\r\nBo,Kim,SS,20,5\r\n\r\n",
+}
+
+
+def original_load(path):
+    """The original load_lineup loop (split + strip per line)."""
+    lineup = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            parts = [p.strip() for p in line.split(",")]
+            if len(parts) == 4:
+                first, last = db.split_name(parts[0])
+                pos = parts[1]
+                try:
+                    ab = int(parts[2])
+                    hits = int(parts[3])
+                except ValueError:
+                    continue
+            elif len(parts) == 5:
+                first, last, pos = parts[0], parts[1], parts[2]
+                try:
+                    ab = int(parts[3])
+                    hits = int(parts[4])
+                except ValueError:
+                    continue
+            else:
+                continue
+            lineup.append({"first_name": first, "last_name": last,
+                           "position": pos, "at_bats": ab, "hits": hits})
+    return lineup
+
+
+def original_save(path, lineup):
+    """The original save_lineup loop (one f-string write per player)."""
+    with open(path, "w", encoding="utf-8") as f:
+        for p in lineup:
+            f.write(f"{p['first_name']},{p['last_name']},{p['position']},"
+                    f"{p['at_bats']},{p['hits']}\n")
+
+
+def per_row_save(path, lineup):
+    """db.save_lineup() before the csv module: per-row writes, fsync, rename."""
+    temp_file = path.with_name(path.name + ".tmp")
+    with temp_file.open("w", encoding="utf-8") as f:
+        for p in lineup:
+            f.write(f"{p['first_name']},{p['last_name']},{p['position']},"
+                    f"{p['at_bats']},{p['hits']}\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, path)
+
+
+def check_columns(folder):
+    """db.load_columns() == db.iter_lineup() as columns, for CHECK_FILES."""
+    path = Path(folder) / "check.csv"
+    read_chunk = db.READ_CHUNK
+    try:
+        for name, text in CHECK_FILES.items():
+            path.write_bytes(text.encode("utf-8"))
+            expected = db._columns_from_players(db.iter_lineup(path))
+            for db.READ_CHUNK in CHECK_CHUNKS:
+                columns = db.load_columns(path)
+                assert columns == expected, (name, db.READ_CHUNK, columns)
+    finally:
+        db.READ_CHUNK = read_chunk
+
+
+def timed(func, *args):
+    """(result, best time of REPEAT runs)"""
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    players = list(make_players(lines))
+    old_file = db.DATA_FILE
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / "players.csv"
+        check_columns(folder)
+        db.DATA_FILE = path
+        try:
+            _, old_save = timed(original_save, path, players)
+            _, safe_save = timed(per_row_save, path, players)
+            _, new_save = timed(db.save_lineup, players)
+
+            expected, old_load = timed(original_load, path)
+            loaded, new_load = timed(db.load_lineup)
+            columns, column_load = timed(db.load_columns)
+        finally:
+            db.DATA_FILE = old_file
+
+    assert loaded == expected
+    assert list(columns["hits"]) == [p["hits"] for p in expected]
+
+    print(f"Lines: {lines:,}")
+    print(f"save  original f-strings : {old_save:6.2f} s")
+    print(f"save  per-row + fsync    : {safe_save:6.2f} s")
+    print(f"save  db.save_lineup     : {new_save:6.2f} s  "
+          f"({old_save / new_save:.1f}x original, {safe_save / new_save:.1f}x per-row + fsync)")
+    print(f"load  original split     : {old_load:6.2f} s")
+    print(f"load  db.load_lineup     : {new_load:6.2f} s  ({old_load / new_load:.1f}x)")
+    print(f"load  db.load_columns    : {column_load:6.2f} s  ({old_load / column_load:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
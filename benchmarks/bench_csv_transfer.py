@@ -0,0 +1,71 @@
+# benchmarks/bench_csv_transfer.py
+# ---------------------------------------------------------
+# players.csv <-> SQLite Player table:
+# - add_player() once per row (one commit each)
+# - db_sqlite.import_csv() chunked executemany
+# - db_sqlite.export_csv() streaming fetchmany
+# Peak memory is reported with tracemalloc.
+#   python -m benchmarks.bench_csv_transfer [rows]
+# ---------------------------------------------------------
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import db
+import db_sqlite
+from benchmarks.common import make_players, temp_database
+
+
+def timed(func, *args):
+    """Run func(*args), return (result, seconds, peak MB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1_000_000
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def row_by_row(path):
+    count = 0
+    for order, p in enumerate(map(db.parse_line, open(path, encoding="utf-8")), 1):
+        if p is not None:
+            db_sqlite.add_player(order, p["first_name"], p["last_name"],
+                                 p["position"], p["at_bats"], p["hits"])
+            count += 1
+    return count
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    with temp_database() as db_file:
+        folder = Path(db_file).parent
+        source = folder / "players.csv"
+        with source.open("w", encoding="utf-8") as f:
+            db.write_rows(f, db.player_rows(make_players(rows)))
+
+        sample = min(rows, 5_000)
+        sample_file = folder / "sample.csv"
+        with source.open(encoding="utf-8") as f, sample_file.open("w", encoding="utf-8") as out:
+            out.writelines(line for _, line in zip(range(sample), f))
+
+        _, slow, _ = timed(row_by_row, sample_file)
+        conn = db_sqlite.get_connection()
+        with conn:
+            conn.execute("DELETE FROM Player")
+
+        count, load, load_peak = timed(db_sqlite.import_csv, source)
+        exported, dump, dump_peak = timed(db_sqlite.export_csv, folder / "export.csv")
+        assert count == exported == rows
+
+    print(f"add_player per row : {sample / slow:>12,.0f} rows/s  ({sample:,} rows)")
+    print(f"import_csv         : {rows / load:>12,.0f} rows/s  peak {load_peak:.1f} MB")
+    print(f"export_csv         : {rows / dump:>12,.0f} rows/s  peak {dump_peak:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
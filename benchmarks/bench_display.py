@@ -0,0 +1,70 @@
+# benchmarks/bench_display.py
+# ---------------------------------------------------------
+# Rendering the lineup table (menu option 1) for N players:
+# - print() per row from to_dicts() copies (the old ui.display)
+# - ui.display(): bulk formatting, chunked writes, straight from
+#   the Player objects (and from dicts)
+# - ui.display(sort=..., limit=50): one sorted page
+# Output goes to a temp file; old and new must be byte-identical.
+#   python -m benchmarks.bench_display [players]
+# ---------------------------------------------------------
+
+import contextlib
+import sys
+import tempfile
+import time
+
+import ui
+from benchmarks.common import make_players
+from objects import Lineup
+
+
+def print_per_row(lineup_dicts):
+    """The original ui.display(): one print() per player."""
+    print("\n" + "=" * 64)
+    print(f"{'No':<4}{'Player':<20}{'POS':<6}{'AB':<6}{'H':<6}{'AVG':<6}")
+    print("=" * 64)
+
+    for i, p in enumerate(lineup_dicts, 1):
+        name = f"{p['first_name']} {p['last_name']}".strip()
+        ab = p["at_bats"]
+        hits = p["hits"]
+        avg = 0.0 if ab == 0 else round(hits / ab, 3)
+        print(f"{i:<4}{name:<20}{p['position']:<6}{ab:<6}{hits:<6}{avg:<6.3f}")
+
+    print("=" * 64)
+
+
+def render(func):
+    """(seconds, output text) for func() with stdout sent to a temp file."""
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as f:
+        with contextlib.redirect_stdout(f):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        f.seek(0)
+        return elapsed, f.read()
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    lineup = Lineup()
+    lineup.load_from_dicts(make_players(size))
+
+    old, expected = render(lambda: print_per_row(lineup.to_dicts()))
+    print(f"Players: {size:,}")
+    print(f"print() per row (to_dicts)  : {old:6.3f} s")
+
+    for label, func in (("ui.display(lineup)", lambda: ui.display(lineup)),
+                        ("ui.display(dicts)", lambda: ui.display(lineup.to_dicts()))):
+        elapsed, text = render(func)
+        assert text == expected
+        print(f"{label:<28}: {elapsed:6.3f} s  (x{old / elapsed:.1f})")
+
+    for sort in ui.SORT_KEYS:
+        elapsed, _ = render(lambda: ui.display(lineup, sort=sort, limit=50))
+        print(f"{'sort=' + sort + ', limit=50':<28}: {elapsed:6.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/bench_events.py
+# ---------------------------------------------------------
+# Ingesting a season of play-by-play (GAMES x PA_PER_GAME
+# plate appearances) into AtBatEvent:
+# - per event: INSERT + UPDATE Player for every event
+# - db_sqlite.ingest_events(): executemany INSERT + one UPDATE
+#   per player per chunk
+# Checks the rollups against rebuild_rollups(), and that keyed events
+# (mixed with unkeyed ones in one chunk) are stored only once.
+#   python -m benchmarks.bench_events [games]
+# ---------------------------------------------------------
+
+import random
+import sys
+import time
+
+import db_sqlite
+from benchmarks.common import temp_database
+
+PLAYERS = 750
+PA_PER_GAME = 78
+OUTCOME_WEIGHTS = {"1B": 15, "2B": 5, "3B": 1, "HR": 3, "K": 22, "OUT": 25,
+                   "GO": 10, "FO": 8, "BB": 8, "HBP": 1, "SF": 1, "E": 1}
+
+
+def make_events(games, seed=1):
+    rng = random.Random(seed)
+    outcomes = rng.choices(list(OUTCOME_WEIGHTS), OUTCOME_WEIGHTS.values(),
+                           k=games * PA_PER_GAME)
+    return [(f"G{i // PA_PER_GAME:05d}", rng.randint(1, PLAYERS), outcome)
+            for i, outcome in enumerate(outcomes)]
+
+
+def per_event(events):
+    """One INSERT + one UPDATE per event (what a row trigger would do)."""
+    conn = db_sqlite.get_connection()
+    with conn:
+        for game_id, player_id, outcome in events:
+            at_bats, hits = db_sqlite.OUTCOMES[outcome]
+            conn.execute(
+                "INSERT INTO AtBatEvent (gameID, playerID, outcome) VALUES (?, ?, ?)",
+                (game_id, player_id, outcome))
+            conn.execute(
+                "UPDATE Player SET atBats = atBats + ?, hits = hits + ? WHERE playerID = ?",
+                (at_bats, hits, player_id))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def zero_stats():
+    conn = db_sqlite.get_connection()
+    with conn:
+        conn.execute("UPDATE Player SET atBats = 0, hits = 0")
+        conn.execute("DELETE FROM AtBatEvent")
+
+
+def check_keyed_events(events):
+    """Keyed + unkeyed events in one chunk; keyed ones ingested once."""
+    mixed = [event if i % 2 else (*event, f"check:{i}")
+             for i, event in enumerate(events)]
+    mixed[1] = (*mixed[1], None)
+    keyed = len(events) // 2 + len(events) % 2
+
+    zero_stats()
+    assert db_sqlite.ingest_events(mixed) == len(events)
+    totals = db_sqlite.get_all_players()
+    assert db_sqlite.ingest_events(mixed) == len(events) - keyed
+    assert db_sqlite.ingest_events(m for m in mixed if len(m) == 4
+                                   and m[3] is not None) == 0
+
+    count = db_sqlite.get_connection().execute(
+        "SELECT COUNT(*) FROM AtBatEvent").fetchone()[0]
+    assert count == 2 * len(events) - keyed
+    assert totals != db_sqlite.get_all_players()
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 2430
+    events = make_events(games)
+
+    with temp_database(player_count=PLAYERS):
+        check_keyed_events(events[:1000])
+
+        zero_stats()
+        slow = timed(per_event, events)
+
+        zero_stats()
+        fast = timed(db_sqlite.ingest_events, events)
+
+        before = db_sqlite.get_all_players()
+        db_sqlite.rebuild_rollups()
+        assert db_sqlite.get_all_players() == before
+
+    print(f"Events: {len(events):,} ({games:,} games)")
+    print(f"per-event INSERT + UPDATE : {slow:6.2f} s  ({len(events) / slow:,.0f} events/s)")
+    print(f"ingest_events (batched)   : {fast:6.2f} s  ({len(events) / fast:,.0f} events/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_iter_lineup.py
+# ---------------------------------------------------------
+# Peak memory of aggregating a roster file:
+# - db.load_lineup() + Lineup.load_from_dicts() (two full lists)
+# - db.iter_lineup() generator (one player at a time)
+#   python -m benchmarks.bench_iter_lineup [rows]
+# ---------------------------------------------------------
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import db
+from benchmarks.common import make_players
+from objects import Lineup
+
+
+def measure(func):
+    """Run func(), return (result, seconds, peak MB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1_000_000
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def with_lists():
+    lineup = Lineup()
+    lineup.load_from_dicts(db.load_lineup())
+    return sum(p.hits for p in lineup if p.position == "C")
+
+
+def with_generator():
+    return sum(p["hits"] for p in db.iter_lineup() if p["position"] == "C")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    old_file = db.DATA_FILE
+
+    with tempfile.TemporaryDirectory() as folder:
+        db.DATA_FILE = Path(folder) / "players.csv"
+        try:
+            db.save_lineup(make_players(rows))
+            total_a, time_a, peak_a = measure(with_lists)
+            total_b, time_b, peak_b = measure(with_generator)
+        finally:
+            db.DATA_FILE = old_file
+
+    assert total_a == total_b
+    print(f"Rows: {rows:,}  (total hits by catchers: {total_a:,})")
+    print(f"load_lineup + Lineup : {time_a:6.2f} s  peak {peak_a:8.1f} MB")
+    print(f"iter_lineup          : {time_b:6.2f} s  peak {peak_b:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
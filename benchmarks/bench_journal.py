@@ -0,0 +1,57 @@
+# benchmarks/bench_journal.py
+# ---------------------------------------------------------
+# Cost of ONE edit on a big roster:
+# - db.save_lineup() full rewrite (the old way)
+# - db_journal.log_edit() append
+#   python -m benchmarks.bench_journal [players]
+# ---------------------------------------------------------
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import db
+import db_journal
+from benchmarks.common import make_players
+
+
+def per_call_ms(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    old_files = db.DATA_FILE, db_journal.JOURNAL_FILE
+
+    with tempfile.TemporaryDirectory() as folder:
+        db.DATA_FILE = Path(folder) / "players.csv"
+        db_journal.JOURNAL_FILE = Path(folder) / "players.journal"
+        try:
+            players = list(make_players(count))
+            full = per_call_ms(lambda: db.save_lineup(players), 5)
+
+            # Stamp a fresh journal against the final snapshot
+            db_journal.load_lineup()
+            journal = per_call_ms(
+                lambda: db_journal.log_edit(1, position="SS"), 200
+            )
+            replay_start = time.perf_counter()
+            replayed = db_journal.load_lineup()
+            replay = time.perf_counter() - replay_start
+            assert replayed[0]["position"] == "SS"
+        finally:
+            db_journal.close()
+            db.DATA_FILE, db_journal.JOURNAL_FILE = old_files
+
+    print(f"Players: {count:,}")
+    print(f"save_lineup per edit : {full:8.2f} ms")
+    print(f"journal append       : {journal:8.3f} ms  (fsync={db_journal.FSYNC})")
+    print(f"startup replay       : {replay * 1000:8.1f} ms  (200 records)")
+
+
+if __name__ == "__main__":
+    main()
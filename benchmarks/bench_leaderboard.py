@@ -0,0 +1,116 @@
+# benchmarks/bench_leaderboard.py
+# ---------------------------------------------------------
+# Leaderboard / position summary / paging:
+# - client side: get_all_players() + Python
+# - SQL side: db_sqlite.get_leaders(), get_position_summary(),
+#   get_players_page()
+# Also checks with EXPLAIN QUERY PLAN that each query uses its index
+# (exit code 1 if one does not; benchmarks.suite runs the same check).
+#   python -m benchmarks.bench_leaderboard [players]
+# ---------------------------------------------------------
+
+import sys
+import time
+
+import db_sqlite
+import stats
+from benchmarks.common import temp_database
+
+MIN_AB = 100
+
+# Default team/season scope used by every query below
+SCOPE = (db_sqlite.DEFAULT_TEAM, db_sqlite.DEFAULT_SEASON)
+
+# (query, params, index that must appear in the plan)
+PLANS = (
+    (f"""SELECT playerID FROM Player WHERE team = ? AND season = ? AND atBats >= ?
+         ORDER BY {db_sqlite.AVG_SQL} DESC, atBats DESC LIMIT ?""",
+     (*SCOPE, MIN_AB, 10), "Player_avg"),
+    ("""SELECT position, COUNT(*), SUM(atBats), SUM(hits)
+        FROM Player WHERE team = ? AND season = ?
+        GROUP BY position ORDER BY position""",
+     SCOPE, "COVERING INDEX Player_position"),
+    ("""SELECT playerID FROM Player WHERE team = ? AND season = ? AND batOrder > ?
+        ORDER BY batOrder LIMIT ?""",
+     (*SCOPE, 0, 50), "Player_batOrder"),
+    ("""SELECT playerID FROM Player WHERE team = ? AND season = ? AND batOrder < ?
+        ORDER BY batOrder DESC LIMIT ?""",
+     (*SCOPE, 100, 50), "Player_batOrder"),
+)
+
+
+def check_plans():
+    """
+    EXPLAIN QUERY PLAN every query in PLANS; return one message per
+    query that does not use its index or sorts in a temp B-tree
+    (empty list = all good). Not asserts, so python -O still checks.
+    """
+    failures = []
+    for sql, params, expected in PLANS:
+        plan = db_sqlite.explain(sql, params)
+        if not any(expected in step for step in plan):
+            problem = f"does not use {expected}"
+        elif any("TEMP B-TREE" in step for step in plan):
+            problem = "sorts in a TEMP B-TREE"
+        else:
+            continue
+        query = " ".join(sql.split())
+        failures.append(f"{problem}: {query}\n    plan: {plan}")
+    return failures
+
+
+def client_leaders():
+    rows = db_sqlite.get_all_players()
+    return [(avg, rows[i - 1][5]) for i, avg in stats.top_n(rows, 10, MIN_AB)]
+
+
+def sql_leaders():
+    # (AVG, AB) pairs: players tied on both may come back in any order
+    return [(row[7], row[5]) for row in db_sqlite.get_leaders(10, MIN_AB)]
+
+
+def client_positions():
+    totals = {}
+    for row in db_sqlite.get_all_players():
+        t = totals.setdefault(row[4], [0, 0])
+        t[0] += row[5]
+        t[1] += row[6]
+    return totals
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    with temp_database(player_count=count):
+        failures = check_plans()
+        for failure in failures:
+            print(f"EXPLAIN FAILED {failure}")
+        if failures:
+            return 1
+
+        client, client_ms = timed(client_leaders)
+        sql, sql_ms = timed(sql_leaders)
+        assert client == sql
+
+        by_pos, pos_client_ms = timed(client_positions)
+        summary, pos_sql_ms = timed(db_sqlite.get_position_summary)
+        assert {r[0]: [r[2], r[3]] for r in summary} == by_pos
+
+        middle = count // 2
+        _, page_ms = timed(lambda: db_sqlite.get_players_page(middle))
+
+    print(f"Players: {count:,}  (EXPLAIN checks passed)")
+    print(f"top-10 AVG  client {client_ms:8.1f} ms   SQL {sql_ms:8.2f} ms")
+    print(f"positions   client {pos_client_ms:8.1f} ms   SQL {pos_sql_ms:8.2f} ms")
+    print(f"page of {db_sqlite.PAGE_SIZE} from the middle:      {page_ms:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
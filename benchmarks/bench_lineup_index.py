@@ -0,0 +1,101 @@
+# benchmarks/bench_lineup_index.py
+# ---------------------------------------------------------
+# Mixed lookups and edits on a 100k-player Lineup:
+# - linear scans over lineup.players (no indexes)
+# - Lineup.find / find_by_name / players_at / edit_player
+#   python -m benchmarks.bench_lineup_index [players] [operations]
+# ---------------------------------------------------------
+
+import random
+import sys
+import time
+
+from benchmarks.common import POSITIONS, make_players
+from objects import Lineup, Player
+
+
+def scan_ops(lineup, ops):
+    """Same operations done with linear scans."""
+    found = 0
+    for op, arg in ops:
+        if op == "name":
+            found += sum(1 for p in lineup.players if p.full_name == arg)
+        elif op == "position":
+            found += sum(1 for p in lineup.players if p.position == arg)
+        elif op == "id":
+            found += sum(1 for p in lineup.players if p.player_id == arg)
+        elif op == "edit":
+            lineup.players[arg - 1].position = "SS"
+        elif op == "move":
+            lineup.players.insert(0, lineup.players.pop(arg - 1))
+        elif op == "add":
+            lineup.players.append(arg)
+    return found
+
+
+def indexed_ops(lineup, ops):
+    found = 0
+    for op, arg in ops:
+        if op == "name":
+            found += len(lineup.find_by_name(arg))
+        elif op == "position":
+            found += len(lineup.by_position.get(arg, ()))
+        elif op == "id":
+            found += lineup.find(arg) is not None
+        elif op == "edit":
+            lineup.edit_player(arg, position="SS")
+        elif op == "move":
+            lineup.move_player(arg, 1)
+        elif op == "add":
+            lineup.add_player(arg)
+    return found
+
+
+def make_ops(lineup, count, seed=7):
+    rng = random.Random(seed)
+    size = len(lineup)
+    ops = []
+    for _ in range(count):
+        kind = rng.choice(("name", "position", "id", "edit", "move", "add"))
+        if kind == "name":
+            ops.append((kind, lineup.get_player(rng.randint(1, size)).full_name))
+        elif kind == "position":
+            ops.append((kind, rng.choice(POSITIONS)))
+        elif kind == "id":
+            ops.append((kind, rng.randint(1, size)))
+        elif kind == "add":
+            ops.append((kind, Player("New", f"Player{len(ops)}", "P", 0, 0)))
+        else:
+            ops.append((kind, rng.randint(1, size)))
+    return ops
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    op_count = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    def fresh():
+        lineup = Lineup()
+        lineup.load_from_dicts(make_players(count))
+        return lineup
+
+    lineup = fresh()
+    scan_found, scan_time = timed(scan_ops, lineup, make_ops(lineup, op_count))
+    lineup = fresh()
+    index_found, index_time = timed(indexed_ops, lineup, make_ops(lineup, op_count))
+
+    assert scan_found == index_found
+    print(f"Players: {count:,}   mixed operations: {op_count:,}")
+    print(f"linear scans : {scan_time * 1000:9.1f} ms")
+    print(f"indexes      : {index_time * 1000:9.1f} ms"
+          f"  ({scan_time / index_time:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_mapped.py
+# ---------------------------------------------------------
+# Console-app startup on a big players.csv:
+# - Lineup.load_from_dicts(db.iter_lineup())  (parses every row)
+# - MappedLineup() first open (builds players.csv.idx once)
+# - MappedLineup() later opens (maps the CSV + saved index)
+# plus len()/get_player() and a save() after one edit.
+#   python -m benchmarks.bench_mapped [players]
+# ---------------------------------------------------------
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import db
+from benchmarks.common import make_players
+from db_mapped import MappedLineup
+from objects import Lineup
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def load_rows(path):
+    lineup = Lineup()
+    lineup.load_from_dicts(db.iter_lineup(path))
+    return lineup
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / "players.csv"
+        with path.open("w", encoding="utf-8", buffering=db.WRITE_BUFFER) as f:
+            db.write_rows(f, db.player_rows(make_players(count)))
+
+        rows, row_load = timed(load_rows, path)
+
+        mapped, first_open = timed(MappedLineup, path)
+        mapped.close()
+        mapped, reopen = timed(MappedLineup, path)
+
+        start = time.perf_counter()
+        assert len(mapped) == count
+        last = mapped.get_player(count)
+        lookup = time.perf_counter() - start
+        assert last.to_dict() == rows.get_player(count).to_dict()
+        del rows
+
+        mapped.edit_player(1, hits=0)
+        _, save = timed(mapped.save)
+        mapped.close()
+
+    print(f"Players: {count:,}")
+    print(f"startup Lineup (parse all)  : {row_load:8.3f} s")
+    print(f"startup MappedLineup, 1st   : {first_open:8.3f} s  (builds the index)")
+    print(f"startup MappedLineup        : {reopen * 1000:8.3f} ms")
+    print(f"len() + get_player(last)    : {lookup * 1000:8.3f} ms")
+    print(f"save() after one edit       : {save:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
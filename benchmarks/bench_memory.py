@@ -0,0 +1,71 @@
+# benchmarks/bench_memory.py
+# ---------------------------------------------------------
+# Bytes per player for a large roster:
+# - dict-backed Player (the original class, no __slots__)
+# - __slots__ Player inside Lineup
+# - ColumnarLineup (string table + array('i') columns)
+#   python -m benchmarks.bench_memory [players]
+# ---------------------------------------------------------
+
+import sys
+import tracemalloc
+
+from benchmarks.common import make_players
+from objects import ColumnarLineup, Lineup, Player
+
+
+class DictPlayer:
+    """The original Player layout: attributes in a per-object __dict__."""
+
+    def __init__(self, first_name, last_name, position, at_bats, hits):
+        self.first_name = first_name
+        self.last_name = last_name
+        self.position = position
+        self.at_bats = at_bats
+        self.hits = hits
+
+
+def build_dict_players(dicts):
+    return [DictPlayer(d["first_name"], d["last_name"], d["position"],
+                       d["at_bats"], d["hits"]) for d in dicts]
+
+
+def build_lineup(dicts):
+    lineup = Lineup()
+    lineup.load_from_dicts(dicts)
+    return lineup
+
+
+def build_columnar(dicts):
+    lineup = ColumnarLineup()
+    lineup.load_from_dicts(dicts)
+    return lineup
+
+
+def bytes_per_player(build, count):
+    """Memory still held by the built roster, divided by player count."""
+    tracemalloc.start()
+    roster = build(make_players(count))
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del roster
+    return held / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"Players: {count:,}")
+    for label, build in (("dict-backed Player", build_dict_players),
+                         ("__slots__ Player + Lineup", build_lineup),
+                         ("ColumnarLineup", build_columnar)):
+        print(f"{label:<28}{bytes_per_player(build, count):>8.1f} bytes/player")
+
+    # Sanity check: all layouts hold the same data
+    sample = list(make_players(1000))
+    assert build_lineup(sample).to_dicts() == build_columnar(sample).to_dicts()
+    assert isinstance(build_columnar(sample).get_player(1), Player)
+
+
+if __name__ == "__main__":
+    main()
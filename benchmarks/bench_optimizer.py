@@ -0,0 +1,80 @@
+# benchmarks/bench_optimizer.py
+# ---------------------------------------------------------
+# Batting-order optimizer throughput (candidate orders/s):
+# - per-PA loop: one Python loop step per plate appearance
+# - optimizer.Simulator: bit-parallel hits + byte table
+# Both score the same games, so they must agree exactly.
+# Then optimizer.optimize() with 1, 2, 4 worker processes
+# (same seed -> same order whatever the worker count).
+#   python -m benchmarks.bench_optimizer [games]
+# ---------------------------------------------------------
+
+import random
+import sys
+import time
+
+import optimizer
+
+PLAYERS = 9
+ORDERS = 300
+WORKERS = (1, 2, 4)
+
+
+def per_pa_runs(averages, order, draws, games):
+    """Reference simulator: same model and draws, one PA at a time."""
+    total = 0
+    for game in range(games):
+        outs = bases = 0
+        for pa in range(optimizer.MAX_PA):
+            if outs == optimizer.OUTS_PER_GAME:
+                break
+            if draws[game * optimizer.MAX_PA + pa] < averages[order[pa % len(order)]]:
+                total += bases >> 1
+                bases = (bases & 1) << 1 | 1
+            else:
+                outs += 1
+                if outs % 3 == 0:
+                    bases = 0
+    return total / games
+
+
+def rate(func, orders):
+    start = time.perf_counter()
+    results = [func(order) for order in orders]
+    return len(orders) / (time.perf_counter() - start), results
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else optimizer.GAMES
+    rng = random.Random(1)
+    averages = [round(rng.uniform(0.180, 0.330), 3) for _ in range(PLAYERS)]
+    orders = [rng.sample(range(PLAYERS), PLAYERS) for _ in range(ORDERS)]
+
+    draws = optimizer.draw_games(games)
+    sim = optimizer.Simulator(averages, games)
+
+    slow, expected = rate(lambda o: per_pa_runs(averages, o, draws, games), orders)
+    fast, results = rate(sim.runs, orders)
+    assert results == expected
+
+    print(f"Players: {PLAYERS}, games per order: {games:,}")
+    print(f"per-PA loop         : {slow:8,.0f} orders/s")
+    print(f"bit-parallel        : {fast:8,.0f} orders/s  (x{fast / slow:.1f})")
+
+    first = None
+    for workers in WORKERS:
+        start = time.perf_counter()
+        order, runs, current, evaluations = optimizer.optimize(
+            averages, workers=workers, games=games)
+        elapsed = time.perf_counter() - start
+
+        first = first or (order, runs)
+        assert (order, runs) == first
+
+        print(f"optimize workers={workers}: {elapsed:6.2f} s  "
+              f"({evaluations / elapsed:,.0f} orders/s, "
+              f"{current:.2f} -> {runs:.2f} runs/game)")
+
+
+if __name__ == "__main__":
+    main()
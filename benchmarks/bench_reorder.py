@@ -0,0 +1,54 @@
+# benchmarks/bench_reorder.py
+# ---------------------------------------------------------
+# Reordering a 10k-player roster:
+# - one update_bat_order() call (and commit) per row
+# - db_sqlite.reorder_lineup() / move_player() in one transaction
+#   python -m benchmarks.bench_reorder
+# ---------------------------------------------------------
+
+import time
+
+import db_sqlite
+from benchmarks.common import temp_database
+
+ROSTER_SIZE = 10_000
+
+
+def current_order():
+    return [row[0] for row in db_sqlite.get_all_players()]
+
+
+def main():
+    with temp_database(player_count=ROSTER_SIZE):
+        ids = current_order()
+        reversed_ids = ids[::-1]
+
+        # Row by row: park on negatives first so UNIQUE(batOrder) holds
+        start = time.perf_counter()
+        for player_id in ids:
+            db_sqlite.update_bat_order(player_id, -player_id)
+        for order, player_id in enumerate(reversed_ids, 1):
+            db_sqlite.update_bat_order(player_id, order)
+        per_row = time.perf_counter() - start
+        assert current_order() == reversed_ids
+
+        start = time.perf_counter()
+        db_sqlite.reorder_lineup(ids)
+        batched = time.perf_counter() - start
+        assert current_order() == ids
+
+        # Move the last batter to the top
+        start = time.perf_counter()
+        db_sqlite.move_player(ids[-1], 1)
+        moved = time.perf_counter() - start
+        assert current_order() == [ids[-1]] + ids[:-1]
+
+    print(f"Roster size: {ROSTER_SIZE:,}")
+    print(f"update_bat_order per row : {per_row * 1000:10.1f} ms")
+    print(f"reorder_lineup           : {batched * 1000:10.1f} ms"
+          f"  ({per_row / batched:.0f}x faster)")
+    print(f"move_player last -> 1    : {moved * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# benchmarks/bench_roster_pages.py
+# ---------------------------------------------------------
+# Cost of one GUI roster page (RosterBrowser.PAGE_ROWS rows)
+# as the Player table grows, versus loading every row with
+# get_all_players(). Page cost should stay flat.
+#   python -m benchmarks.bench_roster_pages
+# ---------------------------------------------------------
+
+import time
+
+import db_sqlite
+from benchmarks.common import temp_database
+
+PAGE_ROWS = 15
+SIZES = (10_000, 100_000, 500_000)
+
+
+def ms(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    print(f"{'Players':>10}{'all rows':>12}{'first page':>12}"
+          f"{'middle page':>13}{'last page':>11}{'search':>10}   (ms)")
+
+    for size in SIZES:
+        with temp_database(player_count=size):
+            all_rows = ms(db_sqlite.get_all_players)
+            first = ms(db_sqlite.get_players_page, 0, PAGE_ROWS)
+            middle = ms(db_sqlite.get_players_page, size // 2, PAGE_ROWS)
+            last = ms(db_sqlite.get_players_page_before, size + 1, PAGE_ROWS)
+            search = ms(db_sqlite.get_players_page, 0, PAGE_ROWS, "posey")
+
+        print(f"{size:>10,}{all_rows:>12.1f}{first:>12.2f}"
+              f"{middle:>13.2f}{last:>11.2f}{search:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# benchmarks/bench_server.py
+# ---------------------------------------------------------
+# Load test for server.py against localhost:
+# starts the server (separate process) on a temp database of
+# PLAYERS players, then CLIENTS keep-alive connections each send
+# REQUESTS requests as fast as they can, for each mix:
+# - read: /players pages, /players/ID, /leaders
+# - revalidate: the same reads with If-None-Match (-> 304)
+# - mixed: 90% reads, 10% PUT /players/ID through the writer queue
+# Reports requests/s and p50/p99 latency per mix.
+#   python -m benchmarks.bench_server [clients]
+# ---------------------------------------------------------
+
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import db_sqlite
+from benchmarks.common import POSITIONS, temp_database
+
+PLAYERS = 10_000
+REQUESTS = 500
+ROOT = Path(__file__).resolve().parents[1]
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, port):
+        return cls(*await asyncio.open_connection("127.0.0.1", port))
+
+    async def request(self, method, target, body=None, etag=None):
+        """-> (status, ETag, body bytes)"""
+        data = json.dumps(body).encode() if body is not None else b""
+        head = (f"{method} {target} HTTP/1.1\r\n"
+                f"Host: localhost\r\nContent-Length: {len(data)}\r\n")
+        if etag:
+            head += f"If-None-Match: {etag}\r\n"
+        self.writer.write((head + "\r\n").encode() + data)
+
+        lines = (await self.reader.readuntil(b"\r\n\r\n")).decode().split("\r\n")
+        headers = dict(line.split(": ", 1) for line in lines[1:] if line)
+        payload = await self.reader.readexactly(int(headers["Content-Length"]))
+        return int(lines[0].split()[1]), headers.get("ETag"), payload
+
+    def close(self):
+        self.writer.close()
+
+
+def read_target(rng):
+    kind = rng.random()
+    if kind < 0.4:
+        return f"/players?after={rng.randrange(PLAYERS)}&limit=50"
+    if kind < 0.8:
+        return f"/players/{rng.randrange(1, PLAYERS + 1)}"
+    return "/leaders?limit=10&min_at_bats=100"
+
+
+async def client_run(port, mix, seed, etags, latencies, statuses):
+    rng = random.Random(seed)
+    client = await Client.connect(port)
+
+    try:
+        for _ in range(REQUESTS):
+            start = time.perf_counter()
+
+            if mix == "mixed" and rng.random() < 0.1:
+                ab = rng.randint(0, 600)
+                status, _, _ = await client.request(
+                    "PUT", f"/players/{rng.randrange(1, PLAYERS + 1)}",
+                    {"first_name": "Load", "last_name": f"Test{seed}",
+                     "position": rng.choice(POSITIONS), "at_bats": ab,
+                     "hits": rng.randint(0, ab)})
+            else:
+                target = read_target(rng)
+                etag = etags.get(target) if mix == "revalidate" else None
+                status, tag, _ = await client.request("GET", target, etag=etag)
+                etags[target] = tag
+
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        client.close()
+
+
+async def load(port, mix, clients):
+    latencies = []
+    statuses = {}
+    etags = [{} for _ in range(clients)]
+
+    if mix == "revalidate":
+        # Warm-up pass (same requests) so every client has ETags to send
+        await asyncio.gather(*(client_run(port, "read", seed, etags[seed], [], {})
+                               for seed in range(clients)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_run(port, mix, seed, etags[seed], latencies, statuses)
+                           for seed in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"{mix:<11}: {len(latencies) / elapsed:8,.0f} req/s  "
+          f"p50 {p50:6.2f} ms  p99 {p99:6.2f} ms  status {dict(sorted(statuses.items()))}")
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+
+    with temp_database(player_count=PLAYERS):
+        db_sqlite.close_connections()
+
+        server = subprocess.Popen(
+            [sys.executable, "server.py", "--db", db_sqlite.DB_FILE, "--port", "0"],
+            cwd=ROOT, stdout=subprocess.PIPE, text=True)
+        try:
+            line = server.stdout.readline()
+            port = int(line.split(":")[2].split()[0])
+
+            print(f"Players: {PLAYERS:,}, clients: {clients}, "
+                  f"requests per client: {REQUESTS}")
+            for mix in ("read", "revalidate", "mixed"):
+                asyncio.run(load(port, mix, clients))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_stats.py
+# ---------------------------------------------------------
+# Top-10 hitters (min 100 AB) + league AVG for a big roster:
+# - per-object loop calling Player.batting_average()
+# - stats module (columns once, then C-level passes) on Lineup
+#   and ColumnarLineup
+#   python -m benchmarks.bench_stats [players]
+# ---------------------------------------------------------
+
+import sys
+import time
+
+import stats
+from benchmarks.common import make_players
+from objects import ColumnarLineup, Lineup
+
+MIN_AB = 100
+
+
+def per_object(lineup):
+    """The plain loop: one method call per player, then sort."""
+    ranked = []
+    total_ab = total_hits = 0
+    for number, p in enumerate(lineup, 1):
+        total_ab += p.at_bats
+        total_hits += p.hits
+        if p.at_bats >= MIN_AB:
+            ranked.append((p.batting_average(), p.at_bats, -number))
+    ranked.sort(reverse=True)
+    league = round(total_hits / total_ab, 3) if total_ab else 0.0
+    return [(-number, avg) for avg, _, number in ranked[:10]], league
+
+
+def column_pass(lineup):
+    """Columns built once, then top-10 and league AVG from them."""
+    at_bats, hits = stats.columns(lineup)
+    return (stats.rank(at_bats, hits, 10, MIN_AB),
+            stats.league_average(at_bats, hits))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    lineup = Lineup()
+    lineup.load_from_dicts(make_players(count))
+    columnar = ColumnarLineup()
+    columnar.load_from_dicts(make_players(count))
+
+    expected, loop_time = timed(per_object, lineup)
+    result_a, lineup_time = timed(column_pass, lineup)
+    result_b, columnar_time = timed(column_pass, columnar)
+    assert expected == result_a == result_b
+
+    print(f"Players: {count:,}")
+    print(f"per-object loop          : {loop_time:6.2f} s")
+    print(f"stats on Lineup          : {lineup_time:6.2f} s"
+          f"  ({loop_time / lineup_time:.1f}x)")
+    print(f"stats on ColumnarLineup  : {columnar_time:6.2f} s"
+          f"  ({loop_time / columnar_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_teams.py
+# ---------------------------------------------------------
+# Per-team queries as the organization's history grows:
+# TEAMS teams x N seasons x ROSTER players in one Player table,
+# then the same after moving one team into its own shard file.
+# Scoped queries use the (team, season, ...) indexes, so their
+# cost should stay flat while the table grows.
+#   python -m benchmarks.bench_teams
+# ---------------------------------------------------------
+
+import time
+from pathlib import Path
+
+import db_sqlite
+from benchmarks.common import make_players, temp_database
+
+TEAMS = 30
+ROSTER = 40
+SEASONS = (10, 50, 200)
+REPEAT = 50
+
+
+def ms(func, *args, **kwargs):
+    """Average milliseconds per call over REPEAT calls."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000 / REPEAT
+
+
+def fill(seasons):
+    """Insert TEAMS x seasons rosters of ROSTER players."""
+    conn = db_sqlite.get_connection()
+    players = list(make_players(ROSTER))
+
+    with conn:
+        conn.executemany("""
+            INSERT INTO Player (batOrder, firstName, lastName, position, atBats, hits,
+                                team, season)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            (order, p["first_name"], p["last_name"], p["position"],
+             p["at_bats"], p["hits"], f"Team{team}", 2000 + season)
+            for team in range(TEAMS)
+            for season in range(seasons)
+            for order, p in enumerate(players, 1)
+        ))
+
+
+def timings():
+    scope = {"team": "Team7", "season": 2005}
+    return (ms(db_sqlite.get_all_players, **scope),
+            ms(db_sqlite.get_leaders, 10, 100, **scope),
+            ms(db_sqlite.get_position_summary, **scope))
+
+
+def main():
+    print(f"{'rows':>10}{'where':>8}{'roster':>10}{'leaders':>10}{'positions':>11}   (ms)")
+
+    for seasons in SEASONS:
+        with temp_database() as path:
+            fill(seasons)
+            rows = TEAMS * seasons * ROSTER
+
+            print(f"{rows:>10,}{'main':>8}" + "".join(
+                f"{t:>10.3f}" for t in timings()))
+
+            db_sqlite.add_shard("Team7", Path(path).with_name("team7.sqlite"))
+            try:
+                print(f"{rows:>10,}{'shard':>8}" + "".join(
+                    f"{t:>10.3f}" for t in timings()))
+            finally:
+                db_sqlite.SHARDS.pop("Team7")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/common.py
+# ---------------------------------------------------------
+# Shared helpers for the benchmark scripts:
+# - synthetic roster generator
+# - temporary SQLite database
+# - simple timer
+# ---------------------------------------------------------
+
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import db_sqlite
+
+POSITIONS = ("C", "1B", "2B", "3B", "SS", "LF", "CF", "RF", "P")
+
+FIRST_NAMES = ("Mike", "Donovan", "Tommy", "Buster", "Brandon",
+               "Alex", "Austin", "Kevin", "Akosua", "Evan")
+LAST_NAMES = ("Yastrzemski", "Solano", "La Stella", "Posey", "Belt",
+              "Crawford", "Dickerson", "Slater", "Gausman", "Otu")
+
+
+def make_players(count, seed=1):
+    """
+    Yield `count` synthetic player dicts (NEW CSV structure).
+    Same seed -> same roster.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        ab = rng.randint(0, 600)
+        yield {
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": f"{rng.choice(LAST_NAMES)}{i}",
+            "position": rng.choice(POSITIONS),
+            "at_bats": ab,
+            "hits": rng.randint(0, ab),
+        }
+
+
+@contextmanager
+def temp_database(player_count=0):
+    """
+    Point db_sqlite at a fresh database in a temp folder.
+    Optionally seed it with `player_count` synthetic players.
+    """
+    old_file = db_sqlite.DB_FILE
+
+    with tempfile.TemporaryDirectory() as folder:
+        db_sqlite.DB_FILE = str(Path(folder) / "bench.sqlite")
+        try:
+            db_sqlite.create_tables()
+
+            conn = db_sqlite.get_connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO Position (positionValue) VALUES (?)",
+                    [(p,) for p in POSITIONS]
+                )
+                conn.executemany("""
+                    INSERT INTO Player (batOrder, firstName, lastName, position, atBats, hits)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (
+                    (i, p["first_name"], p["last_name"], p["position"],
+                     p["at_bats"], p["hits"])
+                    for i, p in enumerate(make_players(player_count), 1)
+                ))
+
+            yield db_sqlite.DB_FILE
+        finally:
+            db_sqlite.close_connections()
+            db_sqlite.DB_FILE = old_file
+
+
+def ops_per_second(func, seconds=1.0):
+    """Call func() repeatedly for about `seconds`, return calls per second."""
+    count = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+
+    while elapsed < seconds:
+        func()
+        count += 1
+        elapsed = time.perf_counter() - start
+
+    return count / elapsed
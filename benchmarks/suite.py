@@ -0,0 +1,233 @@
+# benchmarks/suite.py
+# ---------------------------------------------------------
+# Reproducible benchmark suite for the hot paths:
+# - CSV:     db.load_lineup, db.save_lineup
+# - objects: Lineup.load_from_dicts, to_dicts, move_player, remove_player
+# - UI:      ui.display (output sent to os.devnull)
+# - SQLite:  every db_sqlite CRUD function
+#
+# Results are JSON. With --baseline, results are compared to an
+# earlier run and slowdowns above --threshold are flagged
+# (exit code 1), so it can gate regressions.
+# Every run also checks the EXPLAIN QUERY PLAN of the indexed queries
+# (bench_leaderboard.PLANS) at each size: exit code 1 if one stops
+# using its index.
+#
+#   python -m benchmarks.suite --sizes 1000,100000 --output bench.json
+#   python -m benchmarks.suite --baseline bench.json
+# ---------------------------------------------------------
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import db
+import db_sqlite
+import ui
+from benchmarks.bench_leaderboard import check_plans
+from benchmarks.common import make_players, temp_database
+from objects import Lineup
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+MAX_SIZE = 10_000_000
+
+# Point operations (get_player, update_player, ...) run this many times
+# and report the average per call.
+POINT_CALLS = 200
+
+
+def best_of(func, repeat):
+    """Run func() `repeat` times, return the fastest time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def per_call(func, calls=POINT_CALLS):
+    """Average seconds per call over `calls` calls of func(i)."""
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls
+
+
+def repeats_for(size):
+    """Fewer repeats for big rosters so a run stays practical."""
+    return 5 if size <= 10_000 else 3 if size <= 1_000_000 else 1
+
+
+def bench_files_and_objects(size, results):
+    repeat = repeats_for(size)
+    dicts = list(make_players(size))
+    old_file = db.DATA_FILE
+
+    with tempfile.TemporaryDirectory() as folder:
+        db.DATA_FILE = Path(folder) / "players.csv"
+        try:
+            results["db.save_lineup"] = best_of(lambda: db.save_lineup(dicts), repeat)
+            results["db.load_lineup"] = best_of(db.load_lineup, repeat)
+        finally:
+            db.DATA_FILE = old_file
+
+    lineup = Lineup()
+    results["Lineup.load_from_dicts"] = best_of(
+        lambda: lineup.load_from_dicts(dicts), repeat
+    )
+    results["Lineup.to_dicts"] = best_of(lineup.to_dicts, repeat)
+
+    # Worst case for a list: move/remove at the front
+    results["Lineup.move_player"] = per_call(
+        lambda i: lineup.move_player(1, len(lineup))
+    )
+    results["Lineup.remove_player"] = per_call(
+        lambda i: lineup.remove_player(1), calls=min(POINT_CALLS, len(lineup))
+    )
+
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        results["ui.display"] = best_of(lambda: ui.display(dicts), repeat)
+
+
+def bench_sqlite(size, results, plan_failures):
+    with temp_database(player_count=size):
+        plan_failures.extend(f"@{size} {failure}" for failure in check_plans())
+
+        repeat = repeats_for(size)
+        middle = max(size // 2, 1)
+
+        # Cache off: measure the database, not the LRU cache
+        cache_ttl = db_sqlite.CACHE_TTL
+        db_sqlite.configure_cache(ttl=0)
+        try:
+            results["db_sqlite.get_all_players"] = best_of(
+                db_sqlite.get_all_players, repeat
+            )
+            results["db_sqlite.get_player"] = per_call(
+                lambda i: db_sqlite.get_player(middle)
+            )
+            results["db_sqlite.get_positions"] = per_call(
+                lambda i: db_sqlite.get_positions()
+            )
+            results["db_sqlite.update_player"] = per_call(
+                lambda i: db_sqlite.update_player(middle, "Bench", "Mark", "C", i, 0)
+            )
+            results["db_sqlite.add_player"] = per_call(
+                lambda i: db_sqlite.add_player(size + 1 + i, "New", "Player", "P", 0, 0)
+            )
+            results["db_sqlite.update_bat_order"] = per_call(
+                lambda i: db_sqlite.update_bat_order(middle, -1 - i)
+            )
+            results["db_sqlite.delete_player"] = per_call(
+                lambda i: db_sqlite.delete_player(size + 1 + i)
+            )
+        finally:
+            db_sqlite.configure_cache(ttl=cache_ttl)
+
+
+def run(sizes):
+    """Run every benchmark at every size; return the JSON-ready report."""
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlite": db_sqlite.sqlite3.sqlite_version,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "sizes": list(sizes),
+        },
+        "results": {},
+        "plan_failures": [],
+    }
+
+    for size in sizes:
+        results = {}
+        bench_files_and_objects(size, results)
+        bench_sqlite(size, results, report["plan_failures"])
+
+        for name, seconds in results.items():
+            report["results"][f"{name}@{size}"] = round(seconds, 9)
+
+        print(f"size {size:,}: done", file=sys.stderr)
+
+    return report
+
+
+def compare(report, baseline, threshold):
+    """
+    Return (name, old, new, ratio) for results slower than
+    baseline by more than `threshold` (0.25 = 25%).
+    """
+    regressions = []
+    for name, new in report["results"].items():
+        old = baseline["results"].get(name)
+        if old and new > old * (1 + threshold):
+            regressions.append((name, old, new, new / old))
+    return regressions
+
+
+def print_table(report, baseline=None):
+    print(f"{'benchmark':<40}{'seconds':>14}{'baseline':>14}{'ratio':>8}")
+    for name, seconds in report["results"].items():
+        old = baseline["results"].get(name) if baseline else None
+        if old:
+            print(f"{name:<40}{seconds:>14.6f}{old:>14.6f}{seconds / old:>7.2f}x")
+        else:
+            print(f"{name:<40}{seconds:>14.6f}")
+
+
+def parse_sizes(text):
+    sizes = tuple(int(part) for part in text.split(","))
+    if any(size < 1 or size > MAX_SIZE for size in sizes):
+        raise argparse.ArgumentTypeError(f"sizes must be 1..{MAX_SIZE:,}")
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Baseball Team Manager benchmarks")
+    parser.add_argument("--sizes", type=parse_sizes, default=DEFAULT_SIZES,
+                        help="comma-separated roster sizes (default 1000,10000,100000)")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="flag results this much slower than baseline (default 0.25)")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print_table(report, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    status = 0
+    for failure in report["plan_failures"]:
+        print(f"EXPLAIN FAILED {failure}")
+        status = 1
+
+    if baseline:
+        regressions = compare(report, baseline, args.threshold)
+        for name, old, new, ratio in regressions:
+            print(f"REGRESSION {name}: {old:.6f}s -> {new:.6f}s ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        if not status:
+            print("No regressions.")
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,12 +5,31 @@
 # - Old CSV format: name,position,at_bats,hits  (4 fields)
 # - New CSV format: first_name,last_name,position,at_bats,hits (5 fields)
 # Always SAVES in the NEW format (5 fields).
+# iter_lineup() streams players lazily; load_lineup() builds a list;
+# load_columns() bulk-loads one list/array per field.
+# Snapshots are replaced atomically; the previous one is kept as
+# players.csv.bak and restore_backup() puts it back after a crash.
+# Parsing/writing uses the C-accelerated csv module, so names that
+# contain commas are quoted correctly.
 # ---------------------------------------------------------
 
+import csv
+import os
+from array import array
+from itertools import chain, islice
 from pathlib import Path
 
+import perf
+
 DATA_FILE = Path("players.csv")
 
+# Writes go out in chunks of rows through a large file buffer
+WRITE_CHUNK = 10_000
+WRITE_BUFFER = 1 << 20
+
+# load_columns() reads the file in blocks of about this many bytes
+READ_CHUNK = 1 << 20
+
 
 def split_name(full_name):
     """
@@ -29,6 +48,97 @@ def split_name(full_name):
         return "", ""
 
 
+def _parse_new(row):
+    """NEW format (5 fields): first,last,position,ab,hits"""
+    first, last, pos, ab, hits = row
+    return {
+        "first_name": first.strip(),
+        "last_name": last.strip(),
+        "position": pos.strip(),
+        "at_bats": int(ab),
+        "hits": int(hits)
+    }
+
+
+def _parse_old(row):
+    """OLD format (4 fields): name,position,ab,hits"""
+    name, pos, ab, hits = row
+    first, last = split_name(name)
+    return {
+        "first_name": first,
+        "last_name": last,
+        "position": pos.strip(),
+        "at_bats": int(ab),
+        "hits": int(hits)
+    }
+
+
+# Field count -> parser
+_PARSERS = {4: _parse_old, 5: _parse_new}
+
+
+def parse_fields(row):
+    """
+    Parse one CSV row (list of fields, old or new format).
+    Returns a dict in the NEW structure, or None for blank/malformed rows.
+    """
+    parser = _PARSERS.get(len(row))
+    if parser is None:
+        # Skip malformed lines safely
+        return None
+
+    try:
+        return parser(row)
+    except ValueError:
+        return None
+
+
+def parse_line(line):
+    """Parse one CSV line (see parse_fields)."""
+    return parse_fields(next(csv.reader([line]), []))
+
+
+def _players(rows):
+    """
+    Parse csv rows into player dicts, skipping blank/malformed rows.
+    The format (old/new) is detected once, from the first valid row;
+    rows in the other format still parse, just on the slower path.
+    """
+    width = None
+    parse = None
+
+    for row in rows:
+        if len(row) == width:
+            try:
+                yield parse(row)
+            except ValueError:
+                continue
+            continue
+
+        player = parse_fields(row)
+        if player is not None:
+            if width is None:
+                width = len(row)
+                parse = _PARSERS[width]
+            yield player
+
+
+def iter_lineup(path=None):
+    """
+    Yield players from CSV one at a time (dicts in the NEW structure).
+    Nothing is kept in memory, so callers can filter/aggregate/display
+    huge files. path defaults to DATA_FILE.
+    """
+    path = Path(path) if path is not None else DATA_FILE
+
+    if not path.exists():
+        return
+
+    with path.open("r", encoding="utf-8", newline="") as f:
+        yield from _players(csv.reader(f))
+
+
+@perf.timed(rows=len)
 def load_lineup():
     """
     Load players from CSV.
@@ -41,66 +151,199 @@ def load_lineup():
       "hits": int
     }
     """
-    lineup = []
+    return list(iter_lineup())
 
-    if not DATA_FILE.exists():
-        return lineup
 
-    with DATA_FILE.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
+@perf.timed(rows=lambda columns: len(columns["at_bats"]))
+def load_columns(path=None):
+    """
+    Bulk load players as COLUMNS instead of one dict per player:
+    {"first_name": [...], "last_name": [...], "position": [...],
+     "at_bats": array('i'), "hits": array('i')}
+    The file is read in blocks of READ_CHUNK bytes. Fast path (new
+    format, no quotes): each block is split once and each column is a
+    slice decoded in bulk (map(int, ...)). From the first block that
+    is anything else, the rest of the file goes through the
+    row-by-row csv parser.
+    """
+    path = Path(path) if path is not None else DATA_FILE
+    columns = _columns_from_players([])
 
-            parts = [p.strip() for p in line.split(",")]
-
-            # OLD format (4 fields): name,position,ab,hits
-            if len(parts) == 4:
-                first, last = split_name(parts[0])
-                pos = parts[1]
-                try:
-                    ab = int(parts[2])
-                    hits = int(parts[3])
-                except ValueError:
-                    continue
-
-            # NEW format (5 fields): first,last,position,ab,hits
-            elif len(parts) == 5:
-                first = parts[0]
-                last = parts[1]
-                pos = parts[2]
-                try:
-                    ab = int(parts[3])
-                    hits = int(parts[4])
-                except ValueError:
-                    continue
-
-            else:
-                # Skip malformed lines safely
-                continue
+    if not path.exists():
+        return columns
 
-            lineup.append({
-                "first_name": first,
-                "last_name": last,
-                "position": pos,
-                "at_bats": ab,
-                "hits": hits
-            })
+    with path.open("r", encoding="utf-8", newline="") as f:
+        while True:
+            block = f.readlines(READ_CHUNK)
+            if not block:
+                return columns
+
+            if not _extend_columns(columns, block):
+                _columns_from_players(_players(csv.reader(chain(block, f))), columns)
+                return columns
+
+
+def _extend_columns(columns, block):
+    """
+    Fast path of load_columns: append one block of lines to the
+    columns. Returns False (columns unchanged) if the block needs the
+    csv parser: quotes, a line without exactly 5 fields, a bad number.
+    """
+    text = "".join(block)
+    if '"' in text:
+        return False
 
-    return lineup
+    lines = [line for line in text.split("\n") if line.strip()]
+    if not lines:
+        # Blank lines only (e.g. the trailing newline of the file)
+        return True
 
+    # Every line must have exactly 5 fields, or columns would shift
+    if not all(line.count(",") == 4 for line in lines):
+        return False
 
+    fields = ",".join(lines).split(",")
+    try:
+        at_bats = array("i", map(int, fields[3::5]))
+        hits = array("i", map(int, fields[4::5]))
+    except ValueError:
+        return False
+
+    strip = str.strip
+    columns["first_name"].extend(map(strip, fields[0::5]))
+    columns["last_name"].extend(map(strip, fields[1::5]))
+    columns["position"].extend(map(strip, fields[2::5]))
+    columns["at_bats"].extend(at_bats)
+    columns["hits"].extend(hits)
+    return True
+
+
+def _columns_from_players(players, columns=None):
+    """Player dicts -> column dict (slow path for load_columns)."""
+    if columns is None:
+        columns = {
+            "first_name": [],
+            "last_name": [],
+            "position": [],
+            "at_bats": array("i"),
+            "hits": array("i"),
+        }
+    for p in players:
+        for name, column in columns.items():
+            column.append(p[name])
+    return columns
+
+
+def player_rows(lineup):
+    """Player dicts -> (first, last, position, ab, hits) tuples."""
+    for p in lineup:
+        yield (p["first_name"], p["last_name"], p["position"],
+               p["at_bats"], p["hits"])
+
+
+def _write_chunk(f, text, count, rows):
+    """
+    Write one chunk of `count` rows formatted with plain string
+    formatting, or the same rows through csv.writer if any field needs
+    quoting (comma, quote or newline in a name).
+    """
+    if ('"' not in text and "\r" not in text
+            and text.count(",") == 4 * count
+            and text.count("\n") == count):
+        f.write(text)
+    else:
+        csv.writer(f, lineterminator="\n").writerows(rows)
+
+
+def write_rows(f, rows):
+    """
+    Write (first, last, position, ab, hits) rows to an open text file
+    in NEW format, WRITE_CHUNK rows per write().
+    Returns the number of rows written.
+    """
+    rows = iter(rows)
+    count = 0
+
+    while True:
+        chunk = list(islice(rows, WRITE_CHUNK))
+        if not chunk:
+            return count
+
+        _write_chunk(f, "".join([f"{first},{last},{pos},{ab},{hits}\n"
+                                 for first, last, pos, ab, hits in chunk]),
+                     len(chunk), chunk)
+        count += len(chunk)
+
+
+def write_players(f, players):
+    """
+    write_rows() straight from player dicts: each chunk is formatted
+    from the dicts, without building a row tuple per player.
+    Returns the number of players written.
+    """
+    players = iter(players)
+    count = 0
+
+    while True:
+        chunk = list(islice(players, WRITE_CHUNK))
+        if not chunk:
+            return count
+
+        text = "".join([f"{p['first_name']},{p['last_name']},{p['position']},"
+                        f"{p['at_bats']},{p['hits']}\n" for p in chunk])
+        _write_chunk(f, text, len(chunk), player_rows(chunk))
+        count += len(chunk)
+
+
+@perf.timed(rows=int)
 def save_lineup(lineup):
     """
     Save list of dicts to CSV in NEW (5-field) format.
+    Writes a temp file first, then renames it over DATA_FILE,
+    so a crash never leaves a half-written players.csv
+    (the previous snapshot is kept as players.csv.bak).
+    Returns the number of players written.
     """
-    with DATA_FILE.open("w", encoding="utf-8") as f:
-        for p in lineup:
-            line = (
-                f"{p['first_name']},"
-                f"{p['last_name']},"
-                f"{p['position']},"
-                f"{p['at_bats']},"
-                f"{p['hits']}\n"
-            )
-            f.write(line)
\ No newline at end of file
+    temp_file = DATA_FILE.with_name(DATA_FILE.name + ".tmp")
+
+    with temp_file.open("w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        count = write_players(f, lineup)
+        f.flush()
+        os.fsync(f.fileno())
+
+    replace_snapshot(temp_file)
+    return count
+
+
+def backup_file(path=None):
+    """Previous-snapshot path (players.csv -> players.csv.bak)."""
+    path = Path(path) if path is not None else DATA_FILE
+    return path.with_name(path.name + ".bak")
+
+
+def replace_snapshot(temp_file, path=None):
+    """
+    Rename a fully written temp file over the snapshot, keeping the
+    previous snapshot as players.csv.bak (last good copy).
+    """
+    path = Path(path) if path is not None else DATA_FILE
+
+    if path.exists():
+        os.replace(path, backup_file(path))
+    os.replace(temp_file, path)
+
+
+def restore_backup(path=None):
+    """
+    After a crash between the two renames in replace_snapshot() the
+    snapshot is missing: put the last good one (.bak) back.
+    Returns True if the backup was restored.
+    """
+    path = Path(path) if path is not None else DATA_FILE
+    backup = backup_file(path)
+
+    if path.exists() or not backup.exists():
+        return False
+
+    os.replace(backup, path)
+    return True
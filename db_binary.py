@@ -0,0 +1,175 @@
+# db_binary.py
+# ---------------------------------------------------------
+# Optional binary snapshot format for fast lineup load/save.
+#
+# File layout (little-endian):
+#   header   : magic "BBLS", version, player count, string count,
+#              string table size (bytes)
+#   strings  : every distinct name/position, UTF-8, separated by "\0",
+#              padded to a multiple of 4 bytes
+#   columns  : 5 packed int32 columns, player count entries each:
+#              first name code, last name code, position code,
+#              at bats, hits
+#
+# Loading maps the file (mmap) and copies each column straight into
+# a ColumnarLineup array: no per-player parsing at all.
+#
+# Conversion tools:
+#   python db_binary.py to-bin players.csv players.bin
+#   python db_binary.py to-csv players.bin players.csv
+# ---------------------------------------------------------
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+import db
+import perf
+from objects import ColumnarLineup
+
+DATA_FILE = Path("players.bin")
+
+MAGIC = b"BBLS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIQ")    # magic, version, reserved, players, strings, table bytes
+COLUMN_ORDER = ("first_names", "last_names", "positions", "at_bats", "hits")
+
+# Columns are stored little-endian int32
+_SWAP = sys.byteorder != "little"
+assert array("i").itemsize == 4
+
+
+def _padding(size):
+    return -size % 4
+
+
+@perf.timed(rows=int)
+def save_lineup(lineup, path=None):
+    """
+    Save a ColumnarLineup (or any Lineup) as a binary snapshot.
+    Written to a temp file, then renamed (crash-safe).
+    Returns the number of players written. Raises ValueError (nothing
+    written) if a column does not have one entry per player.
+    """
+    path = Path(path) if path is not None else DATA_FILE
+
+    if not isinstance(lineup, ColumnarLineup):
+        columnar = ColumnarLineup()
+        for player in lineup:
+            columnar.add_player(player)
+        lineup = columnar
+
+    lengths = {name: len(getattr(lineup, name)) for name in COLUMN_ORDER}
+    if any(length != len(lineup) for length in lengths.values()):
+        raise ValueError(f"Columns have different lengths: {lengths}")
+
+    table = "\0".join(lineup.strings).encode("utf-8")
+    temp_file = path.with_name(path.name + ".tmp")
+
+    with temp_file.open("wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(lineup),
+                            len(lineup.strings), len(table)))
+        f.write(table)
+        f.write(b"\0" * _padding(len(table)))
+
+        for name in COLUMN_ORDER:
+            column = getattr(lineup, name)
+            if _SWAP:
+                column = array("i", column)
+                column.byteswap()
+            f.write(column.tobytes())
+
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(temp_file, path)
+    return len(lineup)
+
+
+@perf.timed(rows=len)
+def load_lineup(path=None):
+    """Load a binary snapshot into a ColumnarLineup."""
+    path = Path(path) if path is not None else DATA_FILE
+    lineup = ColumnarLineup()
+
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < HEADER.size:
+            raise ValueError(f"{path} is not a lineup snapshot (too small).")
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                magic, version, _, count, string_count, table_size = \
+                    HEADER.unpack_from(view)
+
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError(f"{path} is not a version {VERSION} lineup snapshot.")
+
+                start = HEADER.size
+                end = start + table_size
+                table = bytes(view[start:end]).decode("utf-8")
+                lineup.strings = table.split("\0") if string_count else []
+                lineup.codes = None     # built lazily on first edit
+
+                offset = end + _padding(table_size)
+                if offset + 5 * 4 * count > size:
+                    raise ValueError(f"{path} is truncated.")
+
+                for name in COLUMN_ORDER:
+                    column = array("i")
+                    column.frombytes(view[offset:offset + 4 * count])
+                    if _SWAP:
+                        column.byteswap()
+                    setattr(lineup, name, column)
+                    offset += 4 * count
+            finally:
+                view.release()
+
+    return lineup
+
+
+def csv_to_binary(csv_path=None, bin_path=None):
+    """Convert players.csv (old or new format) to a binary snapshot."""
+    lineup = ColumnarLineup()
+    lineup.load_from_columns(db.load_columns(csv_path))
+    return save_lineup(lineup, bin_path)
+
+
+def binary_to_csv(bin_path=None, csv_path=None):
+    """Convert a binary snapshot back to a NEW-format players CSV."""
+    lineup = load_lineup(bin_path)
+    strings = lineup.strings
+    rows = zip(map(strings.__getitem__, lineup.first_names),
+               map(strings.__getitem__, lineup.last_names),
+               map(strings.__getitem__, lineup.positions),
+               lineup.at_bats,
+               lineup.hits)
+
+    csv_path = Path(csv_path) if csv_path is not None else db.DATA_FILE
+    with csv_path.open("w", encoding="utf-8", buffering=db.WRITE_BUFFER) as f:
+        return db.write_rows(f, rows)
+
+
+def main(argv):
+    """Command line: to-bin CSV BIN  |  to-csv BIN CSV"""
+    if len(argv) != 3 or argv[0] not in ("to-bin", "to-csv"):
+        print("Usage: python db_binary.py to-bin players.csv players.bin")
+        print("       python db_binary.py to-csv players.bin players.csv")
+        return 2
+
+    command, source, target = argv
+    if command == "to-bin":
+        count = csv_to_binary(source, target)
+    else:
+        count = binary_to_csv(source, target)
+
+    print(f"{count:,} players written to {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
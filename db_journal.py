@@ -0,0 +1,248 @@
+# db_journal.py
+# ---------------------------------------------------------
+# Append-only operation journal for the console app.
+# - Each edit appends ONE small JSON line to players.journal
+#   (O(1) disk I/O instead of rewriting players.csv)
+# - load_lineup() = players.csv snapshot + replayed journal
+#   (or apply(lineup, pending_records()) onto a lineup object)
+# - compact() writes a new snapshot (atomic rename) and
+#   starts a new journal
+#
+# Crash safety: the first journal line stamps the snapshot it
+# belongs to (size + mtime of players.csv). If players.csv no
+# longer matches, it already contains those edits, so the
+# journal is ignored instead of being replayed twice.
+#
+# Record formats (one JSON object per line):
+#   {"op": "snapshot", "stamp": [size, mtime_ns]}   (first line)
+#   {"op": "add",    "player": {...player dict...}}
+#   {"op": "remove", "number": 3}
+#   {"op": "move",   "from": 4, "to": 1}
+#   {"op": "edit",   "number": 2, "fields": {"position": "SS"}}
+# ---------------------------------------------------------
+
+import json
+import os
+from pathlib import Path
+
+import db
+import perf
+from objects import Player
+
+JOURNAL_FILE = Path("players.journal")
+
+# Compact after this many journal records
+COMPACT_EVERY = 100
+
+# fsync each record (crash-safe, slower); False = flush only
+# (then call sync() to make the records durable)
+FSYNC = True
+
+_journal = None
+_pending = 0
+
+
+def _snapshot_stamp():
+    """Identify the current players.csv snapshot: [size, mtime_ns] or None."""
+    if not db.DATA_FILE.exists():
+        return None
+    st = db.DATA_FILE.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _header():
+    record = {"op": "snapshot", "stamp": _snapshot_stamp()}
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def _open():
+    """Open the journal for appending (kept open between records)."""
+    global _journal
+    if _journal is None or _journal.closed:
+        if not JOURNAL_FILE.exists():
+            _reset()
+        _journal = JOURNAL_FILE.open("a", encoding="utf-8")
+    return _journal
+
+
+def close():
+    """Close the journal file handle."""
+    global _journal
+    if _journal is not None:
+        _journal.close()
+        _journal = None
+
+
+@perf.timed(rows=1)
+def append(record):
+    """Append one record to the journal."""
+    global _pending
+
+    f = _open()
+    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    f.flush()
+    if FSYNC:
+        os.fsync(f.fileno())
+
+    _pending += 1
+
+
+def sync():
+    """fsync records written with FSYNC = False (write-behind saving)."""
+    if _journal is not None and not _journal.closed:
+        _journal.flush()
+        os.fsync(_journal.fileno())
+
+
+def log_add(player_dict):
+    append({"op": "add", "player": player_dict})
+
+
+def log_remove(number):
+    append({"op": "remove", "number": number})
+
+
+def log_move(current_number, new_number):
+    append({"op": "move", "from": current_number, "to": new_number})
+
+
+def log_edit(number, **fields):
+    append({"op": "edit", "number": number, "fields": fields})
+
+
+def read_journal():
+    """
+    Return the journal's edit records in order, or None if the journal
+    is missing or belongs to an older snapshot.
+    A torn last line (crash in the middle of a write) is skipped.
+    """
+    if not JOURNAL_FILE.exists():
+        return None
+
+    records = []
+
+    with JOURNAL_FILE.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+
+            if record.get("op") == "snapshot":
+                if record.get("stamp") != _snapshot_stamp():
+                    return None
+                continue
+
+            records.append(record)
+
+    return records
+
+
+def _reset():
+    """Replace the journal with an empty one stamped with the current snapshot."""
+    close()
+
+    temp_file = JOURNAL_FILE.with_name(JOURNAL_FILE.name + ".tmp")
+    with temp_file.open("w", encoding="utf-8") as f:
+        f.write(_header())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, JOURNAL_FILE)
+
+
+def replay(players, records):
+    """Apply journal records to a list of player dicts (in place)."""
+    for r in records:
+        op = r.get("op")
+
+        if op == "add":
+            players.append(r["player"])
+        elif op == "remove":
+            players.pop(r["number"] - 1)
+        elif op == "move":
+            players.insert(r["to"] - 1, players.pop(r["from"] - 1))
+        elif op == "edit":
+            players[r["number"] - 1].update(r["fields"])
+
+    return players
+
+
+def pending_records():
+    """
+    Journal records to replay on top of the current snapshot ([] if none).
+    A missing or stale journal is replaced by a new, empty one.
+    """
+    global _pending
+
+    records = read_journal()
+    if records is None:
+        # Missing or stale journal: start a new one for this snapshot
+        _reset()
+        records = []
+
+    _pending = len(records)
+    return records
+
+
+def apply(lineup, records):
+    """Apply journal records to a Lineup (or MappedLineup) in place."""
+    for r in records:
+        op = r.get("op")
+
+        if op == "add":
+            lineup.add_player(Player.from_dict(r["player"]))
+        elif op == "remove":
+            lineup.remove_player(r["number"])
+        elif op == "move":
+            lineup.move_player(r["from"], r["to"])
+        elif op == "edit":
+            lineup.edit_player(r["number"], **r["fields"])
+
+    return lineup
+
+
+@perf.timed(rows=len)
+def load_lineup():
+    """
+    Load the CSV snapshot and replay the journal on top of it.
+    Returns player dicts (same structure as db.load_lineup()); with an
+    empty journal this is just the db.iter_lineup() stream.
+    """
+    records = pending_records()
+
+    if not records:
+        return db.iter_lineup()
+    return replay(db.load_lineup(), records)
+
+
+def needs_compaction():
+    """True once COMPACT_EVERY records are waiting in the journal."""
+    return _pending >= COMPACT_EVERY
+
+
+@perf.timed(rows=int)
+def compact(lineup):
+    """
+    Write a fresh snapshot, then swap in a new journal stamped with it.
+    lineup is either player dicts (db.save_lineup, atomic rename) or a
+    lineup that saves itself (db_mapped.MappedLineup.save()).
+    A lineup whose dirty flag is False, with no journal records
+    waiting, already matches players.csv and is not rewritten.
+    Returns the number of players written (or in the lineup).
+    """
+    global _pending
+
+    if not _pending and not getattr(lineup, "dirty", True):
+        return len(lineup)
+
+    close()
+    save = getattr(lineup, "save", None)
+    count = save() if save is not None else db.save_lineup(lineup)
+    _reset()
+
+    mark_clean = getattr(lineup, "mark_clean", None)
+    if mark_clean is not None:
+        mark_clean()
+
+    _pending = 0
+    return count
@@ -0,0 +1,562 @@
+# db_mapped.py
+# ---------------------------------------------------------
+# MappedLineup: a Lineup that reads players.csv on demand.
+# - players.csv is memory-mapped; nothing is parsed up front
+# - a line-offset index (start/end byte of every player row) is
+#   kept next to it in players.csv.idx, stamped with the CSV's
+#   size + mtime; it is rebuilt once if missing or stale
+# - len(), get_player(n) and iteration only touch the pages of
+#   the rows they need
+# - edits go into an overlay (changed players, added players and,
+#   after a move/remove, the new row order); save() writes the
+#   overlay plus the unchanged rows (clean NEW-format rows copied as
+#   raw bytes, anything else rewritten in the NEW format) to a new
+#   players.csv + index, then maps the new file; lines that are not
+#   player rows are kept as they are
+# - a row is a player exactly when db.parse_fields() accepts what
+#   csv.reader makes of it (same rule as db.load_lineup())
+#
+# Same interface as objects.Lineup for the console app
+# (len/iter/get/add/edit/remove/move/to_dicts), without the
+# find()/find_by_name()/players_at() indexes.
+# ---------------------------------------------------------
+
+import csv
+import io
+import mmap
+import os
+import re
+import struct
+from array import array
+from collections import deque
+from itertools import accumulate, compress, count, repeat
+from operator import add, lt
+from pathlib import Path
+
+import db
+import perf
+from objects import Player
+
+# Index file: header, then count int64 row starts, then count int64 row ends
+# (native byte order: it is a machine-local cache of the CSV)
+INDEX_MAGIC = b"BBLX"
+INDEX_VERSION = 2     # 2: rows decided by db.parse_fields() (1 used a regex)
+INDEX_HEADER = struct.Struct("=4sHHQqQ")  # magic, version, flags, csv size, csv mtime_ns, count
+
+# Index flag: the CSV was written by save(), so every row in it is
+# already a clean NEW-format row and there are no other lines
+FLAG_SAVED = 1
+
+# The index is built INDEX_CHUNK bytes (whole lines) at a time
+INDEX_CHUNK = 1 << 22
+
+_LEADING_ZERO = re.compile(r",0[0-9]")
+
+# save() checks unchanged rows SAVE_CHUNK rows at a time
+SAVE_CHUNK = 1 << 16
+
+
+def index_file(path):
+    """Sidecar index path for a CSV file (players.csv -> players.csv.idx)."""
+    return path.with_name(path.name + ".idx")
+
+
+def _clean_lines(lines):
+    """
+    True if every line is a plain NEW-format row: exactly 4 commas, no
+    quotes, integer at_bats/hits (checked a whole column at a time).
+    """
+    if set(map(bytes.count, lines, repeat(b","))) != {4}:
+        return False
+
+    fields = b",".join(lines).split(b",")
+    try:
+        deque(map(int, fields[3::5]), maxlen=0)
+        deque(map(int, fields[4::5]), maxlen=0)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_player(fields):
+    """True if db.parse_fields() accepts this csv row."""
+    return db.parse_fields(fields) is not None
+
+
+def _index_records(data, pos, starts, ends):
+    """
+    Slow path of build_index, from `pos` to the end of data: csv.reader
+    splits the records (a quoted field may span lines) and each record
+    that is a player row is indexed from its first line to its last.
+    """
+    line_starts = array("q")
+    line_ends = array("q")
+    size = len(data)
+
+    def lines():
+        start = pos
+        while start < size:
+            end = data.find(b"\n", start)
+            end = size if end < 0 else end
+            line_starts.append(start)
+            line_ends.append(end)
+            yield data[start:end + 1].decode("utf-8")
+            start = end + 1
+
+    reader = csv.reader(lines())
+    first = 0
+    while True:
+        try:
+            fields = next(reader)
+        except StopIteration:
+            return
+        except csv.Error:
+            # e.g. a lone "\r" inside a line: not a row
+            first = reader.line_num
+            continue
+
+        last = reader.line_num
+        if _is_player(fields):
+            starts.append(line_starts[first])
+            ends.append(line_ends[last - 1])
+        first = last
+
+
+@perf.timed(rows=lambda index: len(index[0]))
+def build_index(data):
+    """
+    Scan CSV bytes once -> (starts, ends) arrays, one entry per player row.
+    Works INDEX_CHUNK bytes (whole lines) at a time:
+    - chunks with one record per line (no quotes, no lone "\r") are
+      split into lines; if they are all plain rows (the usual case)
+      every line is indexed with no Python loop per row, otherwise
+      csv.reader + db.parse_fields() decide line by line
+    - from the first chunk with quotes, the rest of the file goes
+      through csv.reader record by record (_index_records)
+    """
+    starts = array("q")
+    ends = array("q")
+    size = len(data)
+    pos = 0
+
+    while pos < size:
+        stop = data.find(b"\n", min(pos + INDEX_CHUNK, size - 1))
+        stop = size if stop < 0 else stop + 1
+        chunk = data[pos:stop]
+
+        if b'"' in chunk or chunk.count(b"\r") != chunk.count(b"\r\n"):
+            _index_records(data, pos, starts, ends)
+            break
+
+        lines = chunk.split(b"\n")
+        if not lines[-1]:
+            lines.pop()
+
+        lengths = list(map(len, lines))
+        line_starts = list(accumulate(map((1).__add__, lengths), initial=pos))
+        line_ends = map(add, line_starts, lengths)
+
+        if _clean_lines(lines):
+            starts.extend(line_starts[:len(lines)])
+            ends.extend(line_ends)
+        else:
+            text = chunk.decode("utf-8").split("\n")[:len(lines)]
+            valid = list(map(_is_player, csv.reader(text)))
+            starts.extend(compress(line_starts, valid))
+            ends.extend(compress(line_ends, valid))
+
+        pos = stop
+
+    return starts, ends
+
+
+def _saved_as_is(text):
+    """
+    True if every line of text is exactly what db.write_rows() would
+    write for it: 5 unquoted fields, names/position already stripped,
+    at_bats/hits canonical integers (checked a whole column at a time).
+    save() copies such rows as raw bytes; other rows are rewritten.
+    """
+    if '"' in text or "\r" in text:
+        return False
+
+    lines = text.split("\n")
+    if set(map(str.count, lines, repeat(","))) != {4}:
+        return False
+
+    fields = text.replace("\n", ",").split(",")
+    for column in (fields[0::5], fields[1::5], fields[2::5]):
+        if list(map(str.strip, column)) != column:
+            return False
+    for column in (fields[3::5], fields[4::5]):
+        # ASCII digits only, no leading zeros (str(int(field)) == field)
+        joined = "," + ",".join(column)
+        if (not joined.isascii() or not all(map(str.isdigit, column))
+                or _LEADING_ZERO.search(joined)):
+            return False
+    return True
+
+
+def _other_lines(data, starts, ends):
+    """
+    Lines of data that are not player rows (blank lines left out):
+    {row: bytes found just before that row (row == len(starts): after
+    the last row)}. save() writes them back so nothing is lost.
+    """
+    if sum(ends) - sum(starts) + len(starts) >= len(data):
+        # Rows plus one "\n" each cover the whole file: nothing else in it
+        return {}
+
+    begins = array("q", [0])
+    begins.extend(map((1).__add__, ends))
+    stops = array("q", starts)
+    stops.append(len(data))
+
+    other = {}
+    for row in compress(count(), map(lt, begins, stops)):
+        lines = [line for line in data[begins[row]:stops[row]].split(b"\n")
+                 if line.strip()]
+        if lines:
+            other[row] = b"\n".join(lines) + b"\n"
+    return other
+
+
+def write_index(path, stamp, starts, ends, flags=0):
+    """Write an index file (temp file + rename)."""
+    temp_file = path.with_name(path.name + ".tmp")
+    with temp_file.open("wb") as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, flags, *stamp, len(starts)))
+        f.write(starts.tobytes())
+        f.write(ends.tobytes())
+    os.replace(temp_file, path)
+
+
+def _csv_line(player):
+    """One Player -> CSV row bytes (NEW format, quoted if needed)."""
+    text = io.StringIO()
+    db.write_rows(text, [(player.first_name, player.last_name, player.position,
+                          player.at_bats, player.hits)])
+    return text.getvalue().encode("utf-8")
+
+
+class MappedLineup:
+    """
+    Lineup backed by a memory-mapped CSV file (see the module notes).
+    Rows are parsed only when they are read; changes stay in memory
+    until save(). Row "entries": a base row number (>= 0) in the
+    mapped file, or ~k for the k-th player added since the last save.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else db.DATA_FILE
+        self._open()
+
+    def _open(self):
+        """Map the CSV and its index; start with an empty overlay."""
+        self._file = self._map = None
+        self._index = self._index_map = None
+        self._views = []
+        self._starts = self._ends = ()
+        self._saved = False     # FLAG_SAVED: rows can be copied unchecked
+
+        if self.path.exists() and self.path.stat().st_size:
+            self._file = self.path.open("rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._load_index()
+
+        self._base = len(self._starts)
+
+        # Overlay (everything changed since the last save)
+        self._players = {}      # base row -> Player handed out by get_player()
+        self._edited = set()    # base rows changed with edit_player()
+        self._added = []        # Players added with add_player()
+        self._order = None      # array of entries, once rows are moved/removed
+
+    def _load_index(self):
+        """Map a fresh sidecar index, building (and saving) it if needed."""
+        st = os.fstat(self._file.fileno())
+        stamp = (st.st_size, st.st_mtime_ns)
+        path = index_file(self.path)
+
+        if self._map_index(path, stamp):
+            return
+
+        starts, ends = build_index(self._map)
+        write_index(path, stamp, starts, ends)
+
+        if not self._map_index(path, stamp):
+            self._starts, self._ends = starts, ends
+
+    def _map_index(self, path, stamp):
+        """Map the index file if it belongs to this CSV; returns True on success."""
+        try:
+            index = path.open("rb")
+        except FileNotFoundError:
+            return False
+
+        size = os.fstat(index.fileno()).st_size
+        header = index.read(INDEX_HEADER.size)
+        if len(header) < INDEX_HEADER.size:
+            index.close()
+            return False
+
+        magic, version, flags, csv_size, csv_mtime, count = INDEX_HEADER.unpack(header)
+        if (magic != INDEX_MAGIC or version != INDEX_VERSION
+                or (csv_size, csv_mtime) != stamp
+                or size != INDEX_HEADER.size + 16 * count):
+            index.close()
+            return False
+
+        self._index = index
+        self._saved = bool(flags & FLAG_SAVED)
+        if count == 0:
+            return True
+
+        self._index_map = mmap.mmap(index.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._index_map)
+        middle = INDEX_HEADER.size + 8 * count
+        self._starts = view[INDEX_HEADER.size:middle].cast("q")
+        self._ends = view[middle:].cast("q")
+        self._views = [self._starts, self._ends, view]
+        return True
+
+    def close(self):
+        """Unmap the files (the overlay is dropped: save() first)."""
+        for view in self._views:
+            view.release()
+        for handle in (self._index_map, self._index, self._map, self._file):
+            if handle is not None:
+                handle.close()
+        self._views = []
+        self._starts = self._ends = ()
+        self._file = self._map = self._index = self._index_map = None
+
+    @property
+    def dirty(self):
+        """True if there are changes that save() has not written yet."""
+        return bool(self._edited or self._added or self._order is not None)
+
+    def __len__(self):
+        """Allow: len(lineup)"""
+        if self._order is not None:
+            return len(self._order)
+        return self._base + len(self._added)
+
+    def __iter__(self):
+        """Allow: for player in lineup:"""
+        for piece in self._pieces():
+            if isinstance(piece, tuple):
+                for row in range(*piece):
+                    yield Player.from_dict(self._read(row))
+            else:
+                yield piece
+
+    def _entry(self, number):
+        """Lineup number (1-based) -> row entry."""
+        index = number - 1
+        if not 0 <= index < len(self):
+            raise IndexError("lineup index out of range")
+
+        if self._order is not None:
+            return self._order[index]
+        if index < self._base:
+            return index
+        return ~(index - self._base)
+
+    def _read(self, row):
+        """Parse one base row of the mapped file -> player dict."""
+        line = self._map[self._starts[row]:self._ends[row]].decode("utf-8")
+        return db.parse_line(line)
+
+    def _player(self, entry, keep=False):
+        """Row entry -> Player (keep=True: remember it, so edits stick)."""
+        if entry < 0:
+            return self._added[~entry]
+
+        player = self._players.get(entry)
+        if player is None:
+            player = Player.from_dict(self._read(entry))
+            if keep:
+                self._players[entry] = player
+        return player
+
+    def _pieces(self):
+        """
+        The lineup in order, as (start, stop) runs of unchanged base rows
+        and single Player objects (edited or added players).
+        """
+        if self._order is None:
+            start = 0
+            for row in sorted(self._edited):
+                if start < row:
+                    yield (start, row)
+                yield self._players[row]
+                start = row + 1
+            if start < self._base:
+                yield (start, self._base)
+            yield from self._added
+            return
+
+        start = stop = None
+        for entry in self._order:
+            if entry >= 0 and entry not in self._edited:
+                if entry == stop:
+                    stop += 1
+                    continue
+                if start is not None:
+                    yield (start, stop)
+                start, stop = entry, entry + 1
+                continue
+
+            if start is not None:
+                yield (start, stop)
+                start = stop = None
+            yield self._player(entry)
+
+        if start is not None:
+            yield (start, stop)
+
+    def _materialize(self):
+        """Switch to an explicit row order (needed for moves/removes)."""
+        if self._order is None:
+            self._order = array("q", range(self._base))
+            self._order.extend(~k for k in range(len(self._added)))
+
+    def to_dicts(self):
+        """Yield player dicts in lineup order (a generator, not a list)."""
+        for piece in self._pieces():
+            if isinstance(piece, tuple):
+                for row in range(*piece):
+                    yield self._read(row)
+            else:
+                yield piece.to_dict()
+
+    def add_player(self, player):
+        """Add Player to end."""
+        self._added.append(player)
+        if self._order is not None:
+            self._order.append(~(len(self._added) - 1))
+
+    def get_player(self, number):
+        """Retrieve Player by lineup number (1-based)."""
+        return self._player(self._entry(number), keep=True)
+
+    def edit_player(self, number, **fields):
+        """Change fields of the Player at lineup number (1-based)."""
+        entry = self._entry(number)
+        player = self._player(entry, keep=True)
+
+        for name, value in fields.items():
+            setattr(player, name, value)
+        if entry >= 0:
+            self._edited.add(entry)
+
+        return player
+
+    def remove_player(self, number):
+        """Remove Player by lineup number (1-based)."""
+        name = self._player(self._entry(number)).full_name
+        self._materialize()
+        self._order.pop(number - 1)
+        return name
+
+    def move_player(self, current_number, new_number):
+        """Move Player from one position to another (1-based)."""
+        name = self._player(self._entry(current_number)).full_name
+        self._materialize()
+        entry = self._order.pop(current_number - 1)
+        self._order.insert(new_number - 1, entry)
+        return name
+
+    @perf.timed("db_mapped.save", rows=int)
+    def save(self):
+        """
+        Flush the overlay: write a new CSV, always in the NEW format
+        (runs of unchanged rows that already are clean NEW-format rows
+        are copied as raw bytes; other rows are rewritten, blank lines
+        dropped) and its index, both via temp files + rename
+        (db.replace_snapshot keeps a .bak), then map the new file.
+        Non-empty lines that are not player rows are kept as they are:
+        just before the row that followed them, or at the end if that
+        row was removed (or there was none).
+        Returns the number of players written.
+        """
+        temp_file = self.path.with_name(self.path.name + ".tmp")
+        index_path = index_file(self.path)
+        index_temp = index_path.with_name(index_path.name + ".new")
+
+        starts = array("q")
+        ends = array("q")
+        pos = 0
+
+        other = {}
+        if self._map is not None and not self._saved:
+            other = _other_lines(self._map, self._starts, self._ends)
+        flags = 0 if other else FLAG_SAVED
+        edited_rows = {id(self._players[row]): row for row in self._edited}
+
+        def write_other(row):
+            nonlocal pos
+            lines = other.pop(row, None)
+            if lines is not None:
+                f.write(lines)
+                pos += len(lines)
+
+        def write_line(line):
+            nonlocal pos
+            f.write(line)
+            starts.append(pos)
+            ends.append(pos + len(line) - 1)
+            pos += len(line)
+
+        with temp_file.open("wb", buffering=db.WRITE_BUFFER) as f:
+            for piece in self._pieces():
+                if not isinstance(piece, tuple):
+                    if id(piece) in edited_rows:
+                        write_other(edited_rows[id(piece)])
+                    write_line(_csv_line(piece))
+                    continue
+
+                for first in range(piece[0], piece[1], SAVE_CHUNK):
+                    stop = min(first + SAVE_CHUNK, piece[1])
+                    begin = self._starts[first]
+                    end = self._ends[stop - 1]
+                    block = self._map[begin:end]
+
+                    if self._saved or (block.count(b"\n") == stop - first - 1
+                                       and _saved_as_is(block.decode("utf-8"))):
+                        # Already NEW-format rows with nothing in between
+                        write_other(first)
+                        f.write(block)
+                        f.write(b"\n")
+
+                        shift = pos - begin
+                        starts.extend(map(shift.__add__, self._starts[first:stop]))
+                        ends.extend(map(shift.__add__, self._ends[first:stop]))
+                        pos += end - begin + 1
+                        continue
+
+                    # Old-format/quoted/untidy rows are rewritten
+                    for row in range(first, stop):
+                        write_other(row)
+                        line = self._map[self._starts[row]:self._ends[row]]
+                        if _saved_as_is(line.decode("utf-8")):
+                            write_line(line + b"\n")
+                        else:
+                            write_line(_csv_line(Player.from_dict(self._read(row))))
+
+            for row in sorted(other):
+                write_other(row)
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        st = temp_file.stat()
+        write_index(index_temp, (st.st_size, st.st_mtime_ns), starts, ends, flags)
+
+        self.close()
+        db.replace_snapshot(temp_file, self.path)
+        os.replace(index_temp, index_path)
+        self._open()
+
+        return len(starts)
@@ -1,125 +1,1242 @@
 # db_sqlite.py
 # -----------------------------------------
 # SQLite database access for my Baseball Team Manager
+# - Each thread keeps ONE long-lived connection (opened on first use)
+# - Connections run in WAL mode with tunable PRAGMAs
+# - close_connections() shuts them all down (also runs at exit)
+# - batOrder is UNIQUE; reorders run as one transaction
+# - import_csv() / export_csv() stream players.csv <-> Player
+# - Leaderboard / position summary / paging run inside SQLite,
+#   backed by indexes (see create_indexes)
+# - get_player()/get_positions() go through an LRU read-through
+#   cache (bounded size + TTL); writes and PRAGMA data_version
+#   changes invalidate it
+# - Players belong to a team + season. Player functions take
+#   team=/season= (default: DEFAULT_TEAM/DEFAULT_SEASON, where all
+#   older rows live); batOrder is unique per (team, season) and the
+#   indexes lead with (team, season)
+# - add_shard() keeps a team in its own database file, ATTACHed to
+#   each connection on first use (least recently used shards are
+#   detached beyond MAX_ATTACHED); the team -> file routing is stored
+#   in the main database (Shard table) and loaded on connect
+# - ingest_events() stores plate-appearance events (AtBatEvent) and
+#   adds them to Player.atBats/hits in the same transaction; events
+#   with an eventKey are stored once (re-imports add nothing)
 # -----------------------------------------
 
+import atexit
+import csv
+import json
+import logging
 import sqlite3
+from pathlib import Path
+import threading
+import time
+from collections import Counter, OrderedDict
+from itertools import islice
+from operator import itemgetter
+
+import db
+import perf
 
 DB_FILE = "baseball.sqlite"
 
+log = logging.getLogger(__name__)
+
+# Rows per executemany()/fetchmany() batch for CSV import/export
+CHUNK_SIZE = 10_000
+
+# Rows per roster page (get_players_page)
+PAGE_SIZE = 50
+
+# Batting average in SQL, same rules as Player.batting_average().
+# The Player_avg index is built on this EXACT expression, so queries
+# must use AVG_SQL as-is for SQLite to pick the index.
+AVG_SQL = "(CASE WHEN atBats > 0 THEN ROUND(CAST(hits AS REAL) / atBats, 3) ELSE 0.0 END)"
+
+# PRAGMAs applied to every new connection.
+# Change them with configure() so open connections pick them up.
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -8000,        # negative = KiB, so about 8 MB
+    "temp_store": "MEMORY",
+}
+
+# Scope of rows created before teams/seasons existed (and the default)
+DEFAULT_TEAM = ""
+DEFAULT_SEASON = 0
+
+# Sharded teams: team -> database file (see add_shard()).
+# Loaded from the Shard table whenever a connection is opened.
+SHARDS = {}
+
+# Most shard files ATTACHed to one connection at a time
+# (SQLite allows 10 by default)
+MAX_ATTACHED = 8
+
+# Plate-appearance outcome -> (at bats, hits) it adds to the player.
+# Walks, hit-by-pitch, sacrifices and interference are not at bats.
+OUTCOMES = {
+    "1B": (1, 1), "2B": (1, 1), "3B": (1, 1), "HR": (1, 1),
+    "K": (1, 0), "OUT": (1, 0), "GO": (1, 0), "FO": (1, 0),
+    "FC": (1, 0), "E": (1, 0), "DP": (1, 0),
+    "BB": (0, 0), "IBB": (0, 0), "HBP": (0, 0),
+    "SF": (0, 0), "SH": (0, 0), "CI": (0, 0),
+}
+
+# (gameID, playerID, outcome[, eventKey]) event -> (playerID, outcome)
+_EVENT_KEY = itemgetter(1, 2)
+
+# PRAGMAs that are per database file (re-applied to each attached shard)
+SCHEMA_PRAGMAS = ("journal_mode", "synchronous", "cache_size")
+
+# Read-through cache limits (change with configure_cache())
+CACHE_SIZE = 1024           # max cached entries
+CACHE_TTL = 30.0            # seconds an entry stays valid
+
+# Pool state
+_local = threading.local()
+_lock = threading.Lock()
+_connections = []
+_generation = 0
+_indexed_files = set()
+
 
 def connect():
-    """Create and return a database connection."""
-    return sqlite3.connect(DB_FILE)
+    """Create and return a NEW database connection with PRAGMAs applied."""
+    conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
 
 
-def get_all_players():
-    """Return all players ordered by batOrder."""
+def get_connection():
+    """
+    Return this thread's pooled connection, opening it on first use.
+    A fresh connection is opened if DB_FILE changed or the pool was closed.
+    """
+    conn = getattr(_local, "conn", None)
+    if (conn is not None
+            and _local.db_file == DB_FILE
+            and _local.generation == _generation):
+        return conn
+
     conn = connect()
-    cursor = conn.cursor()
 
-    cursor.execute("""
+    with _lock:
+        _connections.append(conn)
+        _local.generation = _generation
+
+    _local.conn = conn
+    _local.db_file = DB_FILE
+    _local.attached = OrderedDict()     # shard file -> schema name
+    _local.data_versions = {}           # shard file (None = main) -> (conn, version)
+
+    if DB_FILE not in _indexed_files:
+        create_indexes(conn)
+
+    _load_shards(conn)
+    return conn
+
+
+def _load_shards(conn):
+    """Replace SHARDS with the team -> file routing stored in DB_FILE."""
+    shards = {}
+    if _has_table(conn, "Shard"):
+        shards = dict(conn.execute("SELECT team, path FROM main.Shard"))
+
+    with _lock:
+        for team in SHARDS.keys() - shards.keys():
+            del SHARDS[team]
+        SHARDS.update(shards)
+
+
+def close_connections():
+    """Close every pooled connection (threads reconnect on next use)."""
+    global _generation
+
+    with _lock:
+        conns = list(_connections)
+        _connections.clear()
+        _generation += 1
+
+    for conn in conns:
+        conn.close()
+
+
+def configure(**pragmas):
+    """
+    Update PRAGMAs (example: configure(synchronous="FULL", cache_size=-64000)).
+    Open connections are closed so the new settings apply everywhere.
+    """
+    PRAGMAS.update(pragmas)
+    close_connections()
+
+
+atexit.register(close_connections)
+
+
+def add_shard(team, path):
+    """
+    Keep `team` in its own database file (created if needed); the team's
+    rows (and their AtBatEvent rows) are moved there out of the main
+    database. The shard gives the moved players NEW playerIDs, so rows
+    already in the file are never overwritten. The routing is saved in
+    the main database's Shard table. Raises ValueError if the team
+    already has a shard.
+    """
+    conn = get_connection()
+    if team in SHARDS:
+        raise ValueError(f"Team {team!r} already has a shard: {SHARDS[team]}")
+
+    _create_shard_table(conn)
+    SHARDS[team] = str(path)
+    try:
+        shard = _schema(conn, team)
+        players = []
+        if _has_table(conn, "Player"):
+            players = conn.execute("""
+                SELECT playerID, batOrder, firstName, lastName, position,
+                       atBats, hits, season
+                FROM main.Player
+                WHERE team = ?
+                ORDER BY playerID
+            """, (team,)).fetchall()
+
+        with conn:
+            conn.execute("INSERT INTO main.Shard (team, path) VALUES (?, ?)",
+                         (team, str(path)))
+
+            # old playerID -> playerID in the shard
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS ShardMove("
+                         "oldID INTEGER PRIMARY KEY, newID INTEGER NOT NULL)")
+            conn.execute("DELETE FROM temp.ShardMove")
+            for player_id, *row in players:
+                new_id = conn.execute(f"""
+                    INSERT INTO {shard}.Player (batOrder, firstName, lastName, position,
+                                                atBats, hits, season, team)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (*row, team)).lastrowid
+                conn.execute("INSERT INTO temp.ShardMove VALUES (?, ?)",
+                             (player_id, new_id))
+
+            if players and _has_table(conn, "AtBatEvent"):
+                conn.execute(f"""
+                    INSERT INTO {shard}.AtBatEvent (gameID, playerID, outcome, eventKey)
+                    SELECT e.gameID, m.newID, e.outcome, e.eventKey
+                    FROM main.AtBatEvent e
+                    JOIN temp.ShardMove m ON m.oldID = e.playerID
+                    ORDER BY e.eventID
+                """)
+                conn.execute("""
+                    DELETE FROM main.AtBatEvent
+                    WHERE playerID IN (SELECT oldID FROM temp.ShardMove)
+                """)
+            if players:
+                conn.execute("DELETE FROM main.Player WHERE team = ?", (team,))
+            conn.execute("DELETE FROM temp.ShardMove")
+    except BaseException:
+        SHARDS.pop(team, None)
+        raise
+    finally:
+        _cache.clear()
+
+
+def _has_table(conn, name, schema="main"):
+    """True if `schema` has a table called `name`."""
+    return conn.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = ?",
+        (name,)
+    ).fetchone() is not None
+
+
+def _create_shard_table(conn):
+    """team -> shard file routing (see add_shard / _load_shards)."""
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS main.Shard(
+                team TEXT PRIMARY KEY NOT NULL,
+                path TEXT NOT NULL
+            )
+        """)
+
+
+def _schema(conn, team):
+    """
+    Schema holding `team`'s Player table: "main", or the team's shard,
+    ATTACHed to this connection now if needed (LRU-detaching the oldest
+    shard when MAX_ATTACHED are open).
+    """
+    path = SHARDS.get(team)
+    if path is None:
+        return "main"
+
+    attached = _local.attached
+    schema = attached.get(path)
+    if schema is not None:
+        attached.move_to_end(path)
+        return schema
+
+    if len(attached) >= MAX_ATTACHED:
+        old_path, old_schema = attached.popitem(last=False)
+        conn.execute(f"DETACH DATABASE {old_schema}")
+        _local.data_versions.pop(old_path, None)
+
+    used = set(attached.values())
+    schema = next(f"shard{n}" for n in range(1, MAX_ATTACHED + 2)
+                  if f"shard{n}" not in used)
+    conn.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+    attached[path] = schema
+
+    for name in SCHEMA_PRAGMAS:
+        conn.execute(f"PRAGMA {schema}.{name} = {PRAGMAS[name]}")
+
+    _create_player_table(conn, schema)
+    _create_event_table(conn, schema)
+    create_indexes(conn, schema)
+    return schema
+
+
+def _table(conn, team):
+    """Qualified Player table name for team (e.g. "main.Player")."""
+    return f"{_schema(conn, team)}.Player"
+
+
+class _LRUCache:
+    """Thread-safe LRU cache with a size bound, TTL and hit/miss counters."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()    # key -> (expires, value)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Return (True, value) on a hit, (False, None) on a miss."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self, kind=None):
+        """Drop every entry (or only entries of one kind, e.g. "player")."""
+        with self.lock:
+            if kind is None:
+                self.entries.clear()
+            else:
+                for key in [k for k in self.entries if k[1] == kind]:
+                    del self.entries[key]
+
+
+_cache = _LRUCache(CACHE_SIZE, CACHE_TTL)
+
+
+def configure_cache(size=None, ttl=None):
+    """Change the cache size/TTL (the cache is emptied)."""
+    global CACHE_SIZE, CACHE_TTL
+
+    if size is not None:
+        CACHE_SIZE = _cache.maxsize = size
+    if ttl is not None:
+        CACHE_TTL = _cache.ttl = ttl
+    _cache.clear()
+
+
+def cache_info():
+    """Return cache counters: hits, misses, size, maxsize, ttl."""
+    with _cache.lock:
+        return {
+            "hits": _cache.hits,
+            "misses": _cache.misses,
+            "size": len(_cache.entries),
+            "maxsize": _cache.maxsize,
+            "ttl": _cache.ttl,
+        }
+
+
+def clear_cache():
+    """Empty the cache and reset its counters."""
+    _cache.clear()
+    with _cache.lock:
+        _cache.hits = _cache.misses = 0
+
+
+def _cached_connection(team=DEFAULT_TEAM):
+    """
+    Return (connection, schema) for team after checking that schema's
+    PRAGMA data_version. data_version changes when ANOTHER connection
+    (thread or process) commits, so a change means cached rows may be stale.
+    """
+    conn = get_connection()
+    schema = _schema(conn, team)
+    version = conn.execute(f"PRAGMA {schema}.data_version").fetchone()[0]
+
+    key = SHARDS.get(team)
+    if _local.data_versions.get(key) != (conn, version):
+        _cache.clear()
+        _local.data_versions[key] = (conn, version)
+
+    return conn, schema
+
+
+def _player_key(team, player_id):
+    """Cache key for one player of a team (playerIDs are unique per database file)."""
+    return (DB_FILE, "player", SHARDS.get(team), team, player_id)
+
+
+def _create_player_table(conn, schema="main"):
+    with conn:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {schema}.Player(
+                playerID INTEGER PRIMARY KEY NOT NULL,
+                batOrder INTEGER NOT NULL,
+                firstName TEXT NOT NULL,
+                lastName TEXT NOT NULL,
+                position TEXT NOT NULL,
+                atBats INTEGER NULL,
+                hits INTEGER NULL,
+                team TEXT NOT NULL DEFAULT '',
+                season INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+
+def create_tables():
+    """Create the Player, Position and AtBatEvent tables if they do not exist yet."""
+    conn = get_connection()
+
+    _create_player_table(conn)
+    _create_event_table(conn)
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS Position(
+                positionID INTEGER PRIMARY KEY NOT NULL,
+                positionValue TEXT NOT NULL UNIQUE
+            )
+        """)
+
+    create_indexes(conn)
+
+
+def _create_event_table(conn, schema="main"):
+    """
+    One row per plate appearance (see ingest_events), adding the
+    eventKey column to a table from before it existed.
+    """
+    with conn:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {schema}.AtBatEvent(
+                eventID INTEGER PRIMARY KEY NOT NULL,
+                gameID TEXT NOT NULL,
+                playerID INTEGER NOT NULL,
+                outcome TEXT NOT NULL,
+                eventKey TEXT NULL
+            )
+        """)
+        columns = {row[1] for row in
+                   conn.execute(f"PRAGMA {schema}.table_info(AtBatEvent)")}
+        if "eventKey" not in columns:
+            conn.execute(f"ALTER TABLE {schema}.AtBatEvent ADD COLUMN eventKey TEXT NULL")
+
+        # An event with a key is stored once (NULL keys are never equal)
+        conn.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {schema}.AtBatEvent_key "
+            "ON AtBatEvent(eventKey)"
+        )
+        # Per-player totals (rebuild_rollups) read only this index
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {schema}.AtBatEvent_player "
+            "ON AtBatEvent(playerID, outcome)"
+        )
+
+
+def _migrate(conn, schema="main"):
+    """Add the team/season columns to a Player table from before they existed."""
+    columns = {row[1] for row in conn.execute(f"PRAGMA {schema}.table_info(Player)")}
+
+    with conn:
+        if "team" not in columns:
+            conn.execute(
+                f"ALTER TABLE {schema}.Player ADD COLUMN team TEXT NOT NULL DEFAULT ''"
+            )
+        if "season" not in columns:
+            conn.execute(
+                f"ALTER TABLE {schema}.Player ADD COLUMN season INTEGER NOT NULL DEFAULT 0"
+            )
+
+
+def _migrate_bat_order(conn, schema="main"):
+    """
+    Before the UNIQUE (team, season, batOrder) index can be created:
+    renumber 1..N (in batting order, ties by playerID) every team/season
+    of old data that has duplicate batOrder values, logging a warning
+    for each. Returns the number of team/seasons renumbered.
+    """
+    table = f"{schema}.Player"
+    duplicated = conn.execute(f"""
+        SELECT DISTINCT team, season
+        FROM {table}
+        GROUP BY team, season, batOrder
+        HAVING COUNT(*) > 1
+    """).fetchall()
+
+    for team, season in duplicated:
+        log.warning("%s: renumbering batOrder of team %r, season %s "
+                    "(duplicate values)", table, team, season)
+        _write_bat_order(conn, _bat_order_ids(conn, table, team, season),
+                         table, team, season)
+    return len(duplicated)
+
+
+def create_indexes(conn, schema="main"):
+    """
+    Create the Player indexes (skipped until the Player table exists),
+    running the migrations first: team/season columns for older tables
+    (_migrate) and duplicate batOrder values (_migrate_bat_order).
+    """
+    table = conn.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = 'Player'"
+    ).fetchone()
+    if table is None:
+        return
+
+    _migrate(conn, schema)
+
+    unique_sql = (
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {schema}.Player_batOrder "
+        "ON Player(team, season, batOrder)"
+    )
+
+    with conn:
+        # Indexes from before teams/seasons (batOrder was unique overall)
+        for name in ("Player_batOrder", "Player_position", "Player_avg"):
+            sql = conn.execute(
+                f"SELECT sql FROM {schema}.sqlite_master WHERE type = 'index' AND name = ?",
+                (name,)
+            ).fetchone()
+            if sql is not None and "team" not in sql[0]:
+                conn.execute(f"DROP INDEX {schema}.{name}")
+
+    has_unique = conn.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'index' AND name = 'Player_batOrder'"
+    ).fetchone()
+    if has_unique is None:
+        _migrate_bat_order(conn, schema)
+        with conn:
+            conn.execute(unique_sql)
+
+    with conn:
+        # Covering index for per-position totals
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {schema}.Player_position "
+            "ON Player(team, season, position, atBats, hits)"
+        )
+        # Expression index for AVG leaderboards
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {schema}.Player_avg "
+            f"ON Player(team, season, {AVG_SQL}, atBats)"
+        )
+
+    if schema == "main":
+        _indexed_files.add(DB_FILE)
+
+
+@perf.timed(rows=len)
+def get_all_players(team=DEFAULT_TEAM, season=DEFAULT_SEASON):
+    """Return all players of a team/season ordered by batOrder."""
+    conn = get_connection()
+    table = _table(conn, team)
+
+    return conn.execute(f"""
         SELECT playerID, batOrder, firstName, lastName, position, atBats, hits
-        FROM Player
+        FROM {table}
+        WHERE team = ? AND season = ?
         ORDER BY batOrder
-    """)
+    """, (team, season)).fetchall()
 
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
 
+@perf.timed(rows=len)
+def get_teams():
+    """
+    Return every (team, season, players) stored in the main database
+    or a shard, ordered by team and season.
+    """
+    conn = get_connection()
+    rows = set()
+
+    for team in (DEFAULT_TEAM, *SHARDS):
+        table = _table(conn, team)
+        for row in conn.execute(
+                f"SELECT team, season, COUNT(*) FROM {table} GROUP BY team, season"):
+            # Only count rows in the database their team is routed to
+            if SHARDS.get(row[0]) == SHARDS.get(team):
+                rows.add(row)
+
+    return sorted(rows)
 
-def get_player(player_id):
-    """Return one player by playerID, or None if not found."""
-    conn = connect()
-    cursor = conn.cursor()
 
-    cursor.execute("""
+@perf.timed(rows=lambda row: row is not None)
+def get_player(player_id, team=DEFAULT_TEAM):
+    """
+    Return one player of `team` by playerID, or None if not found
+    (or on another team) (cached).
+    """
+    conn, schema = _cached_connection(team)
+
+    key = _player_key(team, player_id)
+    found, row = _cache.get(key)
+    if found:
+        return row
+
+    row = conn.execute(f"""
         SELECT playerID, batOrder, firstName, lastName, position, atBats, hits
-        FROM Player
-        WHERE playerID = ?
-    """, (player_id,))
+        FROM {schema}.Player
+        WHERE playerID = ? AND team = ?
+    """, (player_id, team)).fetchone()
 
-    row = cursor.fetchone()
-    conn.close()
+    _cache.put(key, row)
     return row
 
+
+@perf.timed(rows=len)
 def get_positions():
-    """Return all valid position values from the Position table."""
-    conn = connect()
-    cursor = conn.cursor()
+    """Return all valid position values from the Position table (cached)."""
+    conn, _ = _cached_connection()
 
-    cursor.execute("""
-        SELECT positionValue
-        FROM Position
-        ORDER BY positionID
-    """)
+    key = (DB_FILE, "positions", None)
+    found, positions = _cache.get(key)
+    if not found:
+        rows = conn.execute("""
+            SELECT positionValue
+            FROM Position
+            ORDER BY positionID
+        """).fetchall()
 
-    rows = cursor.fetchall()
-    conn.close()
+        # Convert list of tuples into a simple list of strings
+        positions = [row[0] for row in rows]
+        _cache.put(key, positions)
 
-    # Convert list of tuples into a simple list of strings
-    return [row[0] for row in rows]
+    # Copy so callers cannot change the cached list
+    return list(positions)
 
-def update_player(player_id, first_name, last_name, position, at_bats, hits):
-    """Update a player's name, position, and batting stats."""
-    conn = connect()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        UPDATE Player
-        SET firstName = ?,
-            lastName = ?,
-            position = ?,
-            atBats = ?,
-            hits = ?
-        WHERE playerID = ?
-    """, (first_name, last_name, position, at_bats, hits, player_id))
-
-    conn.commit()
-    conn.close()
-
-def add_player(bat_order, first_name, last_name, position, at_bats, hits):
-    """Add a new player to the database."""
-    conn = connect()
-    cursor = conn.cursor()
 
-    cursor.execute("""
-        INSERT INTO Player (batOrder, firstName, lastName, position, atBats, hits)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (bat_order, first_name, last_name, position, at_bats, hits))
+@perf.timed(rows=1)
+def update_player(player_id, first_name, last_name, position, at_bats, hits,
+                  team=DEFAULT_TEAM):
+    """
+    Update a player's name, position, and batting stats
+    (only if the player is on `team`).
+    """
+    conn = get_connection()
+    table = _table(conn, team)
 
-    conn.commit()
-    conn.close()    
+    with conn:
+        conn.execute(f"""
+            UPDATE {table}
+            SET firstName = ?,
+                lastName = ?,
+                position = ?,
+                atBats = ?,
+                hits = ?
+            WHERE playerID = ? AND team = ?
+        """, (first_name, last_name, position, at_bats, hits, player_id, team))
 
-def delete_player(player_id):
-    """Delete a player by playerID."""
-    conn = connect()
-    cursor = conn.cursor()
+    _cache.invalidate(_player_key(team, player_id))
 
-    cursor.execute("""
-        DELETE FROM Player
-        WHERE playerID = ?
-    """, (player_id,))
 
-    conn.commit()
-    conn.close()
+@perf.timed(rows=1)
+def add_player(bat_order, first_name, last_name, position, at_bats, hits,
+               team=DEFAULT_TEAM, season=DEFAULT_SEASON):
+    """
+    Add a new player to the database (to the team/season's lineup).
+    Returns the new playerID.
+    """
+    conn = get_connection()
+    table = _table(conn, team)
 
-def update_bat_order(player_id, new_bat_order):
-    """Update a player's batting order."""
-    conn = connect()
-    cursor = conn.cursor()
+    with conn:
+        cursor = conn.execute(f"""
+            INSERT INTO {table} (batOrder, firstName, lastName, position, atBats, hits,
+                                 team, season)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (bat_order, first_name, last_name, position, at_bats, hits, team, season))
+
+    # The new playerID may have been cached as "not found"
+    _cache.clear("player")
+    return cursor.lastrowid
+
+
+def next_bat_order(team=DEFAULT_TEAM, season=DEFAULT_SEASON):
+    """batOrder for a player added at the end of a team/season's lineup."""
+    conn = get_connection()
+    table = _table(conn, team)
+
+    return conn.execute(f"""
+        SELECT COALESCE(MAX(batOrder), 0) + 1
+        FROM {table}
+        WHERE team = ? AND season = ?
+    """, (team, season)).fetchone()[0]
+
+
+@perf.timed(rows=1)
+def delete_player(player_id, team=DEFAULT_TEAM):
+    """Delete a player of `team` by playerID."""
+    conn = get_connection()
+    table = _table(conn, team)
+
+    with conn:
+        conn.execute(f"""
+            DELETE FROM {table}
+            WHERE playerID = ? AND team = ?
+        """, (player_id, team))
+
+    _cache.invalidate(_player_key(team, player_id))
+
+
+@perf.timed(rows=1)
+def update_bat_order(player_id, new_bat_order, team=DEFAULT_TEAM):
+    """
+    Update a player's batting order.
+    batOrder is UNIQUE per team/season, so use move_player() /
+    reorder_lineup() when other players need to shift.
+    """
+    conn = get_connection()
+    table = _table(conn, team)
+
+    with conn:
+        conn.execute(f"""
+            UPDATE {table}
+            SET batOrder = ?
+            WHERE playerID = ? AND team = ?
+        """, (new_bat_order, player_id, team))
+
+    _cache.invalidate(_player_key(team, player_id))
+
+
+def _bat_order_ids(conn, table, team, season):
+    """playerIDs of one team/season in batting order (ties by playerID)."""
+    return [row[0] for row in conn.execute(f"""
+        SELECT playerID FROM {table}
+        WHERE team = ? AND season = ?
+        ORDER BY batOrder, playerID
+    """, (team, season))]
+
+
+def _write_bat_order(conn, ordered_player_ids, table, team, season):
+    """
+    Give the listed players batOrder 1..N in ONE transaction.
+    Every row of the team/season is first parked on a unique negative
+    value (-playerID) so the UNIQUE index never sees two rows with the
+    same batOrder.
+    """
+    with conn:
+        conn.execute(f"""
+            UPDATE {table} SET batOrder = -playerID
+            WHERE team = ? AND season = ?
+        """, (team, season))
+
+        cursor = conn.executemany(
+            f"UPDATE {table} SET batOrder = ? "
+            "WHERE playerID = ? AND team = ? AND season = ?",
+            ((order, player_id, team, season)
+             for order, player_id in enumerate(ordered_player_ids, 1))
+        )
+        updated = cursor.rowcount
+
+        left_over = conn.execute(f"""
+            SELECT COUNT(*) FROM {table}
+            WHERE team = ? AND season = ? AND batOrder < 1
+        """, (team, season)).fetchone()[0]
+
+        if left_over or updated != len(ordered_player_ids):
+            # Raising inside "with conn" rolls the whole reorder back
+            raise ValueError("Player IDs must list every player exactly once.")
+
+    _cache.clear("player")
+
+
+def renumber_bat_order(conn=None, team=DEFAULT_TEAM, season=DEFAULT_SEASON):
+    """Rewrite batOrder as 1..N, keeping the current order (ties by playerID)."""
+    conn = conn or get_connection()
+    table = _table(conn, team)
+
+    _write_bat_order(conn, _bat_order_ids(conn, table, team, season),
+                     table, team, season)
+
+
+@perf.timed()
+def reorder_lineup(ordered_player_ids, team=DEFAULT_TEAM, season=DEFAULT_SEASON):
+    """
+    Rewrite the whole batting order of a team/season in one transaction.
+    ordered_player_ids = every playerID, in the new batting order.
+    """
+    ordered_player_ids = list(ordered_player_ids)
+
+    if len(set(ordered_player_ids)) != len(ordered_player_ids):
+        raise ValueError("Player IDs must list every player exactly once.")
+
+    conn = get_connection()
+    _write_bat_order(conn, ordered_player_ids, _table(conn, team), team, season)
+
+
+@perf.timed()
+def move_player(player_id, new_order, team=DEFAULT_TEAM):
+    """
+    Move one player to batOrder `new_order` and shift the players
+    in between (same team/season) by one. Two set-based UPDATEs in
+    one transaction. A `new_order` past the end moves the player to
+    the last batOrder of the team/season.
+    """
+    if new_order < 1:
+        raise ValueError("Batting order must be 1 or higher.")
+
+    conn = get_connection()
+    table = _table(conn, team)
+
+    with conn:
+        row = conn.execute(
+            f"SELECT batOrder, season FROM {table} WHERE playerID = ? AND team = ?",
+            (player_id, team)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Player {player_id} not found.")
+
+        old_order, season = row
+        last = conn.execute(
+            f"SELECT MAX(batOrder) FROM {table} WHERE team = ? AND season = ?",
+            (team, season)
+        ).fetchone()[0]
+        new_order = min(new_order, last)
+        if new_order == old_order:
+            return
+
+        low, high = sorted((old_order, new_order))
+        shift = -1 if old_order < new_order else 1
+
+        # Step 1: park the affected block on negative (still unique) values
+        conn.execute(f"""
+            UPDATE {table}
+            SET batOrder = -batOrder
+            WHERE team = ? AND season = ? AND batOrder BETWEEN ? AND ?
+        """, (team, season, low, high))
+
+        # Step 2: moved player -> new_order, everyone else shifts by one
+        conn.execute(f"""
+            UPDATE {table}
+            SET batOrder = CASE
+                WHEN playerID = ? THEN ?
+                ELSE -batOrder + ?
+            END
+            WHERE team = ? AND season = ? AND batOrder BETWEEN ? AND ?
+        """, (player_id, new_order, shift, team, season, -high, -low))
+
+    _cache.clear("player")
+
+
+@perf.timed(rows=len)
+def get_leaders(limit=10, min_at_bats=0, team=DEFAULT_TEAM, season=DEFAULT_SEASON):
+    """
+    Return the top `limit` players of a team/season by batting average
+    with at least `min_at_bats` at bats (ties: more at bats first).
+    Rows: (playerID, batOrder, firstName, lastName, position, atBats, hits, avg)
+    """
+    conn = get_connection()
+    table = _table(conn, team)
+
+    return conn.execute(f"""
+        SELECT playerID, batOrder, firstName, lastName, position, atBats, hits,
+               {AVG_SQL} AS avg
+        FROM {table}
+        WHERE team = ? AND season = ? AND atBats >= ?
+        ORDER BY {AVG_SQL} DESC, atBats DESC
+        LIMIT ?
+    """, (team, season, min_at_bats, limit)).fetchall()
+
+
+@perf.timed(rows=len)
+def get_position_summary(team=DEFAULT_TEAM, season=DEFAULT_SEASON):
+    """
+    Return totals per position for a team/season, computed inside SQLite.
+    Rows: (position, players, atBats, hits, avg)
+    """
+    conn = get_connection()
+    table = _table(conn, team)
+
+    return conn.execute(f"""
+        SELECT position,
+               COUNT(*),
+               COALESCE(SUM(atBats), 0),
+               COALESCE(SUM(hits), 0),
+               CASE WHEN SUM(atBats) > 0
+                    THEN ROUND(CAST(SUM(hits) AS REAL) / SUM(atBats), 3)
+                    ELSE 0.0 END
+        FROM {table}
+        WHERE team = ? AND season = ?
+        GROUP BY position
+        ORDER BY position
+    """, (team, season)).fetchall()
+
+
+def _name_filter(name):
+    """SQL + params for an optional case-insensitive name search."""
+    if not name:
+        return "", ()
+    return "AND (firstName || ' ' || lastName) LIKE ?", (f"%{name}%",)
+
+
+@perf.timed(rows=len)
+def get_players_page(after_bat_order=0, page_size=PAGE_SIZE, name=None,
+                     team=DEFAULT_TEAM, season=DEFAULT_SEASON):
+    """
+    Return the next `page_size` players after batOrder `after_bat_order`
+    (keyset paging: pass the last row's batOrder to get the next page).
+    name = optional search text matched anywhere in "First Last".
+    """
+    conn = get_connection()
+    table = _table(conn, team)
+    name_sql, name_params = _name_filter(name)
+
+    return conn.execute(f"""
+        SELECT playerID, batOrder, firstName, lastName, position, atBats, hits
+        FROM {table}
+        WHERE team = ? AND season = ? AND batOrder > ? {name_sql}
+        ORDER BY batOrder
+        LIMIT ?
+    """, (team, season, after_bat_order, *name_params, page_size)).fetchall()
+
+
+@perf.timed(rows=len)
+def get_players_page_before(before_bat_order, page_size=PAGE_SIZE, name=None,
+                            team=DEFAULT_TEAM, season=DEFAULT_SEASON):
+    """
+    Return the `page_size` players just before batOrder `before_bat_order`
+    (the previous page), still in ascending batOrder.
+    """
+    conn = get_connection()
+    table = _table(conn, team)
+    name_sql, name_params = _name_filter(name)
+
+    rows = conn.execute(f"""
+        SELECT playerID, batOrder, firstName, lastName, position, atBats, hits
+        FROM {table}
+        WHERE team = ? AND season = ? AND batOrder < ? {name_sql}
+        ORDER BY batOrder DESC
+        LIMIT ?
+    """, (team, season, before_bat_order, *name_params, page_size)).fetchall()
+
+    rows.reverse()
+    return rows
+
+
+def explain(sql, params=()):
+    """Return SQLite's EXPLAIN QUERY PLAN details for a query (list of strings)."""
+    conn = get_connection()
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+@perf.timed(rows=int)
+def import_csv(path=None, chunk_size=CHUNK_SIZE, team=DEFAULT_TEAM, season=DEFAULT_SEASON):
+    """
+    Stream a players CSV (old or new format, same rules as db.load_lineup)
+    into the Player table as team/season. Players are appended after the
+    team/season's current last batOrder and inserted `chunk_size` rows per
+    transaction. path defaults to db.DATA_FILE.
+    Returns the number of players imported.
+    """
+    conn = get_connection()
+    table = _table(conn, team)
+
+    next_order = conn.execute(f"""
+        SELECT COALESCE(MAX(batOrder), 0) + 1 FROM {table}
+        WHERE team = ? AND season = ?
+    """, (team, season)).fetchone()[0]
+    imported = 0
+
+    players = db.iter_lineup(path)
+
+    while True:
+        chunk = [
+            (order, p["first_name"], p["last_name"], p["position"],
+             p["at_bats"], p["hits"], team, season)
+            for order, p in enumerate(islice(players, chunk_size), next_order)
+        ]
+        if not chunk:
+            break
+
+        with conn:
+            conn.executemany(f"""
+                INSERT INTO {table} (batOrder, firstName, lastName, position, atBats, hits,
+                                     team, season)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, chunk)
+
+        next_order += len(chunk)
+        imported += len(chunk)
+        _cache.clear("player")
+
+    return imported
+
+
+@perf.timed(rows=int)
+def export_csv(path=None, chunk_size=CHUNK_SIZE, team=DEFAULT_TEAM, season=DEFAULT_SEASON):
+    """
+    Stream one team/season (in batOrder) to a NEW-format players CSV.
+    Rows are fetched `chunk_size` at a time. path defaults to db.DATA_FILE.
+    Returns the number of players exported.
+    """
+    path = path if path is not None else db.DATA_FILE
+
+    conn = get_connection()
+    cursor = conn.execute(f"""
+        SELECT firstName, lastName, position, atBats, hits
+        FROM {_table(conn, team)}
+        WHERE team = ? AND season = ?
+        ORDER BY batOrder
+    """, (team, season))
+    exported = 0
+
+    with open(path, "w", encoding="utf-8", buffering=db.WRITE_BUFFER) as f:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+
+            exported += db.write_rows(f, rows)
+
+    return exported
+
+
+
+def _rollup(chunk):
+    """
+    Events -> [(at bats, hits, playerID), ...] totals per player.
+    Counts (playerID, outcome) pairs first (in C), so the Python loop
+    runs once per pair instead of once per event.
+    Raises ValueError for an unknown outcome.
+    """
+    totals = {}
+
+    for (player_id, outcome), count in Counter(map(_EVENT_KEY, chunk)).items():
+        try:
+            at_bats, hits = OUTCOMES[outcome]
+        except KeyError:
+            raise ValueError(f"Unknown outcome: {outcome}") from None
+
+        t = totals.setdefault(player_id, [0, 0])
+        t[0] += at_bats * count
+        t[1] += hits * count
+
+    return [(at_bats, hits, player_id) for player_id, (at_bats, hits) in totals.items()]
+
+
+def _with_keys(chunk):
+    """
+    Events with or without an eventKey -> (gameID, playerID, outcome,
+    eventKey) tuples: keys as text, None for events without one.
+    """
+    rows = []
+    for event in chunk:
+        if len(event) == 3:
+            rows.append((*event, None))
+            continue
+        game_id, player_id, outcome, key = event
+        rows.append((game_id, player_id, outcome, None if key is None else str(key)))
+    return rows
+
+
+def _new_events(conn, schema, chunk):
+    """
+    _with_keys() rows -> the ones to store: events without a key, and
+    events whose eventKey is not stored yet (nor earlier in the chunk).
+    """
+    keys = [event[3] for event in chunk if event[3] is not None]
+    seen = {key for (key,) in conn.execute(f"""
+        SELECT eventKey
+        FROM {schema}.AtBatEvent
+        WHERE eventKey IN (SELECT value FROM json_each(?))
+    """, (json.dumps(keys),))}
+
+    fresh = []
+    for event in chunk:
+        key = event[3]
+        if key is None:
+            fresh.append(event)
+        elif key not in seen:
+            seen.add(key)
+            fresh.append(event)
+    return fresh
+
+
+@perf.timed(rows=int)
+def ingest_events(events, team=DEFAULT_TEAM, chunk_size=CHUNK_SIZE):
+    """
+    Store plate-appearance events (any iterable of
+    (gameID, playerID, outcome) tuples, outcome a key of OUTCOMES)
+    and keep Player.atBats/hits up to date as running totals.
+    Events may carry a 4th item, an eventKey (e.g. "file:line"; None
+    = no key): an event whose key is already stored is skipped, so
+    feeding the same events twice does not count them twice. Events
+    with and without keys can be mixed freely.
+    Each chunk of `chunk_size` events is ONE transaction: the events
+    are inserted with executemany() and each player's totals for the
+    chunk are added with one UPDATE per player (not one per event).
+    A chunk with an unknown outcome or a playerID not on `team` is
+    rolled back and raises ValueError (earlier chunks stay ingested).
+    Returns the number of events ingested (skipped duplicates excluded).
+    """
+    conn = get_connection()
+    schema = _schema(conn, team)
+    events = iter(events)
+    ingested = 0
+
+    while True:
+        chunk = list(islice(events, chunk_size))
+        if not chunk:
+            return ingested
+
+        # Plain 3-tuples (the usual bulk load) skip the key lookup
+        keyed = set(map(len, chunk)) != {3}
+        if keyed:
+            chunk = _new_events(conn, schema, _with_keys(chunk))
+            if not chunk:
+                continue
+
+        rollups = _rollup(chunk)
+
+        with conn:
+            if keyed:
+                conn.executemany(f"""
+                    INSERT INTO {schema}.AtBatEvent (gameID, playerID, outcome, eventKey)
+                    VALUES (?, ?, ?, ?)
+                """, chunk)
+            else:
+                conn.executemany(f"""
+                    INSERT INTO {schema}.AtBatEvent (gameID, playerID, outcome)
+                    VALUES (?, ?, ?)
+                """, chunk)
+
+            updated = conn.executemany(f"""
+                UPDATE {schema}.Player
+                SET atBats = COALESCE(atBats, 0) + ?,
+                    hits = COALESCE(hits, 0) + ?
+                WHERE playerID = ? AND team = ?
+            """, [(*rollup, team) for rollup in rollups]).rowcount
+
+            if updated != len(rollups):
+                # Raising inside "with conn" rolls the chunk back
+                raise ValueError("Events refer to a playerID that is not on the team.")
+
+        ingested += len(chunk)
+        _cache.clear("player")
+
+
+def _read_events(f, source, errors):
+    """
+    gameID,playerID,outcome lines -> keyed events ("source:line" keys).
+    Malformed lines are skipped; (line number, message) pairs are
+    appended to `errors` if it is a list.
+    """
+    reader = csv.reader(f)
+    for row in reader:
+        if not any(field.strip() for field in row):
+            continue
+
+        line = reader.line_num
+        if len(row) != 3:
+            message = f"Expected gameID,playerID,outcome, got {len(row)} fields."
+        else:
+            game_id, player_id, outcome = (field.strip() for field in row)
+            outcome = outcome.upper()
+            try:
+                player_id = int(player_id)
+            except ValueError:
+                message = f"Invalid playerID: {player_id!r}"
+            else:
+                if not game_id:
+                    message = "Missing gameID."
+                elif outcome not in OUTCOMES:
+                    message = f"Unknown outcome: {outcome!r}"
+                else:
+                    yield game_id, player_id, outcome, f"{source}:{line}"
+                    continue
+
+        if errors is not None:
+            errors.append((line, message))
+
+
+@perf.timed(rows=int)
+def import_events_csv(path, team=DEFAULT_TEAM, chunk_size=CHUNK_SIZE, errors=None):
+    """
+    ingest_events() from a CSV file of gameID,playerID,outcome lines.
+    Each event is keyed by file path + line number, so importing the
+    same file again (e.g. after a failed run) adds only what is missing.
+    Malformed lines are skipped and reported in `errors` (a list of
+    (line number, message) pairs) if one is passed.
+    Returns the number of events ingested.
+    """
+    source = Path(path).resolve()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return ingest_events(_read_events(f, source, errors), team, chunk_size)
+
+
+@perf.timed(rows=int)
+def rebuild_rollups(team=DEFAULT_TEAM):
+    """
+    Recompute atBats/hits from AtBatEvent for every player of `team`
+    that has events (repair tool for rosters whose stats come only from
+    events; hand-entered totals of those players are replaced).
+    Returns the number of players updated.
+    """
+    conn = get_connection()
+    schema = _schema(conn, team)
+
+    counts = conn.execute(f"""
+        SELECT playerID, outcome, COUNT(*)
+        FROM {schema}.AtBatEvent
+        GROUP BY playerID, outcome
+    """).fetchall()
+
+    totals = {}
+    for player_id, outcome, count in counts:
+        at_bats, hits = OUTCOMES.get(outcome, (0, 0))
+        t = totals.setdefault(player_id, [0, 0])
+        t[0] += at_bats * count
+        t[1] += hits * count
+
+    with conn:
+        updated = conn.executemany(
+            f"UPDATE {schema}.Player SET atBats = ?, hits = ? "
+            "WHERE playerID = ? AND team = ?",
+            ((at_bats, hits, player_id, team)
+             for player_id, (at_bats, hits) in totals.items())
+        ).rowcount
 
-    cursor.execute("""
-        UPDATE Player
-        SET batOrder = ?
-        WHERE playerID = ?
-    """, (new_bat_order, player_id))
+    _cache.clear("player")
+    return updated
 
-    conn.commit()
-    conn.close()
 
 if __name__ == "__main__":
     players = get_all_players()
     for player in players:
-        print(player)
\ No newline at end of file
+        print(player)
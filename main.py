@@ -7,19 +7,35 @@
 # Instead:
 # - ui.py handles user interaction (input/output)
 # - db.py handles file access (load/save CSV)
+# - db_mapped.py reads players.csv on demand (MappedLineup)
+# - db_journal.py records each edit (append-only journal)
+# - write_behind.py batches the disk syncs/compactions of bursts of edits
+# - batch.py runs scripted commands (python main.py --batch FILE)
+# - optimizer.py suggests a batting order (Monte Carlo simulation)
 # - objects.py handles business objects (Player, Lineup)
 #
 # main.py acts as the "controller":
 # - loads data
 # - calls UI functions to get input and show output
 # - calls Lineup/Player methods to perform actions
-# - saves changes using db.py
+# - journals changes using db_journal.py
+#   (players.csv is rewritten only when the journal is compacted)
 # ---------------------------------------------------------
 
+import argparse
+import contextlib
+import sys
+
+import batch
 import db
+import db_journal
+import optimizer
+import perf
 import ui
 from datetime import date
-from objects import Player, Lineup
+from db_mapped import MappedLineup
+from objects import Player
+from write_behind import WriteBehind
 
 
 def get_game_date():
@@ -44,10 +60,45 @@ def get_game_date():
             print("Invalid date. Please use YYYY-MM-DD (example: 2026-03-10).")
 
 
+# Edits within this many seconds share one journal fsync/compaction
+# (0 = save synchronously after every edit)
+SAVE_DELAY = 2.0
+
+_saver = None
+
+
+def persist(lineup):
+    """
+    Write-behind save: make the journal records durable, and compact
+    the journal into players.csv once it has grown enough (and the
+    lineup has changes players.csv does not have yet).
+    """
+    db_journal.sync()
+    if db_journal.needs_compaction() and lineup.dirty:
+        db_journal.compact(lineup)
+
+
+def changing():
+    """
+    Hold while changing the lineup + journal, so a write-behind save
+    never runs in the middle of a change (never hold it across input()).
+    """
+    return _saver.lock if _saver is not None else contextlib.nullcontext()
+
+
+def save(lineup):
+    """Schedule a save for this edit (coalesced with the edits around it)."""
+    if _saver is None:
+        persist(lineup)
+    else:
+        _saver.mark()
+
+
+@perf.timed("main.add_player")
 def add_player(lineup):
     """
     Menu option 2: Add a player.
-    Uses ui.py for input helpers and saves to CSV.
+    Uses ui.py for input helpers and journals the new player.
     """
     # Get first/last name (required in Section 3)
     first_name = input("First name: ").strip()
@@ -72,14 +123,18 @@ def add_player(lineup):
         break
 
     # Add Player object to the Lineup
-    lineup.add_player(Player(first_name, last_name, pos, ab, hits))
+    player = Player(first_name, last_name, pos, ab, hits)
+    with changing():
+        lineup.add_player(player)
 
-    # Save lineup (objects -> dicts -> CSV)
-    db.save_lineup(lineup.to_dicts())
+        # Journal the change (one small append, not a full CSV rewrite)
+        db_journal.log_add(player.to_dict())
+    save(lineup)
 
     print(f"{first_name} {last_name} was added.")
 
 
+@perf.timed("main.remove_player")
 def remove_player(lineup):
     """
     Menu option 3: Remove a player.
@@ -90,13 +145,15 @@ def remove_player(lineup):
         print("Invalid lineup number.")
         return
 
-    removed_name = lineup.remove_player(num)
-
-    db.save_lineup(lineup.to_dicts())
+    with changing():
+        removed_name = lineup.remove_player(num)
+        db_journal.log_remove(num)
+    save(lineup)
 
     print(f"{removed_name} was deleted.")
 
 
+@perf.timed("main.move_player")
 def move_player(lineup):
     """
     Menu option 4: Move a player to a new lineup position.
@@ -116,13 +173,15 @@ def move_player(lineup):
         print("Invalid lineup number.")
         return
 
-    lineup.move_player(cur, new)
-
-    db.save_lineup(lineup.to_dicts())
+    with changing():
+        moved_name = lineup.move_player(cur, new)
+        db_journal.log_move(cur, new)
+    save(lineup)
 
-    print(f"{player.full_name} was moved.")
+    print(f"{moved_name} was moved.")
 
 
+@perf.timed("main.edit_player_position")
 def edit_player_position(lineup):
     """
     Menu option 5: Edit a player's position.
@@ -137,13 +196,17 @@ def edit_player_position(lineup):
     print(f"You selected {player.full_name} POS={player.position}")
 
     # Get new position from UI helper
-    player.position = ui.get_position()
+    position = ui.get_position()
 
-    db.save_lineup(lineup.to_dicts())
+    with changing():
+        lineup.edit_player(num, position=position)
+        db_journal.log_edit(num, position=position)
+    save(lineup)
 
     print(f"{player.full_name} was updated.")
 
 
+@perf.timed("main.edit_player_stats")
 def edit_player_stats(lineup):
     """
     Menu option 6: Edit a player's stats (AB/H) with validation.
@@ -168,27 +231,87 @@ def edit_player_stats(lineup):
         print("Hits cannot be greater than at bats.")
         return
 
-    player.at_bats = new_ab
-    player.hits = new_hits
-
-    db.save_lineup(lineup.to_dicts())
+    with changing():
+        lineup.edit_player(num, at_bats=new_ab, hits=new_hits)
+        db_journal.log_edit(num, at_bats=new_ab, hits=new_hits)
+    save(lineup)
 
     print(f"{player.full_name} was updated.")
 
 
+@perf.timed("main.optimize_order")
+def optimize_order(lineup):
+    """
+    Menu option 9: Simulate games to find a better batting order,
+    then apply it (as journaled moves) if the user agrees.
+    """
+    if len(lineup) < 2 or len(lineup) > optimizer.MAX_PLAYERS:
+        print(f"Batting orders can be suggested for 2 to "
+              f"{optimizer.MAX_PLAYERS} players.")
+        return
+
+    with changing():
+        players = list(lineup)
+    order, best_runs, current_runs, evaluations = optimizer.optimize(
+        [p.batting_average() for p in players])
+
+    ui.display_order([players[i].full_name for i in order], current_runs, best_runs)
+    print(f"({evaluations:,} orders simulated)")
+
+    if order == list(range(len(players))):
+        print("The current order is already the best one found.")
+        return
+
+    if input("Use this order? (y/n): ").strip().lower() != "y":
+        return
+
+    with changing():
+        for cur, new in optimizer.apply_order(lineup, order):
+            db_journal.log_move(cur, new)
+    save(lineup)
+
+    print("Batting order was updated.")
+
+
+def load_lineup():
+    """
+    Last good players.csv snapshot + replayed journal -> MappedLineup
+    (nothing is parsed until it is shown).
+    """
+    # Crash between snapshot renames: go back to the last good snapshot
+    if db.restore_backup():
+        print("Restored players.csv from the last good snapshot.")
+
+    lineup = MappedLineup()
+    db_journal.apply(lineup, db_journal.pending_records())
+    return lineup
+
+
+def run_batch(source):
+    """
+    --batch mode: run a command file (or "-" for stdin) with batch.py,
+    then save everything once (journal compaction = one atomic write).
+    Exit code 1 if any command failed.
+    """
+    lineup = load_lineup()
+    errors = batch.run_file(lineup, source, lambda: db_journal.compact(lineup))
+    return 1 if errors else 0
+
+
 def main():
     """
     Program entry point:
-    - Load CSV -> list of dicts (db.py)
-    - Convert dicts -> Player objects in Lineup (objects.py)
-    - Menu loop (ui.py displays)
+    - Map players.csv (rows are read on demand, db_mapped.py)
+    - Replay the journal on top of it (db_journal.py)
+    - Menu loop (ui.py displays), edits saved write-behind
     """
-    # Load dicts from CSV
-    data = db.load_lineup()
+    global _saver
 
-    # Convert to Player objects inside a Lineup object
-    lineup = Lineup()
-    lineup.load_from_dicts(data)
+    lineup = load_lineup()
+
+    # Records are fsynced by the saver, once per SAVE_DELAY window
+    db_journal.FSYNC = SAVE_DELAY <= 0
+    _saver = WriteBehind(lambda: persist(lineup), SAVE_DELAY)
 
     # Title from UI layer
     ui.display_title()
@@ -196,39 +319,61 @@ def main():
     # Ask for game date once
     game_date = get_game_date()
 
-    # Menu loop
-    while True:
-        # Show menu from UI layer
-        ui.display_menu(game_date)
+    # Menu loop (actions take the saver lock only while they change
+    # the lineup, never while waiting for input)
+    try:
+        while True:
+            # Show menu from UI layer
+            ui.display_menu(game_date)
+
+            option = input("Menu option: ").strip()
 
-        option = input("Menu option: ").strip()
+            if option == "1":
+                # Display reads the Player objects directly (no dict copies)
+                with changing():
+                    ui.display(lineup)
 
-        if option == "1":
-            # Display expects dictionaries
-            ui.display(lineup.to_dicts())
+            elif option == "2":
+                add_player(lineup)
 
-        elif option == "2":
-            add_player(lineup)
+            elif option == "3":
+                remove_player(lineup)
 
-        elif option == "3":
-            remove_player(lineup)
+            elif option == "4":
+                move_player(lineup)
 
-        elif option == "4":
-            move_player(lineup)
+            elif option == "5":
+                edit_player_position(lineup)
 
-        elif option == "5":
-            edit_player_position(lineup)
+            elif option == "6":
+                edit_player_stats(lineup)
 
-        elif option == "6":
-            edit_player_stats(lineup)
+            elif option == "7":
+                # Fold the journal into players.csv before leaving
+                with changing():
+                    db_journal.compact(lineup)
+                print("Bye!")
+                break
 
-        elif option == "7":
-            print("Bye!")
-            break
+            elif option == "8":
+                ui.display_stats(perf.snapshot(), perf.ENABLED)
 
-        else:
-            print("Invalid menu option. Please try again.")
+            elif option == "9":
+                optimize_order(lineup)
+
+            else:
+                print("Invalid menu option. Please try again.")
+    finally:
+        # Any exit (even Ctrl+C): write out what is still pending
+        _saver.flush()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Baseball Team Manager")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run commands from FILE ('-' = stdin) instead of the menu")
+    args = parser.parse_args()
+
+    if args.batch:
+        sys.exit(run_batch(args.batch))
     main()
\ No newline at end of file
@@ -2,19 +2,31 @@
 # ---------------------------------------------------------
 # Section 3: Object-Oriented Version
 # - Player: first_name, last_name, position, at_bats, hits
+#   (+ optional team and season)
 # - Lineup: manages Player objects (add/remove/move/retrieve/edit)
 # - Includes iterator and count (len) for looping
+# - Lineup keeps lookup indexes: player_id, full name, position
+# - ColumnarLineup: same interface, stores one column per field
+#   (compact for very large rosters)
 # ---------------------------------------------------------
 
+from array import array
+
 
 class Player:
     """
     Represents a single baseball player.
     Stores first and last name separately (required).
+    Uses __slots__ (no per-object __dict__) to keep big rosters small.
     """
 
-    def __init__(self, first_name, last_name, position, at_bats, hits):
-        # Identity
+    __slots__ = ("first_name", "last_name", "position", "at_bats", "hits",
+                 "player_id", "team", "season")
+
+    def __init__(self, first_name, last_name, position, at_bats, hits,
+                 team=None, season=None):
+        # Identity (player_id is assigned by the Lineup)
+        self.player_id = None
         self.first_name = first_name
         self.last_name = last_name
 
@@ -23,6 +35,10 @@ class Player:
         self.at_bats = at_bats
         self.hits = hits
 
+        # Team and season (None = not set; a Lineup fills in its own)
+        self.team = team
+        self.season = season
+
     @property
     def full_name(self):
         """Return full name as 'First Last'."""
@@ -37,15 +53,21 @@ class Player:
     def to_dict(self):
         """
         Convert to dict for db layer.
-        We use keys that match the NEW CSV format.
+        We use keys that match the NEW CSV format
+        ("team"/"season" are added only when they are set).
         """
-        return {
+        data = {
             "first_name": self.first_name,
             "last_name": self.last_name,
             "position": self.position,
             "at_bats": self.at_bats,
             "hits": self.hits
         }
+        if self.team is not None:
+            data["team"] = self.team
+        if self.season is not None:
+            data["season"] = self.season
+        return data
 
     @staticmethod
     def from_dict(data):
@@ -55,15 +77,47 @@ class Player:
             data["last_name"],
             data["position"],
             data["at_bats"],
-            data["hits"]
+            data["hits"],
+            data.get("team"),
+            data.get("season")
         )
 
 
 class Lineup:
-    """Manages a list of Player objects."""
+    """
+    Manages a list of Player objects.
+    Also keeps lookup indexes (dicts) so these are O(1):
+    - find(player_id)        stable id given when a player is added
+    - find_by_name(name)     players with that full name
+    - players_at(position)   players at a position
+    - players_on(team, season)
+    Only by_id is kept from the start; the name/position/team indexes
+    are built on their first lookup (and kept up to date after that),
+    so a lineup that is never searched holds no extra dicts.
+    Change player fields through edit_player() so the indexes stay correct.
+    team/season: the lineup's scope, given to added players that have none.
+    dirty is set by every change and cleared with mark_clean() after a save.
+    """
+
+    # Secondary index -> key of a player in it
+    INDEX_KEYS = {
+        "by_name": lambda p: p.full_name,
+        "by_position": lambda p: p.position,
+        "by_team": lambda p: (p.team, p.season),
+    }
 
-    def __init__(self):
+    # Fields edit_player() may change
+    EDIT_FIELDS = ("first_name", "last_name", "position", "at_bats", "hits",
+                   "team", "season")
+
+    def __init__(self, team=None, season=None):
+        self.team = team
+        self.season = season
         self.players = []
+        self.dirty = False
+        self._next_id = 1
+        self.by_id = {}          # player_id -> Player
+        self._indexes = {}       # built INDEX_KEYS name -> {key: {player_id: Player}}
 
     def __len__(self):
         """Allow: len(lineup)"""
@@ -73,31 +127,341 @@ class Lineup:
         """Allow: for player in lineup:"""
         return iter(self.players)
 
+    def _group_index(self, name):
+        """The secondary index `name` (built now if it does not exist yet)."""
+        index = self._indexes.get(name)
+        if index is None:
+            index = {}
+            key = self.INDEX_KEYS[name]
+            for player in self.players:
+                index.setdefault(key(player), {})[player.player_id] = player
+            self._indexes[name] = index
+        return index
+
+    # full_name -> {player_id: Player}
+    by_name = property(lambda self: self._group_index("by_name"))
+    # position -> {player_id: Player}
+    by_position = property(lambda self: self._group_index("by_position"))
+    # (team, season) -> {player_id: Player}
+    by_team = property(lambda self: self._group_index("by_team"))
+
+    def _index(self, player):
+        """Give player an id (if needed) and add it to the indexes."""
+        if player.player_id is None or player.player_id in self.by_id:
+            player.player_id = self._next_id
+        self._next_id = max(self._next_id, player.player_id + 1)
+
+        self.by_id[player.player_id] = player
+        for name, index in self._indexes.items():
+            key = self.INDEX_KEYS[name](player)
+            index.setdefault(key, {})[player.player_id] = player
+
+    def _unindex(self, player):
+        """Remove player from the indexes (and by_id)."""
+        del self.by_id[player.player_id]
+        for name, index in self._indexes.items():
+            key = self.INDEX_KEYS[name](player)
+            group = index[key]
+            del group[player.player_id]
+            if not group:
+                del index[key]
+
     def load_from_dicts(self, dict_list):
-        """Convert list of dicts -> Player objects."""
-        self.players = []
+        """Convert dicts (any iterable, e.g. db.iter_lineup()) -> Player objects."""
+        self.__init__(self.team, self.season)
         for d in dict_list:
-            self.players.append(Player.from_dict(d))
+            self.add_player(Player.from_dict(d))
+        self.dirty = False
 
     def to_dicts(self):
         """Convert Player objects -> list of dicts."""
         return [p.to_dict() for p in self.players]
 
     def add_player(self, player):
-        """Add Player to end."""
+        """Add Player to end (it joins the lineup's team/season if it has none)."""
+        if player.team is None:
+            player.team = self.team
+        if player.season is None:
+            player.season = self.season
+
         self.players.append(player)
+        self._index(player)
+        self.dirty = True
 
     def get_player(self, number):
         """Retrieve Player by lineup number (1-based)."""
         return self.players[number - 1]
 
+    def find(self, player_id):
+        """Retrieve Player by player_id, or None."""
+        return self.by_id.get(player_id)
+
+    def find_by_name(self, full_name):
+        """List of Players with this full name ('First Last')."""
+        return list(self.by_name.get(full_name, {}).values())
+
+    def players_at(self, position):
+        """List of Players at this position."""
+        return list(self.by_position.get(position, {}).values())
+
+    def players_on(self, team, season=None):
+        """List of Players on this team (in this season, or in any season)."""
+        if season is not None:
+            return list(self.by_team.get((team, season), {}).values())
+        return [p for (t, _), group in self.by_team.items() if t == team
+                for p in group.values()]
+
+    def edit_player(self, number, **fields):
+        """
+        Change fields of the Player at lineup number (1-based), e.g.
+        edit_player(3, position="SS") or edit_player(3, at_bats=10, hits=4).
+        """
+        for name in fields:
+            if name not in self.EDIT_FIELDS:
+                raise AttributeError(f"Player has no editable field {name!r}")
+
+        player = self.players[number - 1]
+
+        self._unindex(player)
+        try:
+            for name, value in fields.items():
+                setattr(player, name, value)
+        finally:
+            # Back in the indexes even if a setattr failed half way
+            self._index(player)
+            self.dirty = True
+
+        return player
+
     def remove_player(self, number):
         """Remove Player by lineup number (1-based)."""
         removed = self.players.pop(number - 1)
+        self._unindex(removed)
+        self.dirty = True
         return removed.full_name
 
     def move_player(self, current_number, new_number):
         """Move Player from one position to another (1-based)."""
         player = self.players.pop(current_number - 1)
         self.players.insert(new_number - 1, player)
-        return player.full_name
\ No newline at end of file
+        self.dirty = True
+        return player.full_name
+
+    def mark_clean(self):
+        """Call after the lineup has been saved."""
+        self.dirty = False
+
+
+class ColumnarPlayer(Player):
+    """
+    A Player "view" onto one row of a ColumnarLineup.
+    Reading/writing attributes goes straight to the lineup's columns.
+    The view follows the row NUMBER, so get a new one after moves/removes.
+    """
+
+    __slots__ = ("lineup", "index")
+
+    def __init__(self, lineup, index):
+        self.lineup = lineup
+        self.index = index
+
+    def _text(column):
+        """Build a property for a string column (stored as codes)."""
+        def getter(self):
+            return self.lineup.strings[getattr(self.lineup, column)[self.index]]
+
+        def setter(self, value):
+            getattr(self.lineup, column)[self.index] = self.lineup.encode(value)
+            self.lineup.dirty = True
+
+        return property(getter, setter)
+
+    def _number(column):
+        """Build a property for an int column."""
+        def getter(self):
+            return getattr(self.lineup, column)[self.index]
+
+        def setter(self, value):
+            getattr(self.lineup, column)[self.index] = value
+            self.lineup.dirty = True
+
+        return property(getter, setter)
+
+    first_name = _text("first_names")
+    last_name = _text("last_names")
+    position = _text("positions")
+    at_bats = _number("at_bats")
+    hits = _number("hits")
+
+    def _scope(name):
+        """Build a property for the lineup-wide team/season."""
+        def getter(self):
+            return getattr(self.lineup, name)
+
+        def setter(self, value):
+            setattr(self.lineup, name, value)
+            self.lineup.dirty = True
+
+        return property(getter, setter)
+
+    # One team/season per ColumnarLineup: setting them changes the lineup's
+    team = _scope("team")
+    season = _scope("season")
+
+    @property
+    def player_id(self):
+        """Id given by a Lineup (None until set)."""
+        ids = self.lineup.player_ids
+        return (ids[self.index] or None) if ids is not None else None
+
+    @player_id.setter
+    def player_id(self, value):
+        if self.lineup.player_ids is None:
+            if value is None:
+                return
+            self.lineup.player_ids = array("i", bytes(4 * len(self.lineup)))
+        self.lineup.player_ids[self.index] = value or 0
+
+    del _text, _number, _scope
+
+
+class ColumnarLineup:
+    """
+    Memory-compact Lineup with the same interface as Lineup.
+    - names/positions: int codes into one shared string table
+      (each distinct string is stored once)
+    - at_bats/hits: array('i') columns
+    get_player() and iteration return ColumnarPlayer views.
+    team/season: the one team/season the whole lineup belongs to.
+    player_ids: array('i') created on the first player_id written to
+    a view (0 = no id), None until then.
+    dirty is set by every change and cleared with mark_clean() after a save.
+    """
+
+    def __init__(self, team=None, season=None):
+        self.team = team
+        self.season = season
+
+        # String table: code -> string, string -> code
+        # (codes may be None and is then rebuilt on the first encode())
+        self.strings = []
+        self.codes = {}
+
+        # One column per field, one entry per player
+        self.first_names = array("i")
+        self.last_names = array("i")
+        self.positions = array("i")
+        self.at_bats = array("i")
+        self.hits = array("i")
+        self.player_ids = None
+
+        self.dirty = False
+
+    def _columns(self):
+        columns = (self.first_names, self.last_names, self.positions,
+                   self.at_bats, self.hits)
+        if self.player_ids is not None:
+            columns += (self.player_ids,)
+        return columns
+
+    def encode(self, text):
+        """Return the string-table code for text (adding it if new)."""
+        if self.codes is None:
+            self.codes = {text: code for code, text in enumerate(self.strings)}
+
+        code = self.codes.get(text)
+        if code is None:
+            code = len(self.strings)
+            self.strings.append(text)
+            self.codes[text] = code
+        return code
+
+    def __len__(self):
+        """Allow: len(lineup)"""
+        return len(self.at_bats)
+
+    def __iter__(self):
+        """Allow: for player in lineup:"""
+        for index in range(len(self.at_bats)):
+            yield ColumnarPlayer(self, index)
+
+    def load_from_dicts(self, dict_list):
+        """Convert dicts (any iterable, e.g. db.iter_lineup()) -> columns."""
+        self.__init__(self.team, self.season)
+        for d in dict_list:
+            self._append(d["first_name"], d["last_name"], d["position"],
+                         d["at_bats"], d["hits"])
+        self.dirty = False
+
+    def load_from_columns(self, columns):
+        """
+        Load from db.load_columns() output (one list/array per field).
+        Raises ValueError if the columns do not all have the same length.
+        """
+        lengths = {name: len(columns[name]) for name in
+                   ("first_name", "last_name", "position", "at_bats", "hits")}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"Columns have different lengths: {lengths}")
+
+        self.__init__(self.team, self.season)
+        encode = self.encode
+        self.first_names = array("i", map(encode, columns["first_name"]))
+        self.last_names = array("i", map(encode, columns["last_name"]))
+        self.positions = array("i", map(encode, columns["position"]))
+        self.at_bats = array("i", columns["at_bats"])
+        self.hits = array("i", columns["hits"])
+
+    def to_dicts(self):
+        """Convert columns -> list of dicts."""
+        return [p.to_dict() for p in self]
+
+    def _append(self, first_name, last_name, position, at_bats, hits):
+        encode = self.encode
+        self.first_names.append(encode(first_name))
+        self.last_names.append(encode(last_name))
+        self.positions.append(encode(position))
+        self.at_bats.append(at_bats)
+        self.hits.append(hits)
+        if self.player_ids is not None:
+            self.player_ids.append(0)
+        self.dirty = True
+
+    def add_player(self, player):
+        """Add Player to end."""
+        self._append(player.first_name, player.last_name, player.position,
+                     player.at_bats, player.hits)
+
+    def get_player(self, number):
+        """Retrieve Player by lineup number (1-based)."""
+        index = number - 1
+        if not -len(self) <= index < len(self):
+            raise IndexError("lineup index out of range")
+        return ColumnarPlayer(self, index % len(self))
+
+    def edit_player(self, number, **fields):
+        """Change fields of the Player at lineup number (1-based)."""
+        player = self.get_player(number)
+        for name, value in fields.items():
+            setattr(player, name, value)
+        return player
+
+    def remove_player(self, number):
+        """Remove Player by lineup number (1-based)."""
+        name = self.get_player(number).full_name
+        for column in self._columns():
+            column.pop(number - 1)
+        self.dirty = True
+        return name
+
+    def move_player(self, current_number, new_number):
+        """Move Player from one position to another (1-based)."""
+        name = self.get_player(current_number).full_name
+        for column in self._columns():
+            value = column.pop(current_number - 1)
+            column.insert(new_number - 1, value)
+        self.dirty = True
+        return name
+
+    def mark_clean(self):
+        """Call after the lineup has been saved."""
+        self.dirty = False
@@ -0,0 +1,260 @@
+# optimizer.py
+# ---------------------------------------------------------
+# Batting-order optimizer (Monte Carlo)
+# - Game model driven only by Player.batting_average():
+#   every plate appearance is a hit (a single) with probability
+#   AVG, otherwise an out. On a single the runners on 2nd and
+#   3rd score and a runner on 1st goes to 2nd. 9 innings, the
+#   lineup bats in order and the first batter leads off.
+# - Common random numbers: every candidate order is played
+#   against the SAME pre-drawn games (PA k of game g always uses
+#   the same random number), so two orders are compared on
+#   identical luck and small differences are not noise.
+# - Simulation is bit-parallel: for each player, one big integer
+#   holds "would this PA be a hit" for every PA of every game.
+#   An order's hits = OR of (player bits & batting-slot bits),
+#   then the hit/out sequence is scored a byte (8 PAs) at a time
+#   with a precomputed table. No per-PA Python loop.
+# - Search: simulated annealing over swaps, finished with a
+#   swap hill-climb; independent restarts run in a process pool,
+#   each with its own seeded random stream (same seed -> same
+#   result, whatever the number of workers).
+# ---------------------------------------------------------
+
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import perf
+
+OUTS_PER_GAME = 27
+# Bits (plate appearances) per simulated game; a game that is still
+# going after MAX_PA plate appearances is cut off there
+MAX_PA = 64
+GAMES = 200
+STEPS = 2000
+RESTARTS = 4
+SEED = 1
+# Annealing temperature (runs per game), start -> end
+START_TEMP = 0.2
+END_TEMP = 0.002
+# Orders are only searched for lineups up to this size
+MAX_PLAYERS = 30
+
+# Scoring state: outs so far * 4 + bases (1 = runner on 1st,
+# 2 = on 2nd; only 0, 1 and 3 can occur). Table entries are
+# runs << 16 | next state * 256, indexed by state * 256 + byte.
+_END = OUTS_PER_GAME * 4
+_GAME_OVER = _END * 256
+_table = None
+
+
+def _byte_table():
+    """(state, 8 PAs) -> (runs, next state), built once."""
+    global _table
+
+    if _table is None:
+        table = [0] * ((_END + 1) * 256)
+
+        for state in range(_END + 1):
+            for byte in range(256):
+                outs, bases = divmod(state, 4)
+                runs = 0
+
+                for bit in range(8):
+                    if outs == OUTS_PER_GAME:
+                        break
+                    if byte >> bit & 1:
+                        # Single: 2nd (and 3rd) score, 1st -> 2nd, batter -> 1st
+                        runs += bases >> 1
+                        bases = (bases & 1) << 1 | 1
+                    else:
+                        outs += 1
+                        if outs % 3 == 0:
+                            bases = 0
+
+                table[state * 256 + byte] = runs << 16 | (outs * 4 + bases) * 256
+
+        _table = table
+
+    return _table
+
+
+def draw_games(games=GAMES, seed=SEED):
+    """The shared random numbers: games x MAX_PA uniforms in [0, 1)."""
+    rng = random.Random(seed)
+    return [rng.random() for _ in range(games * MAX_PA)]
+
+
+def hit_masks(averages, draws):
+    """
+    One integer per player: bit i is set when draw i is a hit for
+    that player (draw < AVG). Game g uses bits g * MAX_PA and up.
+    """
+    masks = []
+    for average in averages:
+        bits = "".join(["1" if u < average else "0" for u in draws])
+        masks.append(int(bits[::-1], 2) if bits else 0)
+    return masks
+
+
+def slot_masks(size, games):
+    """Bits of the plate appearances that batting slot s takes (PA % size == s)."""
+    masks = []
+    for slot in range(size):
+        game = sum(1 << pa for pa in range(slot, MAX_PA, size))
+        masks.append(int.from_bytes(game.to_bytes(MAX_PA // 8, "little") * games,
+                                    "little"))
+    return masks
+
+
+class Simulator:
+    """Runs per game of any order of a fixed roster, on fixed draws."""
+
+    def __init__(self, averages, games=GAMES, seed=SEED):
+        self.size = len(averages)
+        self.games = games
+        self.masks = hit_masks(averages, draw_games(games, seed))
+        self.slots = slot_masks(self.size, games)
+        self.table = _byte_table()
+        self.evaluations = 0
+
+    def runs(self, order):
+        """Average runs per game when the players bat in `order` (0-based indexes)."""
+        masks = self.masks
+        hits = 0
+        for player, slot in zip(order, self.slots):
+            hits |= masks[player] & slot
+
+        data = hits.to_bytes(self.games * MAX_PA // 8, "little")
+        table = self.table
+        per_game = MAX_PA // 8
+        total = 0
+
+        for start in range(0, len(data), per_game):
+            state = 0
+            for byte in data[start:start + per_game]:
+                code = table[state + byte]
+                total += code >> 16
+                state = code & 0xFFFF
+                if state == _GAME_OVER:
+                    break
+
+        self.evaluations += 1
+        return total / self.games
+
+
+def hill_climb(sim, order, runs):
+    """Best-improvement pairwise swaps until none helps. Returns (runs, order)."""
+    size = len(order)
+
+    while True:
+        best = None
+        for i in range(size - 1):
+            for j in range(i + 1, size):
+                order[i], order[j] = order[j], order[i]
+                candidate = sim.runs(order)
+                order[i], order[j] = order[j], order[i]
+                if candidate > runs:
+                    runs, best = candidate, (i, j)
+
+        if best is None:
+            return runs, order
+
+        i, j = best
+        order[i], order[j] = order[j], order[i]
+
+
+def anneal(sim, order, steps, rng):
+    """Simulated annealing over random swaps. Returns the best (runs, order) seen."""
+    order = list(order)
+    runs = sim.runs(order)
+    best_runs, best_order = runs, list(order)
+    size = len(order)
+    cooling = (END_TEMP / START_TEMP) ** (1 / max(steps, 1))
+    temp = START_TEMP
+
+    for _ in range(steps):
+        i, j = rng.sample(range(size), 2)
+        order[i], order[j] = order[j], order[i]
+        candidate = sim.runs(order)
+
+        if candidate >= runs or rng.random() < math.exp((candidate - runs) / temp):
+            runs = candidate
+            if runs > best_runs:
+                best_runs, best_order = runs, list(order)
+        else:
+            order[i], order[j] = order[j], order[i]
+
+        temp *= cooling
+
+    return best_runs, best_order
+
+
+def search(averages, restart, steps=STEPS, games=GAMES, seed=SEED):
+    """
+    One restart (runs in a worker process). Restart 0 starts from the
+    current order, the others from a shuffle.
+    Returns (runs per game, order, evaluations).
+    """
+    sim = Simulator(averages, games, seed)
+    rng = random.Random(f"{seed}:{restart}")
+
+    order = list(range(len(averages)))
+    if restart:
+        rng.shuffle(order)
+
+    runs, order = anneal(sim, order, steps, rng)
+    runs, order = hill_climb(sim, order, runs)
+    return runs, order, sim.evaluations
+
+
+@perf.timed(rows=lambda result: result[3])
+def optimize(averages, restarts=RESTARTS, workers=None, steps=STEPS,
+             games=GAMES, seed=SEED):
+    """
+    Best batting order found for players with these AVGs.
+    workers = processes (default os.cpu_count(), 1 = no pool).
+    Returns (order, runs per game, current order's runs per game, evaluations);
+    order[k] is the 0-based index of the player who should bat k+1.
+    """
+    averages = list(averages)
+    current = Simulator(averages, games, seed).runs(range(len(averages)))
+
+    if len(averages) < 2:
+        return list(range(len(averages))), current, current, 1
+
+    workers = min(workers or os.cpu_count() or 1, restarts)
+    args = [(averages, restart, steps, games, seed) for restart in range(restarts)]
+
+    if workers == 1:
+        results = [search(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(search, *zip(*args)))
+
+    # Ties go to the lowest restart, so the answer does not depend on workers
+    runs, order, _ = max(results, key=lambda r: r[0])
+    evaluations = 1 + sum(r[2] for r in results)
+    return order, runs, current, evaluations
+
+
+def apply_order(lineup, order):
+    """
+    Reorder the lineup (Lineup, ColumnarLineup or MappedLineup) with
+    move_player() so that order[k] bats k+1.
+    Returns the (current_number, new_number) moves made, e.g. for
+    db_journal.log_move().
+    """
+    current = list(range(len(lineup)))
+    moves = []
+
+    for new, player in enumerate(order):
+        old = current.index(player)
+        if old != new:
+            lineup.move_player(old + 1, new + 1)
+            current.insert(new, current.pop(old))
+            moves.append((old + 1, new + 1))
+
+    return moves
@@ -0,0 +1,192 @@
+# perf.py
+# ---------------------------------------------------------
+# Opt-in performance instrumentation
+# - @timed("name") decorator / measure("name") context manager
+# - Per operation: call count, errors, rows touched, and a
+#   latency histogram (p50/p95/p99)
+# - Off by default. Turn on with BASEBALL_PERF=1 (or enable());
+#   stats are then written to perf_stats.json at exit
+# ---------------------------------------------------------
+
+import atexit
+import functools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+ENABLED = os.environ.get("BASEBALL_PERF", "") == "1"
+DUMP_FILE = Path(os.environ.get("BASEBALL_PERF_FILE", "perf_stats.json"))
+
+# Histogram buckets grow by 2^(1/4) (~19%) starting at 1 microsecond,
+# so percentiles are accurate to about 19% with fixed memory.
+BUCKETS_PER_DOUBLING = 4
+SMALLEST = 1e-6
+
+_stats = {}
+_lock = threading.Lock()
+
+
+class OpStats:
+    """Counters and latency histogram for one operation."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = {}    # bucket number -> count
+
+    def add(self, seconds, rows, failed):
+        self.calls += 1
+        self.errors += failed
+        self.rows += rows
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+        bucket = 0
+        if seconds > SMALLEST:
+            bucket = int(math.log2(seconds / SMALLEST) * BUCKETS_PER_DOUBLING) + 1
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, pct):
+        """Upper edge (seconds) of the bucket holding the pct-th percentile."""
+        if self.calls == 0:
+            return 0.0
+
+        target = self.calls * pct / 100
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                edge = SMALLEST * 2 ** (bucket / BUCKETS_PER_DOUBLING)
+                return min(edge, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.calls * 1000, 3) if self.calls else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+
+def reset():
+    """Forget all collected stats."""
+    with _lock:
+        _stats.clear()
+
+
+def record(name, seconds, rows=0, failed=False):
+    """Add one measurement for operation `name`."""
+    with _lock:
+        op = _stats.get(name)
+        if op is None:
+            op = _stats[name] = OpStats()
+        op.add(seconds, rows, failed)
+
+
+def _count_rows(rows, result):
+    """rows can be an int, or a function of the call's result."""
+    if callable(rows):
+        try:
+            return rows(result) or 0
+        except TypeError:
+            return 0
+    return rows
+
+
+def timed(name=None, rows=0):
+    """
+    Decorator: time every call of the function (when ENABLED).
+    rows = rows touched per call: an int, or a function(result) -> int
+    (e.g. rows=len for functions that return a list).
+    """
+    def decorate(func):
+        op_name = name or f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                record(op_name, time.perf_counter() - start, 0, True)
+                raise
+            record(op_name, time.perf_counter() - start, _count_rows(rows, result))
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+class _Measurement:
+    """Handed out by measure(); set .rows inside the block."""
+
+    def __init__(self):
+        self.rows = 0
+
+
+@contextmanager
+def measure(name):
+    """
+    Context manager version of @timed:
+        with perf.measure("csv.scan") as m:
+            ...
+            m.rows = count
+    """
+    m = _Measurement()
+    if not ENABLED:
+        yield m
+        return
+
+    start = time.perf_counter()
+    try:
+        yield m
+    except BaseException:
+        record(name, time.perf_counter() - start, m.rows, True)
+        raise
+    record(name, time.perf_counter() - start, m.rows)
+
+
+def snapshot():
+    """Return {operation name: stats dict}, sorted by name."""
+    with _lock:
+        return {name: _stats[name].to_dict() for name in sorted(_stats)}
+
+
+def dump(path=None):
+    """Write snapshot() as JSON (default DUMP_FILE)."""
+    path = Path(path) if path is not None else DUMP_FILE
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(snapshot(), f, indent=2)
+
+
+@atexit.register
+def _dump_at_exit():
+    if ENABLED and _stats:
+        dump()
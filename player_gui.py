@@ -5,26 +5,245 @@
 # - Save Changes
 # - Cancel restores loaded data
 # - Position dropdown loads values from Position table
+# - Database calls run on a background thread (DBWorker)
+#   so the window never freezes on a slow/locked database
+# - Roster grid (RosterBrowser) shows one page at a time using
+#   keyset paging on batOrder, with incremental name search
 # ---------------------------------------------------------
 
+import queue
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import messagebox, ttk
 import db_sqlite
 
 
+class DBWorker:
+    """
+    Runs db_sqlite calls off the Tk main loop.
+    - One background thread, so database work is serialized
+    - Results are handed back to the Tk thread by polling with root.after()
+    - submit_latest() coalesces repeated requests (only the newest runs)
+    - on_busy(True/False) is called when work starts/finishes
+    """
+
+    POLL_MS = 30
+
+    def __init__(self, root, on_busy=None):
+        self.root = root
+        self.on_busy = on_busy
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+        self.results = queue.SimpleQueue()
+        self.running = 0
+        self.latest = {}        # key -> newest waiting (func, args, on_done)
+        self.in_flight = set()  # keys with a call currently running
+        self.root.after(self.POLL_MS, self._poll)
+
+    def submit(self, func, *args, on_done=None, key=None):
+        """Run func(*args) in the background; on_done(result) runs on the Tk thread."""
+        if self.running == 0 and self.on_busy:
+            self.on_busy(True)
+        self.running += 1
+
+        future = self.executor.submit(func, *args)
+        future.add_done_callback(
+            lambda f: self.results.put((f, on_done, key))
+        )
+
+    def submit_latest(self, key, func, *args, on_done=None):
+        """
+        Like submit(), but while a call with the same key is running,
+        newer requests replace each other and only the last one runs next.
+        Results of superseded calls are dropped.
+        """
+        if key in self.in_flight:
+            self.latest[key] = (func, args, on_done)
+            return
+
+        self.in_flight.add(key)
+        self.submit(func, *args, on_done=on_done, key=key)
+
+    def _poll(self):
+        """Deliver finished results on the Tk thread."""
+        while True:
+            try:
+                future, on_done, key = self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            self.running -= 1
+            superseded = False
+
+            if key is not None:
+                self.in_flight.discard(key)
+                waiting = self.latest.pop(key, None)
+                if waiting is not None:
+                    superseded = True
+                    func, args, next_done = waiting
+                    self.submit_latest(key, func, *args, on_done=next_done)
+
+            if not superseded:
+                self._deliver(future, on_done)
+
+            if self.running == 0 and self.on_busy:
+                self.on_busy(False)
+
+        self.root.after(self.POLL_MS, self._poll)
+
+    @staticmethod
+    def _deliver(future, on_done):
+        error = future.exception()
+        if error is not None:
+            messagebox.showerror("Database Error", str(error))
+        elif on_done is not None:
+            on_done(future.result())
+
+    def shutdown(self):
+        """Stop the worker thread (queued calls that did not start are dropped)."""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+class RosterBrowser:
+    """
+    Paged roster grid (ttk.Treeview) for very large Player tables.
+    Only ONE page (PAGE_ROWS rows) is ever fetched and rendered:
+    Next/Prev use keyset paging on batOrder, so every page costs
+    the same no matter how big the table is.
+    Typing in the search box filters by name (after a short pause).
+    """
+
+    PAGE_ROWS = 15
+    SEARCH_DELAY_MS = 250
+
+    COLUMNS = (
+        ("id", "ID", 50),
+        ("order", "Order", 55),
+        ("first", "First Name", 110),
+        ("last", "Last Name", 130),
+        ("pos", "POS", 45),
+        ("ab", "AB", 60),
+        ("h", "H", 60),
+    )
+
+    def __init__(self, parent, worker, on_select):
+        self.worker = worker
+        self.on_select = on_select
+        self.rows = []          # rows on the current page
+        self.search_job = None  # pending after() id for the search box
+
+        self.frame = tk.Frame(parent)
+
+        # Search box + paging buttons
+        bar = tk.Frame(self.frame)
+        bar.pack(fill="x", pady=(0, 5))
+
+        tk.Label(bar, text="Search name:").pack(side="left")
+        self.search_text = tk.StringVar()
+        self.search_text.trace_add("write", self._search_changed)
+        tk.Entry(bar, textvariable=self.search_text, width=20).pack(side="left", padx=5)
+
+        tk.Button(bar, text="Next ▶", command=self.next_page).pack(side="right")
+        tk.Button(bar, text="◀ Prev", command=self.prev_page).pack(side="right", padx=5)
+        tk.Button(bar, text="First", command=self.first_page).pack(side="right")
+
+        # Grid with exactly PAGE_ROWS visible rows
+        self.tree = ttk.Treeview(self.frame, columns=[c[0] for c in self.COLUMNS],
+                                 show="headings", height=self.PAGE_ROWS,
+                                 selectmode="browse")
+        for column, heading, width in self.COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor="w")
+        self.tree.pack(fill="both", expand=True)
+
+        self.tree.bind("<Double-1>", self._row_chosen)
+        self.tree.bind("<Return>", self._row_chosen)
+        self.tree.bind("<MouseWheel>", self._wheel)      # Windows / macOS
+        self.tree.bind("<Button-4>", lambda e: self.prev_page())  # Linux
+        self.tree.bind("<Button-5>", lambda e: self.next_page())
+
+    def grid(self, **options):
+        self.frame.grid(**options)
+
+    # ---------- paging ----------
+
+    def _fetch(self, func, *args):
+        """Fetch one page in the background (newest request wins)."""
+        name = self.search_text.get().strip() or None
+        self.worker.submit_latest("roster_page", func, *args,
+                                  RosterBrowser.PAGE_ROWS, name,
+                                  on_done=self._show)
+
+    def first_page(self):
+        self._fetch(db_sqlite.get_players_page, 0)
+
+    def next_page(self):
+        after = self.rows[-1][1] if self.rows else 0
+        self._fetch(db_sqlite.get_players_page, after)
+
+    def prev_page(self):
+        if self.rows:
+            self._fetch(db_sqlite.get_players_page_before, self.rows[0][1])
+
+    def refresh(self):
+        """Reload the current page (e.g. after a save)."""
+        after = self.rows[0][1] - 1 if self.rows else 0
+        self._fetch(db_sqlite.get_players_page, after)
+
+    def _show(self, rows):
+        """Render a page (runs on the Tk thread)."""
+        # Past the first/last page: keep what is on screen
+        if not rows and self.rows:
+            return
+
+        self.rows = rows
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            self.tree.insert("", tk.END, iid=str(row[0]), values=row)
+
+    # ---------- events ----------
+
+    def _search_changed(self, *_):
+        """Restart the search timer on every keystroke."""
+        root = self.frame.winfo_toplevel()
+        if self.search_job is not None:
+            root.after_cancel(self.search_job)
+        self.search_job = root.after(self.SEARCH_DELAY_MS, self._search)
+
+    def _search(self):
+        self.search_job = None
+        self.rows = []
+        self.first_page()
+
+    def _wheel(self, event):
+        if event.delta > 0:
+            self.prev_page()
+        else:
+            self.next_page()
+
+    def _row_chosen(self, _event):
+        selected = self.tree.selection()
+        if selected:
+            self.on_select(int(selected[0]))
+
+
 def main():
     # Create main window
     root = tk.Tk()
     root.title("Player Maintenance")
-    root.geometry("420x300")
+    root.geometry("560x640")
 
     # Store the last player loaded from the database
     # Format:
     # (playerID, batOrder, firstName, lastName, position, atBats, hits)
     current_player = None
 
-    # Load valid positions from the Position table
-    positions = db_sqlite.get_positions()
+    def set_busy(busy):
+        """Show a busy cursor/status while the database is working."""
+        root.config(cursor="watch" if busy else "")
+        label_status.config(text="Working..." if busy else "")
+        btn_save.config(state="disabled" if busy else "normal")
+
+    worker = DBWorker(root, on_busy=set_busy)
 
     def clear_fields():
         """Clear all entry fields except player ID."""
@@ -36,8 +255,6 @@ def main():
 
     def get_player():
         """Fetch player by ID and display data in entry boxes."""
-        nonlocal current_player
-
         player_id_text = entry_id.get().strip()
 
         # Validate player ID input
@@ -51,7 +268,13 @@ def main():
             messagebox.showerror("Error", "Player ID must be an integer.")
             return
 
-        player = db_sqlite.get_player(player_id)
+        # Rapid repeated clicks are coalesced: only the newest ID is fetched
+        worker.submit_latest("get_player", db_sqlite.get_player, player_id,
+                             on_done=show_player)
+
+    def show_player(player):
+        """Display a fetched player (runs on the Tk thread)."""
+        nonlocal current_player
 
         # If player not found, show error and clear fields
         if player is None:
@@ -101,15 +324,22 @@ def main():
         last_name = entry_last.get().strip()
         position = entry_position.get().strip()
 
-        # Save all editable fields
-        db_sqlite.update_player(player_id, first_name, last_name, position, at_bats, hits)
+        def saved(_):
+            """Runs on the Tk thread once the update is committed."""
+            nonlocal current_player
 
-        # Update current_player snapshot to match saved values
-        current_player = (player_id, None, first_name, last_name, position, at_bats, hits)
+            # Update current_player snapshot to match saved values
+            current_player = (player_id, None, first_name, last_name, position, at_bats, hits)
 
-        messagebox.showinfo("Success", "Player updated successfully.")
-        clear_fields()
-        entry_id.delete(0, tk.END)
+            messagebox.showinfo("Success", "Player updated successfully.")
+            clear_fields()
+            entry_id.delete(0, tk.END)
+            roster.refresh()
+
+        # Save all editable fields (in the background)
+        worker.submit(db_sqlite.update_player,
+                      player_id, first_name, last_name, position, at_bats, hits,
+                      on_done=saved)
 
     def cancel_changes():
         """Restore the last loaded player data into the entry fields."""
@@ -155,7 +385,7 @@ def main():
 
     # Position (dropdown from Position table)
     tk.Label(root, text="Position:").grid(row=3, column=0, padx=10, pady=5, sticky="e")
-    entry_position = ttk.Combobox(root, values=positions, state="readonly")
+    entry_position = ttk.Combobox(root, values=[], state="readonly")
     entry_position.grid(row=3, column=1, padx=10, pady=5)
 
     # At Bats
@@ -180,6 +410,32 @@ def main():
     btn_cancel = tk.Button(frame_buttons, text="Cancel", command=cancel_changes)
     btn_cancel.pack(side="left", padx=10)
 
+    # Busy/status text
+    label_status = tk.Label(root, text="", fg="gray")
+    label_status.grid(row=7, column=0, columnspan=3)
+
+    def select_player(player_id):
+        """Load the player double-clicked in the roster grid."""
+        entry_id.delete(0, tk.END)
+        entry_id.insert(0, player_id)
+        get_player()
+
+    # Roster grid (one page at a time)
+    roster = RosterBrowser(root, worker, on_select=select_player)
+    roster.grid(row=8, column=0, columnspan=3, padx=10, pady=10, sticky="nsew")
+    root.grid_rowconfigure(8, weight=1)
+    roster.first_page()
+
+    # Load valid positions from the Position table (in the background)
+    worker.submit(db_sqlite.get_positions,
+                  on_done=lambda positions: entry_position.config(values=positions))
+
+    def close_window():
+        worker.shutdown()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", close_window)
+
     # Start GUI loop
     root.mainloop()
 
@@ -0,0 +1,492 @@
+# server.py
+# ---------------------------------------------------------
+# HTTP/JSON API over the SQLite roster (db_sqlite.py):
+#   python server.py [--host 127.0.0.1] [--port 8080] [--readers 4]
+#
+#   GET    /players                 ?team=&season=  (whole lineup)
+#   GET    /players?after=N&limit=L&name=TEXT       (keyset page)
+#   GET    /players/ID              ?team=
+#   POST   /players                 {"first_name", "last_name", "position",
+#                                    "at_bats", "hits"[, "bat_order"]}
+#   PUT    /players/ID              same fields (all required)
+#   DELETE /players/ID
+#   POST   /players/ID/move         {"bat_order": N}
+#   GET    /leaders                 ?limit=&min_at_bats=&team=&season=
+#   GET    /positions, /positions/summary, /teams
+#   (team/season go in the query string for writes too)
+#
+# - asyncio event loop handles the connections (HTTP/1.1 keep-alive)
+# - Reads run on a pool of READERS threads; each thread keeps its
+#   own WAL-mode connection (db_sqlite's per-thread pool), so reads
+#   run side by side and never wait for a writer
+# - Writes go through ONE queue drained by ONE writer thread,
+#   so they are serialized and never fight over the write lock
+# - Every GET response carries an ETag (hash of the body); a
+#   request with a matching If-None-Match gets 304 and no body
+# ---------------------------------------------------------
+
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qsl, unquote
+
+import db_sqlite
+import perf
+
+HOST = "127.0.0.1"
+PORT = 8080
+
+# Read threads (= pooled read connections)
+READERS = 4
+
+# Writes waiting in the queue before new ones have to wait
+WRITE_QUEUE = 1000
+
+# Request limits
+MAX_HEADER = 16 * 1024
+MAX_BODY = 64 * 1024
+MAX_PAGE = 1000
+
+# Integers must fit SQLite's 64-bit INTEGER
+MIN_INT = -2 ** 63
+MAX_INT = 2 ** 63 - 1
+
+
+class HTTPError(Exception):
+    """Error with an HTTP status (the message goes back as JSON)."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ----- request helpers (run on the reader/writer threads) -----
+
+def _text(source, name, default=None):
+    value = source.get(name, default)
+    if value is None:
+        raise ValueError(f"Missing field: {name}")
+    return str(value).strip()
+
+
+def _int(source, name, default=None):
+    value = source.get(name, default)
+    if value is None:
+        raise ValueError(f"Missing field: {name}")
+    try:
+        value = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"Invalid integer: {name}") from None
+    if not MIN_INT <= value <= MAX_INT:
+        raise ValueError(f"Integer out of range: {name}")
+    return value
+
+
+def _limit(params, default):
+    """Page size from the query string, clamped to 1..MAX_PAGE."""
+    return max(1, min(_int(params, "limit", default), MAX_PAGE))
+
+
+def _scope(params):
+    """(team, season) from the query string."""
+    return (_text(params, "team", db_sqlite.DEFAULT_TEAM),
+            _int(params, "season", db_sqlite.DEFAULT_SEASON))
+
+
+def _player_fields(data):
+    """Validated (first, last, position, at_bats, hits), same rules as the apps."""
+    first_name = _text(data, "first_name")
+    last_name = _text(data, "last_name")
+    position = _text(data, "position").upper()
+    at_bats = _int(data, "at_bats")
+    hits = _int(data, "hits")
+
+    positions = db_sqlite.get_positions()
+    if positions and position not in positions:
+        raise ValueError("Invalid position.")
+    if at_bats < 0 or hits < 0:
+        raise ValueError("At bats and hits cannot be negative.")
+    if hits > at_bats:
+        raise ValueError("Hits cannot be greater than at bats.")
+
+    return first_name, last_name, position, at_bats, hits
+
+
+def _player(row):
+    """Player row (playerID, batOrder, first, last, pos, AB, H[, avg]) -> dict."""
+    player_id, bat_order, first_name, last_name, position, at_bats, hits = row[:7]
+    at_bats = at_bats or 0
+    hits = hits or 0
+    return {
+        "id": player_id,
+        "bat_order": bat_order,
+        "first_name": first_name,
+        "last_name": last_name,
+        "position": position,
+        "at_bats": at_bats,
+        "hits": hits,
+        "avg": round(hits / at_bats, 3) if at_bats else 0.0,
+    }
+
+
+def _player_id(player_id):
+    """playerID from the URL; one too large for SQLite cannot exist."""
+    player_id = int(player_id)
+    if player_id > MAX_INT:
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"Player {player_id} not found.")
+    return player_id
+
+
+def _existing(player_id, team):
+    row = db_sqlite.get_player(player_id, team)
+    if row is None:
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"Player {player_id} not found.")
+    return row
+
+
+# ----- routes: handler(params, data, *url groups) -> (status, payload) -----
+
+def list_players(params, data):
+    team, season = _scope(params)
+
+    if "after" in params or "limit" in params or "name" in params:
+        rows = db_sqlite.get_players_page(_int(params, "after", 0),
+                                          _limit(params, db_sqlite.PAGE_SIZE),
+                                          params.get("name"), team, season)
+    else:
+        rows = db_sqlite.get_all_players(team, season)
+
+    return HTTPStatus.OK, [_player(row) for row in rows]
+
+
+def show_player(params, data, player_id):
+    team, _ = _scope(params)
+    return HTTPStatus.OK, _player(_existing(_player_id(player_id), team))
+
+
+def create_player(params, data):
+    team, season = _scope(params)
+    fields = _player_fields(data)
+
+    bat_order = data.get("bat_order")
+    if bat_order is None:
+        bat_order = db_sqlite.next_bat_order(team, season)
+    else:
+        bat_order = _int(data, "bat_order")
+        if bat_order < 1:
+            raise ValueError("Batting order must be 1 or higher.")
+
+    try:
+        player_id = db_sqlite.add_player(bat_order, *fields, team=team, season=season)
+    except sqlite3.IntegrityError:
+        raise HTTPError(HTTPStatus.CONFLICT,
+                        f"Batting order {bat_order} is already taken.") from None
+
+    return HTTPStatus.CREATED, _player(db_sqlite.get_player(player_id, team))
+
+
+def change_player(params, data, player_id):
+    team, _ = _scope(params)
+    player_id = _player_id(player_id)
+    _existing(player_id, team)
+
+    db_sqlite.update_player(player_id, *_player_fields(data), team=team)
+    return HTTPStatus.OK, _player(db_sqlite.get_player(player_id, team))
+
+
+def remove_player(params, data, player_id):
+    team, _ = _scope(params)
+    player_id = _player_id(player_id)
+    _existing(player_id, team)
+
+    db_sqlite.delete_player(player_id, team)
+    return HTTPStatus.OK, {"deleted": player_id}
+
+
+def move_player(params, data, player_id):
+    team, _ = _scope(params)
+    player_id = _player_id(player_id)
+    _existing(player_id, team)
+
+    db_sqlite.move_player(player_id, _int(data, "bat_order"), team)
+    return HTTPStatus.OK, _player(db_sqlite.get_player(player_id, team))
+
+
+def leaders(params, data):
+    team, season = _scope(params)
+    rows = db_sqlite.get_leaders(_limit(params, 10),
+                                 _int(params, "min_at_bats", 0), team, season)
+    return HTTPStatus.OK, [_player(row) for row in rows]
+
+
+def positions(params, data):
+    return HTTPStatus.OK, db_sqlite.get_positions()
+
+
+def position_summary(params, data):
+    team, season = _scope(params)
+    return HTTPStatus.OK, [
+        {"position": position, "players": players, "at_bats": at_bats,
+         "hits": hits, "avg": avg}
+        for position, players, at_bats, hits, avg
+        in db_sqlite.get_position_summary(team, season)
+    ]
+
+
+def teams(params, data):
+    return HTTPStatus.OK, [
+        {"team": team, "season": season, "players": players}
+        for team, season, players in db_sqlite.get_teams()
+    ]
+
+
+# (method, path pattern, handler, is a write)
+ROUTES = [
+    ("GET", re.compile(r"/players"), list_players, False),
+    ("POST", re.compile(r"/players"), create_player, True),
+    ("GET", re.compile(r"/players/(\d+)"), show_player, False),
+    ("PUT", re.compile(r"/players/(\d+)"), change_player, True),
+    ("DELETE", re.compile(r"/players/(\d+)"), remove_player, True),
+    ("POST", re.compile(r"/players/(\d+)/move"), move_player, True),
+    ("GET", re.compile(r"/leaders"), leaders, False),
+    ("GET", re.compile(r"/positions"), positions, False),
+    ("GET", re.compile(r"/positions/summary"), position_summary, False),
+    ("GET", re.compile(r"/teams"), teams, False),
+]
+
+
+def route(method, path):
+    """(handler, url groups, is a write) for a request; raises HTTPError 404/405."""
+    allowed = []
+    for route_method, pattern, handler, write in ROUTES:
+        match = pattern.fullmatch(path)
+        if match:
+            if route_method == method:
+                return handler, match.groups(), write
+            allowed.append(route_method)
+
+    if allowed:
+        raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"Use {', '.join(allowed)}.")
+    raise HTTPError(HTTPStatus.NOT_FOUND, f"No such resource: {path}")
+
+
+def _json(payload):
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def call(handler, params, data, groups):
+    """Run a handler (on a reader/writer thread) -> (status, JSON body bytes)."""
+    try:
+        with perf.measure(f"server.{handler.__name__}"):
+            status, payload = handler(params, data, *groups)
+    except HTTPError as e:
+        status, payload = e.status, {"error": str(e)}
+    except ValueError as e:
+        status, payload = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+    except OverflowError:
+        status, payload = HTTPStatus.BAD_REQUEST, {"error": "Number out of range."}
+    except sqlite3.Error as e:
+        status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+    except Exception as e:
+        # Any other bug still answers with JSON (and keeps the connection)
+        status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {
+            "error": f"Internal error: {type(e).__name__}"}
+
+    return status, _json(payload)
+
+
+def etag(body):
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _matches(if_none_match, tag):
+    """True if an If-None-Match header value covers this ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(t.strip().removeprefix("W/") == tag for t in if_none_match.split(","))
+
+
+class Server:
+    """The API server: reader pool + writer queue around an asyncio listener."""
+
+    def __init__(self, readers=READERS):
+        self.readers = ThreadPoolExecutor(max_workers=readers,
+                                          thread_name_prefix="db-read")
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+        self.writes = None
+        self.requests = 0
+
+    async def run_write(self, handler, params, data, groups):
+        """Queue a write for the writer task; wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        await self.writes.put((handler, params, data, groups, future))
+        return await future
+
+    async def write_loop(self):
+        """The single writer: runs queued writes one at a time, in order."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            handler, params, data, groups, future = await self.writes.get()
+            try:
+                result = await loop.run_in_executor(
+                    self.writer, call, handler, params, data, groups)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+
+    async def respond(self, method, target, headers, body):
+        """One request -> (status, extra headers, body bytes)."""
+        path, _, query = target.partition("?")
+        params = dict(parse_qsl(query))
+
+        try:
+            handler, groups, write = route(method, unquote(path))
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object.")
+        except HTTPError as e:
+            return e.status, {}, _json({"error": str(e)})
+        except (ValueError, RecursionError):
+            # RecursionError: JSON nested too deeply to parse
+            return HTTPStatus.BAD_REQUEST, {}, _json({"error": "Invalid JSON body."})
+
+        if write:
+            status, body = await self.run_write(handler, params, data, groups)
+            return status, {}, body
+
+        loop = asyncio.get_running_loop()
+        status, body = await loop.run_in_executor(
+            self.readers, call, handler, params, data, groups)
+
+        if status != HTTPStatus.OK:
+            return status, {}, body
+
+        tag = etag(body)
+        extra = {"ETag": tag, "Cache-Control": "no-cache"}
+        if _matches(headers.get("if-none-match", ""), tag):
+            return HTTPStatus.NOT_MODIFIED, extra, b""
+        return status, extra, body
+
+    async def handle(self, reader, writer):
+        """One client connection (keep-alive: many requests)."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.LimitOverrunError:
+                    # Request line + headers longer than MAX_HEADER
+                    await self.send(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {},
+                                    _json({"error": "Headers too large."}), False)
+                    return
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+
+                request_line, *lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ")
+                    headers = {}
+                    for line in lines:
+                        if line:
+                            name, value = line.split(":", 1)
+                            headers[name.strip().lower()] = value.strip()
+                    length = int(headers.get("content-length", 0))
+                    if length < 0:
+                        raise ValueError("negative Content-Length")
+                except ValueError:
+                    await self.send(writer, HTTPStatus.BAD_REQUEST, {},
+                                    _json({"error": "Bad request."}), False)
+                    return
+
+                if length > MAX_BODY:
+                    await self.send(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {},
+                                    _json({"error": "Body too large."}), False)
+                    return
+
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = (version == "HTTP/1.1"
+                              and headers.get("connection", "").lower() != "close")
+
+                status, extra, body = await self.respond(method, target, headers, body)
+                self.requests += 1
+                await self.send(writer, status, extra, body, keep_alive)
+
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def send(writer, status, extra, body, keep_alive):
+        head = [f"HTTP/1.1 {status.value} {status.phrase}",
+                f"Content-Length: {len(body)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if body:
+            head.append("Content-Type: application/json")
+        head.extend(f"{name}: {value}" for name, value in extra.items())
+
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def serve(self, host=HOST, port=PORT, ready=None):
+        """
+        Listen until cancelled. ready(port) is called once listening
+        (useful with port=0, which picks a free port).
+        """
+        # Creates the tables/indexes once, on the writer's connection
+        await asyncio.get_running_loop().run_in_executor(
+            self.writer, db_sqlite.create_tables)
+
+        self.writes = asyncio.Queue(WRITE_QUEUE)
+        write_task = asyncio.create_task(self.write_loop())
+
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER)
+        port = server.sockets[0].getsockname()[1]
+        if ready:
+            ready(port)
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            write_task.cancel()
+            self.readers.shutdown()
+            self.writer.shutdown()
+            db_sqlite.close_connections()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Baseball roster HTTP/JSON API")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT, help="0 = any free port")
+    parser.add_argument("--readers", type=int, default=READERS,
+                        help="read threads (pooled read connections)")
+    parser.add_argument("--db", default=db_sqlite.DB_FILE, help="SQLite database file")
+    args = parser.parse_args(argv)
+
+    db_sqlite.DB_FILE = args.db
+    # Readers never block the writer (and vice versa) in WAL mode
+    db_sqlite.PRAGMAS["journal_mode"] = "WAL"
+
+    def ready(port):
+        print(f"Serving http://{args.host}:{port} ({args.readers} readers)", flush=True)
+
+    try:
+        asyncio.run(Server(args.readers).serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
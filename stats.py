@@ -0,0 +1,154 @@
+# stats.py
+# ---------------------------------------------------------
+# Whole-roster batting statistics
+# - Works on a Lineup, a ColumnarLineup, or db_sqlite rows
+# - Pulls at-bats/hits into two columns once, then every
+#   statistic is a single pass over those columns
+# - The passes run in C (map/compress/heapq/sum over the arrays);
+#   Python code only touches the few top-N candidates
+# - Zero at-bats -> 0.0, exactly like Player.batting_average()
+# ---------------------------------------------------------
+
+import heapq
+import statistics
+from array import array
+from itertools import compress
+from operator import attrgetter, itemgetter, truediv
+
+from objects import ColumnarLineup
+
+# db_sqlite row layout:
+# (playerID, batOrder, firstName, lastName, position, atBats, hits)
+ROW_AT_BATS = 5
+ROW_HITS = 6
+
+# AVG is rounded to this many decimals (as in Player.batting_average())
+DIGITS = 3
+
+# A rounded AVG of r comes from an exact ratio of at least r - ROUND_SLACK
+ROUND_SLACK = 0.5 * 10 ** -DIGITS + 1e-9
+
+
+def columns(source):
+    """
+    Return (at_bats, hits) columns for a Lineup, ColumnarLineup,
+    or a list of db_sqlite rows (NULL stats count as 0).
+    """
+    if isinstance(source, ColumnarLineup):
+        return source.at_bats, source.hits
+
+    items = list(source)
+    if items and isinstance(items[0], tuple):
+        get_at_bats, get_hits = itemgetter(ROW_AT_BATS), itemgetter(ROW_HITS)
+        at_bats = array("q", [ab or 0 for ab in map(get_at_bats, items)])
+        hits = array("q", [h or 0 for h in map(get_hits, items)])
+    else:
+        at_bats = array("q", map(attrgetter("at_bats"), items))
+        hits = array("q", map(attrgetter("hits"), items))
+
+    return at_bats, hits
+
+
+def batting_averages(at_bats, hits):
+    """AVG for every player (rounded to 3 decimals, 0.0 when AB = 0)."""
+    return [round(h / ab, 3) if ab else 0.0 for ab, h in zip(at_bats, hits)]
+
+
+def league_average(at_bats, hits):
+    """Team/league AVG = total hits / total at-bats (0.0 when no at-bats)."""
+    total_ab = sum(at_bats)
+    if total_ab == 0:
+        return 0.0
+    return round(sum(hits) / total_ab, 3)
+
+
+def qualified(at_bats, min_at_bats):
+    """Indexes (0-based) of players with at least min_at_bats."""
+    return [i for i, ab in enumerate(at_bats) if ab >= min_at_bats]
+
+
+def percentiles(values, points=(10, 25, 50, 75, 90)):
+    """
+    Return {percentile: value} for percentiles 1-99 (linear interpolation).
+    """
+    values = list(values)
+    if len(values) < 2:
+        only = values[0] if values else 0.0
+        return {p: only for p in points}
+
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {p: round(cuts[p - 1], 3) for p in points}
+
+
+def z_scores(values):
+    """Standard score of each value (all 0.0 if there is no spread)."""
+    values = list(values)
+    if not values:
+        return []
+
+    mean = statistics.fmean(values)
+    spread = statistics.pstdev(values, mean)
+    if spread == 0:
+        return [0.0] * len(values)
+
+    return [(v - mean) / spread for v in values]
+
+
+def rank(at_bats, hits, n=10, min_at_bats=0):
+    """
+    Best n hitters by AVG among players with at least min_at_bats.
+    Returns (lineup number, AVG) pairs, best first
+    (ties: more at-bats first, then earlier in the lineup).
+    Exact ratios are computed and ranked in C; only players whose
+    ROUNDED AVG can still make the top n get a Python-level key.
+    """
+    if n <= 0:
+        return []
+
+    # Players with at-bats (zero-AB players are handled at the end)
+    keep = list(map(max(min_at_bats, 1).__le__, at_bats))
+    numbers = list(compress(range(1, len(at_bats) + 1), keep))
+    kept_at_bats = list(compress(at_bats, keep))
+    ratios = list(map(truediv, compress(hits, keep), kept_at_bats))
+
+    best = []
+    if ratios:
+        cutoff = round(heapq.nlargest(n, ratios)[-1], DIGITS) - ROUND_SLACK
+        best = heapq.nlargest(n, (
+            (round(ratios[j], DIGITS), kept_at_bats[j], -numbers[j])
+            for j in compress(range(len(ratios)), map(cutoff.__le__, ratios))
+        ))
+
+    result = [(-number, avg) for avg, _, number in best]
+
+    # AVG 0.0 with 0 AB ranks after everyone with at-bats
+    if len(result) < n and min_at_bats <= 0:
+        zero = compress(range(1, len(at_bats) + 1), map((0).__eq__, at_bats))
+        result.extend((number, 0.0) for _, number in zip(range(n - len(result)), zero))
+
+    return result
+
+
+def top_n(source, n=10, min_at_bats=0):
+    """rank() for a Lineup, ColumnarLineup or db_sqlite rows."""
+    return rank(*columns(source), n, min_at_bats)
+
+
+def summary(source, min_at_bats=0):
+    """
+    Roster summary as a dict:
+    players, qualified, league_avg, mean_avg, stdev_avg, percentiles
+    (mean/stdev/percentiles use qualified players only).
+    """
+    at_bats, hits = columns(source)
+    avgs = batting_averages(at_bats, hits)
+    picked = [avgs[i] for i in qualified(at_bats, min_at_bats)]
+
+    return {
+        "players": len(avgs),
+        "qualified": len(picked),
+        "league_avg": league_average(at_bats, hits),
+        "mean_avg": round(statistics.fmean(picked), 3) if picked else 0.0,
+        "stdev_avg": round(statistics.pstdev(picked), 3) if picked else 0.0,
+        "percentiles": percentiles(picked),
+    }
@@ -8,7 +8,11 @@
 # Keeps main.py clean.
 # ---------------------------------------------------------
 
+import heapq
+import sys
 from datetime import date
+from itertools import islice
+from operator import attrgetter, itemgetter
 
 POSITIONS = ("C", "1B", "2B", "3B", "SS", "LF", "CF", "RF", "P")
 
@@ -59,32 +63,132 @@ def display_menu(game_date):
     print("5 - Edit player position")
     print("6 - Edit player stats")
     print("7 - Exit program")
+    print("8 - Show performance stats")
+    print("9 - Suggest batting order")
 
     print("POSITIONS")
     print(", ".join(POSITIONS))
     print("=" * 64)
 
 
-def display(lineup_dicts):
-    """Display lineup in table format."""
+# Rows per sys.stdout.write() in display()
+DISPLAY_CHUNK = 10_000
+
+# One display() row: same text as f"{i:<4}{name:<20}{pos:<6}{ab:<6}{h:<6}{avg:<6.3f}"
+# (%-formatting is faster; "%.3f" rounds exactly like round(avg, 3))
+_ROW = "%-4d%-20s%-6s%-6d%-6d%-6.3f\n"
+
+_POSITION_RANK = {pos: rank for rank, pos in enumerate(POSITIONS)}
+
+# display(sort=...) keys -> (row key, largest first?)
+# rows are (number, first, last, position, at_bats, hits);
+# AVG ties go to more at bats, like db_sqlite.get_leaders()
+SORT_KEYS = {
+    "avg": (lambda r: (round(r[5] / r[4], 3) if r[4] else 0.0, r[4]), True),
+    "ab": (itemgetter(4), True),
+    "position": (lambda r: _POSITION_RANK.get(r[3], len(POSITIONS)), False),
+}
+
+_PLAYER_FIELDS = attrgetter("first_name", "last_name", "position", "at_bats", "hits")
+_DICT_FIELDS = itemgetter("first_name", "last_name", "position", "at_bats", "hits")
+
+
+def _rows(players):
+    """Player objects or player dicts -> (number, first, last, pos, ab, hits)."""
+    players = iter(players)
+    first = next(players, None)
+    if first is None:
+        return
+
+    fields = _DICT_FIELDS if isinstance(first, dict) else _PLAYER_FIELDS
+    yield (1, *fields(first))
+    for number, player in enumerate(players, 2):
+        yield (number, *fields(player))
+
+
+def _select(rows, sort, limit, offset):
+    """Apply sort (a SORT_KEYS name), offset and limit to the rows."""
+    if sort is None:
+        stop = None if limit is None else offset + limit
+        return islice(rows, offset, stop)
+
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {sort}")
+    key, largest = SORT_KEYS[sort]
+
+    # One page needs only the top offset + limit rows; ties keep lineup order
+    if limit is None:
+        rows = sorted(rows, key=key, reverse=largest)
+    elif largest:
+        rows = heapq.nlargest(offset + limit, rows, key=key)
+    else:
+        rows = heapq.nsmallest(offset + limit, rows, key=key)
+    return islice(rows, offset, None)
+
+
+def display(players, sort=None, limit=None, offset=0):
+    """
+    Display lineup in table format.
+    players = a Lineup (any lineup class) or player dicts.
+    sort = None (lineup order), "avg", "ab" or "position"; then
+    offset/limit pick one page. "No" is always the lineup number.
+    Rows are formatted in bulk and written DISPLAY_CHUNK at a time.
+    """
+    out = sys.stdout
+    out.write("\n" + "=" * 64 + "\n"
+              f"{'No':<4}{'Player':<20}{'POS':<6}{'AB':<6}{'H':<6}{'AVG':<6}\n"
+              + "=" * 64 + "\n")
+
+    rows = _select(_rows(players), sort, limit, offset)
+    while True:
+        chunk = list(islice(rows, DISPLAY_CHUNK))
+        if not chunk:
+            break
+
+        out.write("".join([
+            _ROW % (i, f"{first} {last}".strip(), pos, ab, hits,
+                    hits / ab if ab else 0.0)
+            for i, first, last, pos, ab, hits in chunk
+        ]))
+
+    out.write("=" * 64 + "\n")
+
+
+def display_order(names, current_runs, best_runs):
+    """Display a suggested batting order (names in batting order)."""
     print("\n" + "=" * 64)
-    print(f"{'No':<4}{'Player':<20}{'POS':<6}{'AB':<6}{'H':<6}{'AVG':<6}")
+    print(f"{'No':<4}{'Player':<20}")
     print("=" * 64)
 
-    for i, p in enumerate(lineup_dicts, 1):
-        name = f"{p['first_name']} {p['last_name']}".strip()
+    for i, name in enumerate(names, 1):
+        print(f"{i:<4}{name:<20}")
+
+    print("=" * 64)
+    print(f"Current order:   {current_runs:.2f} runs/game (simulated)")
+    print(f"Suggested order: {best_runs:.2f} runs/game (simulated)")
 
-        ab = p["at_bats"]
-        hits = p["hits"]
-        avg = 0.0 if ab == 0 else round(hits / ab, 3)
 
+def display_stats(stats, enabled=True):
+    """Display perf.snapshot() results (one row per operation)."""
+    print("\n" + "=" * 64)
+
+    if not enabled:
+        print("Performance stats are off.")
+        print("Start the program with BASEBALL_PERF=1 to collect them.")
+        print("=" * 64)
+        return
+
+    print(f"{'Operation':<28}{'Calls':>7}{'Rows':>9}{'p50ms':>7}{'p95ms':>7}{'p99ms':>7}")
+    print("=" * 64)
+
+    for name, s in stats.items():
         print(
-            f"{i:<4}"
-            f"{name:<20}"
-            f"{p['position']:<6}"
-            f"{ab:<6}"
-            f"{hits:<6}"
-            f"{avg:<6.3f}"
+            f"{name[-28:]:<28}"
+            f"{s['calls']:>7}"
+            f"{s['rows']:>9}"
+            f"{s['p50_ms']:>7.2f}"
+            f"{s['p95_ms']:>7.2f}"
+            f"{s['p99_ms']:>7.2f}"
         )
 
-    print("=" * 64)
\ No newline at end of file
+    print("=" * 64)
@@ -0,0 +1,61 @@
+# write_behind.py
+# ---------------------------------------------------------
+# Debounced write-behind saving.
+# - mark() after each change; the first mark opens a window of
+#   `delay` seconds
+# - when the window ends, save() runs ONCE (on a timer thread)
+#   for every change made during it
+# - hold `lock` while changing the data, so a save never runs in
+#   the middle of a change
+# - flush() saves right away if anything is pending (call it on
+#   exit, including error exits)
+# delay <= 0 saves synchronously inside mark().
+# ---------------------------------------------------------
+
+import threading
+
+import perf
+
+# Default coalescing window (seconds)
+DELAY = 2.0
+
+
+class WriteBehind:
+    """Coalesce many mark() calls into one save() call per window."""
+
+    def __init__(self, save, delay=DELAY):
+        self.save = save
+        self.delay = delay
+        self.lock = threading.RLock()
+        self.dirty = False
+        self.saves = 0
+        self._timer = None
+
+    def mark(self):
+        """Record a change; schedule a save if none is scheduled yet."""
+        with self.lock:
+            self.dirty = True
+
+            if self.delay <= 0:
+                self._save()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Save now if there are unsaved changes (cancels the timer)."""
+        with self.lock:
+            timer, self._timer = self._timer, None
+            if timer is not None and timer is not threading.current_thread():
+                timer.cancel()
+
+            if self.dirty:
+                self._save()
+
+    @perf.timed("write_behind.save", rows=1)
+    def _save(self):
+        # Stays dirty if save() fails, so the next mark()/flush() retries
+        self.save()
+        self.dirty = False
+        self.saves += 1